@@ -30,6 +30,88 @@ DllExport long exec(TaggedData* argv, long argc, TaggedData* retval)
 	return kESErrOK;
 }
 
+// Python.runFile("C:/path/script.py");
+DllExport long runFile(TaggedData* argv, long argc, TaggedData* retval)
+{
+	if (argc != 1 || argv[0].type != kTypeString)
+	{
+		return kESErrBadArgumentList;
+	}
+
+	// A script ExtendScript evaluates: undefined, or a throw
+	retval->type = kTypeScript;
+	retval->data.string = stringToCharP(AEPython::runFile(argv[0].data.string));
+
+	return kESErrOK;
+}
+
+// var value = Python.eval("expression");
+DllExport long eval(TaggedData* argv, long argc, TaggedData* retval)
+{
+	if (argc != 1 || argv[0].type != kTypeString)
+	{
+		return kESErrBadArgumentList;
+	}
+
+	// The value written as an ExtendScript expression (see jsx_api.py)
+	retval->type = kTypeScript;
+	retval->data.string = stringToCharP(AEPython::eval(argv[0].data.string));
+
+	return kESErrOK;
+}
+
+static bool isNumber(const TaggedData& data)
+{
+	return data.type == kTypeInteger || data.type == kTypeUInteger || data.type == kTypeDouble;
+}
+
+static long toLong(const TaggedData& data)
+{
+	return data.type == kTypeDouble ? static_cast<long>(data.data.fltval) : data.data.intval;
+}
+
+// var id = Python.submit("Python code");   (runs on a worker thread)
+DllExport long submit(TaggedData* argv, long argc, TaggedData* retval)
+{
+	if (argc != 1 || argv[0].type != kTypeString)
+	{
+		return kESErrBadArgumentList;
+	}
+
+	retval->type = kTypeScript;
+	retval->data.string = stringToCharP(AEPython::submit(argv[0].data.string));
+
+	return kESErrOK;
+}
+
+// Python.poll(id) == "running"
+DllExport long poll(TaggedData* argv, long argc, TaggedData* retval)
+{
+	if (argc != 1 || !isNumber(argv[0]))
+	{
+		return kESErrBadArgumentList;
+	}
+
+	retval->type = kTypeScript;
+	retval->data.string = stringToCharP(AEPython::poll(toLong(argv[0])));
+
+	return kESErrOK;
+}
+
+// var value = Python.result(id);
+DllExport long result(TaggedData* argv, long argc, TaggedData* retval)
+{
+	if (argc != 1 || !isNumber(argv[0]))
+	{
+		return kESErrBadArgumentList;
+	}
+
+	retval->type = kTypeScript;
+	retval->data.string = stringToCharP(AEPython::result(toLong(argv[0])));
+
+	return kESErrOK;
+}
+
 DllExport void ESFreeMem(void* p)
 {
 	delete(char*)(p);
@@ -42,7 +124,7 @@ DllExport long ESGetVersion()
 
 DllExport char* ESInitialize(const TaggedData** argv, long argc)
 {
-	return "exec_s";
+	return "exec_s,runFile_s,eval_s,submit_s,poll_d,result_d";
 }
 
 DllExport void ESTerminate()
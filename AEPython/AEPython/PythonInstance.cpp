@@ -4,10 +4,16 @@
 #include <pybind11/embed.h>
 #include <pybind11/pybind11.h>
 
+#include <chrono>
+
 namespace py = pybind11;
 
 std::unique_ptr<py::scoped_interpreter> interpreter;
 std::unique_ptr<py::dict> locals;
+// The main thread's hold on the GIL, released after init so Python threads
+// (Python.submit jobs, ae.parallel) run while AE is busy in native code.
+// Declared last: destroyed first, taking the GIL back before the rest.
+std::unique_ptr<py::gil_scoped_release> released_gil;
 
 static AEGP_PluginID S_my_id;
 static SPBasicSuite* sP;
@@ -32,7 +38,11 @@ static std::wstring executeScript(std::wstring w_code)
 
 	ERR(suites.UtilitySuite5()->AEGP_IsScriptingAvailable(&outAvailablePB));
 	auto code = toString(w_code);
-	ERR(suites.UtilitySuite5()->AEGP_ExecuteScript(S_my_id, code.c_str(), true, &outResultPH, &outErrorStringPH));
+	{
+		// Python threads keep running while ExtendScript does
+		py::gil_scoped_release release;
+		ERR(suites.UtilitySuite5()->AEGP_ExecuteScript(S_my_id, code.c_str(), true, &outResultPH, &outErrorStringPH));
+	}
 
 	A_char* res = NULL;
 	ERR(suites.MemorySuite1()->AEGP_LockMemHandle(outResultPH, reinterpret_cast<void**>(&res)));
@@ -92,24 +102,47 @@ void AEPython::init(AEGP_PluginID _my_id, SPBasicSuite* _sP)
 	S_my_id = _my_id;
 	sP = _sP;
 
+	auto init_start = std::chrono::steady_clock::now();
 	interpreter = std::make_unique< py::scoped_interpreter>();
+	std::chrono::duration<double> init_time = std::chrono::steady_clock::now() - init_start;
+
 	locals = std::make_unique< py::dict>();
-	py::module_::import("_AEPython").add_object("locals", *locals);
+	py::module_ host = py::module_::import("_AEPython");
+	host.add_object("locals", *locals);
+	// Seconds spent creating the interpreter, for startup_profile.py
+	host.add_object("interpreter_init_time", py::float_(init_time.count()));
 
 	exec(u8R"(
 import sys
 import os
 import _AEPython
 
-sys.path.append(os.path.dirname(_AEPython.getPluginPath()))
+plugin_dir = os.path.dirname(_AEPython.getPluginPath())
+# Precompiled modules first (see bundle.py), their sources as the fallback
+bundle = os.path.join(plugin_dir, "AEPython_modules.zip")
+if os.path.isfile(bundle) and os.environ.get("AEPYTHON_FROM_SOURCE", "0") == "0":
+    sys.path.append(bundle)
+sys.path.append(plugin_dir)
 
-import AEPython as ae
-import qtae
+import startup_profile
+startup_profile.start()
+
+try:
+    with startup_profile.phase("import AEPython"):
+        import AEPython as ae
+    with startup_profile.phase("import qtae"):
+        import qtae
+finally:
+    startup_profile.finish()
 )");
+
+	// Every entry point below takes the GIL back for its call
+	released_gil = std::make_unique<py::gil_scoped_release>();
 }
 
 void AEPython::exec(const std::string& utf8_code)
 {
+	py::gil_scoped_acquire gil;
 	try
 	{
 		py::exec(utf8_code, py::globals(), *locals);
@@ -133,6 +166,64 @@ void AEPython::exec(const std::string& utf8_code)
 	}
 }
 
+static std::string throwScript(const std::string& message)
+{
+	std::string quoted;
+	for (char c : message)
+	{
+		if (c == '"' || c == '\\') { quoted += '\\'; quoted += c; }
+		else if (c == '\n') { quoted += "\\n"; }
+		else if (c == '\r') { quoted += "\\r"; }
+		else { quoted += c; }
+	}
+	return "throw new Error(\"" + quoted + "\")";
+}
+
+template <typename... Args>
+static std::string callJsxApi(const char* name, Args&&... args)
+{
+	py::gil_scoped_acquire gil;
+	try
+	{
+		py::object api = py::module_::import("jsx_api");
+		return api.attr(name)(std::forward<Args>(args)...).cast<std::string>();
+	}
+	catch (py::error_already_set& e)
+	{
+		// Errors of the call itself are returned by jsx_api; this is jsx_api failing
+		return throwScript(std::string("Python error.\n") + e.what());
+	}
+}
+
+std::string AEPython::runFile(const std::string& utf8_path)
+{
+	// py::globals() and the locals dict need the GIL before callJsxApi takes it
+	py::gil_scoped_acquire gil;
+	return callJsxApi("run_file", utf8_path, py::globals(), *locals);
+}
+
+std::string AEPython::eval(const std::string& utf8_expression)
+{
+	// py::globals() and the locals dict need the GIL before callJsxApi takes it
+	py::gil_scoped_acquire gil;
+	return callJsxApi("evaluate", utf8_expression, py::globals(), *locals);
+}
+
+std::string AEPython::submit(const std::string& utf8_code)
+{
+	return callJsxApi("submit", utf8_code);
+}
+
+std::string AEPython::poll(long job_id)
+{
+	return callJsxApi("poll", job_id);
+}
+
+std::string AEPython::result(long job_id)
+{
+	return callJsxApi("result", job_id);
+}
+
 void AEPython::showWindow()
 {
 	exec(u8R"(
@@ -169,6 +260,7 @@ script_library.ToggleScriptLibrary()
 
 bool AEPython::isPythonWindowVisible()
 {
+	py::gil_scoped_acquire gil;
 	try
 	{
 		// qtae is already imported during init, just call the function directly
@@ -184,6 +276,7 @@ bool AEPython::isPythonWindowVisible()
 
 bool AEPython::isScriptLibraryVisible()
 {
+	py::gil_scoped_acquire gil;
 	try
 	{
 		// script_library should be imported
@@ -6,6 +6,12 @@ namespace AEPython
 {
 	__declspec(dllexport) void init(AEGP_PluginID _my_id, SPBasicSuite* _sP);
 	__declspec(dllexport) void exec(const std::string& utf8_code);
+	// Return an ExtendScript source evaluating to the result (see jsx_api.py)
+	__declspec(dllexport) std::string runFile(const std::string& utf8_path);
+	__declspec(dllexport) std::string eval(const std::string& utf8_expression);
+	__declspec(dllexport) std::string submit(const std::string& utf8_code);
+	__declspec(dllexport) std::string poll(long job_id);
+	__declspec(dllexport) std::string result(long job_id);
 	__declspec(dllexport) void showWindow();
 	__declspec(dllexport) void showScriptLibrary();  // ADD THIS LINE
 
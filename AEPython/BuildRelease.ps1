@@ -178,6 +178,15 @@ if (Test-Path $SOURCE_PLUGIN_DIR) {
         Copy-Item -Path $_.FullName -Destination $AEGP_PLUGINS -Recurse -Force
     }
     Write-Host "  ✓ Plugin files copied from: Plug-ins AE\AEPython" -ForegroundColor Green
+
+    # Precompile the plugin modules into AEPython_modules.zip (bundle.py);
+    # the bytecode must come from the embedded Python itself
+    & $PYTHON_EXE (Join-Path $AEGP_PLUGINS "bundle.py")
+    if ($LASTEXITCODE -eq 0) {
+        Write-Host "  ✓ Plugin modules precompiled into AEPython_modules.zip" -ForegroundColor Green
+    } else {
+        Write-Host "  ! Warning: Module bundle failed, modules will load from source" -ForegroundColor Yellow
+    }
 } else {
     Write-Host "  ! Warning: Plugin source directory not found: $SOURCE_PLUGIN_DIR" -ForegroundColor Yellow
 }
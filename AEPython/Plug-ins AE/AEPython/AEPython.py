@@ -2,7 +2,13 @@ import re
 import json
 import pathlib
 
-import _AEPython as _ae
+import bridge_transport
+
+try:
+    import _AEPython as _ae
+except ImportError:
+    # Outside After Effects: drive a serving AE session with ae.connect()
+    _ae = None
 
 # Explicitly define common introspection attributes to prevent __getattr__ calls
 __wrapped__ = None
@@ -82,13 +88,74 @@ __ES_class_names = [
 ]
 
 
-def _executeScript(code: str):
+# How round trips reach the host: the embedded module inside AE, a socket
+# after connect(). See bridge_transport.py and transport.py.
+_transport = bridge_transport.InProcessTransport(_ae) if _ae is not None else bridge_transport.NoTransport()
+
+# The transport connect() replaced (e.g. qtae's BridgeExecutor), restored
+# as is by disconnect(). None while not connected.
+_local_transport = None
+
+# Bridge tracer installed by bridge_profiler while a profile is active.
+# None means every round trip goes straight to the host.
+_tracer = None
+
+# Called before every round trip while cooperative.auto_yield() is active
+# (pumps the Qt event loop, delivers cancellation). None otherwise.
+_yield_hook = None
+
+
+def _hostExecute(code: str, kind: str):
+    """Single exit point to the host: every bridge round trip passes here."""
+    if _yield_hook is not None:
+        _yield_hook(kind, code)
+    if _tracer is None:
+        return _transport.execute(code)
+    return _tracer(code, kind)
+
+
+def set_transport(new_transport: bridge_transport.Transport) -> bridge_transport.Transport:
+    """Route the bridge through another transport; returns the previous one."""
+    global _transport
+    previous, _transport = _transport, new_transport
+    return previous
+
+
+def connect(address=None, token: str = None, timeout: float = None) -> "transport.SocketTransport":
+    """
+    Drive a remote After Effects session started with transport.serve():
+        ae.connect()                                  # address/token from remote.json
+        ae.connect("tcp://127.0.0.1:5890", token)
+    """
+    import transport
+    global _local_transport
+
+    client = transport.connect(address, token, timeout)
+    previous = set_transport(client)
+    if _local_transport is None:
+        _local_transport = previous
+    else:
+        # Connecting again: only the earlier connection goes away
+        previous.close()
+    return client
+
+
+def disconnect():
+    """Close a connection opened with connect() and restore the transport it replaced."""
+    global _local_transport
+    if _local_transport is None:
+        return
+    local, _local_transport = _local_transport, None
+    set_transport(local).close()
+
+
+def _executeScript(code: str, kind: str = "eval"):
     # Wrap code for the ES side dispatcher
     code = repr(code)
-    return _ae.executeScript(f"__AEPython_executeScript({code})")
+    return _hostExecute(f"__AEPython_executeScript({code})", kind)
 
 
-def executeScript(code: str):
+def executeScript(code: str, kind: str = "eval"):
     """
     Execute ExtendScript code and convert the result into a Python type.
 
@@ -97,9 +164,15 @@ def executeScript(code: str):
         "number,12.0"
         "string,Hello"
         "object,CompItem,42"
+
+    kind tags the round trip for profiling (get/set/call/index/new/delete/
+    query/eval).
     """
-    ret = _executeScript(code)
+    return _parseResult(_executeScript(code, kind))
 
+
+def _parseResult(ret: str):
+    """Convert a dispatcher result string into a Python value or wrapper."""
     if ret == "null" or ret == "":
         return None
 
@@ -117,32 +190,75 @@ def executeScript(code: str):
         # Strip the "string," prefix only once
         return ret.replace("string,", "", 1)
 
-    elif ret_type == "function":
+    elif ret_type == "function" or ret_type == "object":
+        return _wrapESObject(ret_type, results[1], results[2])
+
+    else:
+        raise Exception(f"ES type error: {results[0]}")
+
+
+def _wrapESObject(ret_type: str, class_name: str, es_id):
+    """Build the Python wrapper for an object registered in __AEPython_objects."""
+    if ret_type == "function":
         # ESFunction represents a top-level function object
-        return ESFunction(results[2])
+        return ESFunction(es_id)
 
-    elif ret_type == "object":
-        class_name = results[1]
-        es_id = results[2]
+    # Known ES class name -> construct our Python wrapper
+    if class_name in __ES_class_names:
+        obj = eval(f"{class_name}(_id={es_id})")
+        # Auto-convert AE Array to Python list for convenience
+        if isinstance(obj, Array):
+            return obj.to_list()
+        return obj
 
-        # Known ES class name -> construct our Python wrapper
-        if class_name in __ES_class_names:
-            obj = eval(f"{class_name}(_id={es_id})")
-            # Auto-convert AE Array to Python list for convenience
-            if isinstance(obj, Array):
-                return obj.to_list()
-            return obj
+    # Unknown ES object -> generic wrapper
+    return ESWrapper(es_id)
 
-        # Unknown ES object -> generic wrapper
-        return ESWrapper(es_id)
 
-    else:
-        raise Exception(f"ES type error: {results[0]}")
+def _executeJSON(code: str, kind: str = "query"):
+    """
+    Execute ExtendScript code that returns __AEPython_toJSON(...) output and
+    decode it. This moves whole arrays/records across the bridge in a single
+    round trip; AE objects inside the payload come back as wrappers.
+    """
+    return _decodeJSON(executeScript(code, kind))
+
+
+def _decodeJSON(ret: str):
+    """Decode __AEPython_toJSON output, wrapping embedded AE object handles."""
+    if ret is None:
+        return None
+
+    def object_hook(obj: dict):
+        if len(obj) == 1 and "__es_object__" in obj:
+            return _wrapESObject(*obj["__es_object__"])
+        return obj
+
+    return json.loads(ret, object_hook=object_hook)
+
+
+# Bridge extensions, imported on first access so that `import AEPython`
+# stays cheap at AE launch: name -> (module, attribute or None for the module)
+_EXTENSIONS = {
+    "Query": ("es_query", "Query"),
+    "ESCompileError": ("es_transpiler", "ESCompileError"),
+    "remote_map": ("es_transpiler", "remote_map"),
+    "remote_reduce": ("es_transpiler", "remote_reduce"),
+    "es_function": ("es_functions", "es_function"),
+    "profile": ("bridge_profiler", "profile"),
+    "BridgeAccessWarning": ("bridge_patterns", "BridgeAccessWarning"),
+    "detect_n_plus_one": ("bridge_patterns", "detect_n_plus_one"),
+    "record": ("bridge_recorder", "record"),
+    "aio": ("bridge_aio", None),
+    "BridgeExecutor": ("bridge_executor", "BridgeExecutor"),
+    "parallel": ("ae_parallel", None),
+}
 
 
 def __getattr__(name):
     """
-    Module-level __getattr__ for accessing global ExtendScript objects.
+    Module-level __getattr__ for the bridge extensions (ae.remote_map,
+    ae.aio, ...) and for accessing global ExtendScript objects.
 
     Example:
         import AEPython as ae
@@ -150,8 +266,17 @@ def __getattr__(name):
         system = ae.system
         File = ae.File
     """
+    extension = _EXTENSIONS.get(name)
+    if extension is not None:
+        import importlib
+
+        module_name, attribute = extension
+        module = importlib.import_module(module_name)
+        value = module if attribute is None else getattr(module, attribute)
+        globals()[name] = value
+        return value
     try:
-        return executeScript(name)
+        return executeScript(name, "get")
     except Exception as e:
         raise AttributeError(f"ExtendScript has no global '{name}': {e}")
 
@@ -187,6 +312,9 @@ class ESWrapper(object):
     def __init__(self, _id: str):
         # store ES object id as a private Python attribute
         super().__setattr__("_es_id", _id)
+        # The session the id belongs to: after connect()/disconnect() it must
+        # not be freed on whichever host is current
+        super().__setattr__("_es_transport", _transport)
 
     def __repr__(self) -> str:
         # This string is valid ES code to reference the object
@@ -196,8 +324,16 @@ class ESWrapper(object):
         return super().__repr__() + f"(id:{self._es_id})"
 
     def __del__(self):
-        # Ask ES side to free the object
-        _ae.executeScript(f"__AEPython_deleteObject({self._es_id});")
+        # Ask ES side to free the object; nobody waits for the answer
+        owner = self.__dict__.get("_es_transport")
+        if owner is None:
+            return
+        code = f"__AEPython_deleteObject({self._es_id});"
+        if _tracer is None or owner is not _transport:
+            # A closed session's post() drops it
+            owner.post(code)
+        else:
+            _hostExecute(code, "delete")
 
     def __eq__(self, __o: object) -> bool:
         # Compare underlying ES objects
@@ -212,7 +348,7 @@ class ESWrapper(object):
             comp.frameDuration
             layer.property("ADBE Transform Group")
         """
-        ret = executeScript(f"{repr(self)}.{name};")
+        ret = executeScript(f"{repr(self)}.{name};", "get")
         if isinstance(ret, ESFunction):
             # Return bound method wrapper so we can call it
             return ESObjectFunction(self, name)
@@ -229,7 +365,7 @@ class ESWrapper(object):
             return
 
         __value = _toESObject(__value)
-        executeScript(f"__AEPython_setattr({self._es_id}, {repr(__name)}, {__value});")
+        executeScript(f"__AEPython_setattr({self._es_id}, {repr(__name)}, {__value});", "set")
 
 
 class ESFunction(ESWrapper):
@@ -239,7 +375,7 @@ class ESFunction(ESWrapper):
 
     def __call__(self, *args, **kwds) -> any:
         code = f"__AEPython_callObject({self._es_id}, {_toESObject(args)[1:-1]});"
-        return executeScript(code)
+        return executeScript(code, "call")
 
 
 class ESObjectFunction:
@@ -257,7 +393,7 @@ class ESObjectFunction:
 
     def __call__(self, *args, **kwds) -> any:
         code = f"{repr(self.__object)}.{self.__function_name}({_toESObject(args)[1:-1]});"
-        return executeScript(code)
+        return executeScript(code, "call")
 
 
 # ---------------------------------------------------------------------------
@@ -311,12 +447,40 @@ class Collection(ESWrapper):
         if self._i >= length:
             raise StopIteration()
 
-        ret = executeScript(f"{repr(self)}[{self._i}];")
+        ret = executeScript(f"{repr(self)}[{self._i}];", "index")
         object.__setattr__(self, "_i", self._i + 1)
         return ret
 
     def __getitem__(self, index: int):
-        return executeScript(f"{repr(self)}[{index}];")
+        return executeScript(f"{repr(self)}[{index}];", "index")
+
+    def where(self, *predicates, **lookups) -> "Query":
+        """
+        Filter the collection inside ExtendScript:
+            comp.layers.where(matchName="ADBE Text Layer", inPoint__lt=5).all()
+        See es_query for the lookup syntax.
+        """
+        from es_query import Query
+
+        return Query(self).where(*predicates, **lookups)
+
+    def select(self, *fields: str) -> list:
+        """
+        Read fields of every element in one round trip:
+            comp.layers.select("name", "index")  # -> [{"name": ..., "index": ...}, ...]
+        """
+        from es_query import Query
+
+        return Query(self).select(*fields)
+
+    def values(self, field: str) -> list:
+        """
+        Read one field of every element in one round trip:
+            comp.layers.values("name")  # -> ["Title", "BG", ...]
+        """
+        from es_query import Query
+
+        return Query(self).values(field)
 
 
 # ---------------------------------------------------------------------------
@@ -328,9 +492,9 @@ class Array(ESWrapper):
 
     def to_list(self):
         dst = []
-        length = executeScript(f"{repr(self)}.length")
+        length = executeScript(f"{repr(self)}.length", "get")
         for i in range(0, length):
-            element = executeScript(f"{repr(self)}[{i}]")
+            element = executeScript(f"{repr(self)}[{i}]", "index")
             dst.append(element)
         return dst
 
@@ -340,10 +504,10 @@ class Application(ESWrapper):
 
     def beginUndoGroup(self, name: str):
         """Use host undo group implementation for better integration."""
-        _ae.startUndoGroup(name)
+        _transport.start_undo_group(name)
 
     def endUndoGroup(self):
-        _ae.endUndoGroup()
+        _transport.end_undo_group()
 
 
 class CameraLayer(Layer):
@@ -391,7 +555,7 @@ class ImportOptions(ESWrapper):
             else:
                 # assume ES file-like object / FootageSource
                 code = f"new ImportOptions({repr(file)})"
-            ret = _executeScript(code)
+            ret = _executeScript(code, "new")
             _id = ret.split(",")[2]
 
         super().__init__(_id)
@@ -414,7 +578,7 @@ class KeyframeEase(ESWrapper):
 
     def __init__(self, x=None, y=None, _id: str = None):
         if _id is None:
-            ret = _executeScript(f"new KeyframeEase({x}, {y})")
+            ret = _executeScript(f"new KeyframeEase({x}, {y})", "new")
             _id = ret.split(",")[2]
 
         super().__init__(_id)
@@ -450,7 +614,7 @@ class MarkerValue(ESWrapper):
             params = "undefined" if params is None else repr(params)
 
             code = f"new MarkerValue({comment}, {chapter}, {url}, {frameTarget}, {cuePointName}, {params})"
-            ret = _executeScript(code)
+            ret = _executeScript(code, "new")
             _id = ret.split(",")[2]
 
         super().__init__(_id)
@@ -549,7 +713,7 @@ class Shape(ESWrapper):
 
     def __init__(self, _id: str = None):
         if _id is None:
-            ret = _executeScript("new Shape()")
+            ret = _executeScript("new Shape()", "new")
             _id = ret.split(",")[2]
 
         super().__init__(_id)
@@ -583,7 +747,7 @@ class TextDocument(ESWrapper):
     def __init__(self, docText: str = "", _id: str = None):
         if _id is None:
             text = repr(docText)
-            ret = _executeScript(f"new TextDocument({text})")
+            ret = _executeScript(f"new TextDocument({text})", "new")
             _id = ret.split(",")[2]
 
         super().__init__(_id)
@@ -0,0 +1,231 @@
+"""
+AEPython parallel helpers (ae.parallel)
+
+Runs pure-Python CPU work (text processing, geometry, curve fitting, image
+statistics) on a pool of subinterpreters, each with its own GIL, so it runs
+on several cores and does not hold up AE's main thread or the Qt UI.
+
+Example:
+    import AEPython as ae
+    import naming                     # clean() must live in an importable module
+
+    comp = ae.app.project.activeItem
+    names = comp.layers.values("name")                      # read: one round trip
+    cleaned = ae.parallel.map(naming.clean, names)          # compute: all cores
+
+    @ae.es_function('''
+    function (layers, names) {
+        for (var i = 1; i <= layers.length; i++) {
+            layers[i].name = names[i - 1];
+        }
+    }
+    ''')
+    def rename_all(layers, names):
+        ...
+
+    rename_all(comp.layers, cleaned)                        # write: one round trip
+
+Example (without blocking the UI):
+    future = ae.parallel.map_async(naming.clean, names)
+    cleaned = await asyncio.wrap_future(future)             # inside ae.aio.run()
+
+Workers cannot reach After Effects: read what they need first and write their
+results back from the calling thread. Functions and data are pickled to the
+workers, so fn must be importable (defined in a module, not in the console)
+and the data plain Python values. Where subinterpreters are unavailable
+(Python < 3.14) or fn cannot be pickled, a thread pool is used instead; it
+keeps the UI responsive but shares the GIL.
+"""
+
+import builtins
+import math
+import os
+import pickle
+import sys
+import threading
+import warnings
+from concurrent import futures
+
+# No AEPython import here: workers import this module before _worker_init
+# replaces their host module
+import bridge_executor
+
+_MESSAGE = (
+    "After Effects cannot be accessed from ae.parallel workers: "
+    "read the data first and write the results from the calling thread"
+)
+
+# Chunks queued per worker, for load balancing
+CHUNKS_PER_WORKER = 4
+
+_lock = threading.Lock()
+_interpreter_pool = None
+_thread_pool = None
+
+
+def default_workers() -> int:
+    """One worker per core, leaving one for AE's main thread."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _no_bridge(*args, **kwargs):
+    raise Exception(_MESSAGE)
+
+
+def _worker_init():
+    """First code run in a worker interpreter."""
+    import types
+
+    # Importing AEPython in a worker gets a host that refuses every call
+    host = types.ModuleType("_AEPython", "ae.parallel worker stand-in")
+    host.executeScript = host.startUndoGroup = host.endUndoGroup = _no_bridge
+    host.getPluginPath = lambda: ""
+    host.getMainHWND = lambda: 0
+    host.locals = {}
+    sys.modules["_AEPython"] = host
+
+
+def _run_chunk(fn, chunk: list) -> list:
+    return [fn(*args) for args in chunk]
+
+
+# ---------------------------------------------------------------------------
+# Pools
+# ---------------------------------------------------------------------------
+
+def _bootstrap() -> str:
+    # The initializer is unpickled in the new interpreter before this module
+    # is importable there, so it is a builtin (exec) running this source,
+    # which copies our sys.path first
+    path = [entry for entry in sys.path if entry]
+    return f"import sys\nsys.path[:] = {path!r}\nimport ae_parallel\nae_parallel._worker_init()"
+
+
+def interpreter_pool():
+    """The shared InterpreterPoolExecutor, or None where it is unavailable."""
+    global _interpreter_pool
+    executor_class = getattr(futures, "InterpreterPoolExecutor", None)
+    if executor_class is None:
+        return None
+    with _lock:
+        if _interpreter_pool is None:
+            _interpreter_pool = executor_class(
+                default_workers(), thread_name_prefix="AEPython parallel",
+                initializer=builtins.exec, initargs=(_bootstrap(), {}),
+            )
+        return _interpreter_pool
+
+
+def thread_pool() -> futures.ThreadPoolExecutor:
+    """The shared fallback ThreadPoolExecutor."""
+    global _thread_pool
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = futures.ThreadPoolExecutor(
+                default_workers(), thread_name_prefix="AEPython parallel",
+                initializer=bridge_executor.forbid_bridge_access, initargs=(_MESSAGE,),
+            )
+        return _thread_pool
+
+
+def shutdown(wait: bool = True):
+    """Stop the shared pools; they are recreated on the next call."""
+    global _interpreter_pool, _thread_pool
+    with _lock:
+        pools, _interpreter_pool, _thread_pool = (_interpreter_pool, _thread_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+def _picklable(fn) -> bool:
+    try:
+        pickle.dumps(fn)
+    except Exception:
+        return False
+    return True
+
+
+def _pool_for(fn):
+    pool = interpreter_pool()
+    if pool is not None and not _picklable(fn):
+        warnings.warn(
+            f"{getattr(fn, '__qualname__', fn)!r} cannot be pickled to a subinterpreter; "
+            "running it on threads (define it in a module to use all cores)",
+            RuntimeWarning, stacklevel=4,
+        )
+        pool = None
+    return pool or thread_pool()
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def _check(args: tuple):
+    import AEPython as ae
+
+    for value in args:
+        if isinstance(value, ae.ESWrapper):
+            raise TypeError(
+                f"{value!r} is an After Effects object and cannot be sent to a worker; "
+                "pass plain values (e.g. from Collection.values())"
+            )
+
+
+def map_async(fn, *iterables, chunksize: int = None) -> futures.Future:
+    """
+    Like map(), but returns at once with a Future of the result list.
+
+    Done callbacks run on a pool thread; bridge calls made from them are
+    routed to the main thread by the BridgeExecutor.
+    """
+    items = list(zip(*iterables))
+    for args in items:
+        _check(args)
+    pool = _pool_for(fn)
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(items) / (default_workers() * CHUNKS_PER_WORKER)))
+    parts = [pool.submit(_run_chunk, fn, items[i:i + chunksize]) for i in range(0, len(items), chunksize)]
+
+    result = futures.Future()
+    result.set_running_or_notify_cancel()
+    remaining = [len(parts)]
+    remaining_lock = threading.Lock()
+
+    def part_done(part: futures.Future):
+        if part.cancelled():
+            return
+        error = part.exception()
+        with remaining_lock:
+            remaining[0] -= 1
+            if result.done():
+                return
+            if error is not None:
+                result.set_exception(error)
+            elif remaining[0] == 0:
+                result.set_result([value for done in parts for value in done.result()])
+        if error is not None:
+            for other in parts:
+                other.cancel()
+
+    if not parts:
+        result.set_result([])
+    for part in parts:
+        part.add_done_callback(part_done)
+    return result
+
+
+def map(fn, *iterables, chunksize: int = None, timeout: float = None) -> list:
+    """
+    Return [fn(*args) for args in zip(*iterables)], computed on the worker pool.
+
+    Blocks the calling thread until every result is in; from the main thread
+    that still freezes the UI for the (now shorter) duration, so prefer
+    map_async() for long jobs.
+    """
+    return map_async(fn, *iterables, chunksize=chunksize).result(timeout)
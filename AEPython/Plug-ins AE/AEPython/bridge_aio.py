@@ -0,0 +1,237 @@
+"""
+AEPython asyncio front-end (ae.aio)
+
+Awaitable bridge access. Requests issued in the same event loop tick are
+coalesced into one batched ExtendScript evaluation, so
+
+    names = await asyncio.gather(*(ae.aio.get(layer, "name") for layer in layers))
+
+costs one round trip instead of len(layers).
+
+Example (tool panel inside AE; the loop is pumped by the Qt event loop):
+    import AEPython as ae
+
+    async def refresh(panel):
+        comp = await ae.aio.get(ae.app.project, "activeItem")
+        rows = await ae.aio.gather_attrs(comp.layers, "name", "inPoint")
+        panel.show_rows(rows)
+
+    ae.aio.run(refresh(panel))     # returns an asyncio.Task, UI stays live
+
+Example (external process over a socket transport):
+    ae.connect()
+    asyncio.run(refresh(panel))
+
+Over a socket transport batches are sent without blocking the loop. In
+process, each batch runs synchronously on the main thread (AE requires it),
+but the UI keeps running between batches.
+"""
+
+import asyncio
+import json
+import weakref
+
+import AEPython as ae
+import es_query
+
+# Requests evaluated per batch; the rest go in the next tick
+MAX_BATCH = 512
+
+# Qt timer interval pumping the asyncio loop inside AE
+PUMP_INTERVAL_MS = 10
+
+
+class _Batcher:
+    """
+    Collects (expression, future, refs) during one loop tick. refs keeps the
+    wrappers an expression names alive (their ES objects are freed when the
+    wrapper dies) until the batch has run.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = []
+        self.scheduled = False
+
+    def add(self, expression: str, *refs) -> asyncio.Future:
+        future = self.loop.create_future()
+        self.pending.append((expression, future, refs))
+        if not self.scheduled:
+            self.scheduled = True
+            self.loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        batch, self.pending = self.pending[:MAX_BATCH], self.pending[MAX_BATCH:]
+        self.scheduled = bool(self.pending)
+        if self.pending:
+            self.loop.call_soon(self.flush)
+        batch = [entry for entry in batch if not entry[1].cancelled()]
+        if not batch:
+            return
+
+        code = _compile_batch([expression for expression, _, _ in batch])
+        try:
+            sent = _send(self.loop, code)
+        except Exception as e:
+            _fail(batch, e)
+            return
+        sent.add_done_callback(lambda done: self._resolve(batch, done))
+
+    @staticmethod
+    def _resolve(batch: list, done: asyncio.Future):
+        try:
+            rows = ae._decodeJSON(ae._parseResult(done.result()))
+        except Exception as e:
+            _fail(batch, e)
+            return
+        for (_, future, _), (ok, value) in zip(batch, rows):
+            if future.cancelled():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(Exception(value))
+
+
+def _fail(batch: list, error: Exception):
+    for _, future, _ in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _compile_batch(expressions: list) -> str:
+    """One ES program evaluating every expression, each failure isolated."""
+    parts = [
+        f"try {{ r.push([1, {expression}]); }} catch (e) {{ r.push([0, String(e.message || e)]); }}"
+        for expression in expressions
+    ]
+    return f"(function () {{ var r = []; {' '.join(parts)} return __AEPython_toJSON(r); }})()"
+
+
+def _send(loop, code: str) -> asyncio.Future:
+    """Run a dispatcher request; non-blocking when the transport can pipeline."""
+    payload = f"__AEPython_executeScript({code!r})"
+    submit = getattr(ae._transport, "submit", None)
+    if submit is not None and ae._tracer is None:
+        return asyncio.wrap_future(submit(payload), loop=loop)
+    future = loop.create_future()
+    try:
+        future.set_result(ae._hostExecute(payload, "batch"))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+_batchers = weakref.WeakKeyDictionary()
+
+
+def _batcher() -> _Batcher:
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = _Batcher(loop)
+    return batcher
+
+
+def _field(obj, name: str) -> str:
+    return es_query._es_field(name.split("."), repr(obj))
+
+
+# ---------------------------------------------------------------------------
+# Awaitables
+# ---------------------------------------------------------------------------
+
+def get(obj: ae.ESWrapper, name: str) -> asyncio.Future:
+    """Await an attribute of an ES object; dotted names read nested attributes."""
+    return _batcher().add(_field(obj, name), obj)
+
+
+def set_attr(obj: ae.ESWrapper, name: str, value) -> asyncio.Future:
+    """Await setting an attribute of an ES object."""
+    return _batcher().add(f"void ({repr(obj)}.{name} = {ae._toESObject(value)})", obj, value)
+
+
+def call(obj: ae.ESWrapper, method: str, *args) -> asyncio.Future:
+    """Await obj.method(*args) evaluated in ExtendScript."""
+    arguments = ", ".join(ae._toESObject(arg) for arg in args)
+    return _batcher().add(f"{repr(obj)}.{method}({arguments})", obj, args)
+
+
+def evaluate(code: str) -> asyncio.Future:
+    """Await the value of an ExtendScript snippet."""
+    return _batcher().add(f"eval({json.dumps(code)})")
+
+
+def gather_attrs(objects, *fields: str) -> asyncio.Future:
+    """
+    Await several fields of several objects as a list of dicts:
+        await ae.aio.gather_attrs(comp.layers, "name", "index")
+        await ae.aio.gather_attrs([layer_a, layer_b], "name")
+    objects is a Collection, a Query or a list of wrappers.
+    """
+    if not fields:
+        raise ValueError("gather_attrs() needs at least one field name")
+    row = ", ".join(es_query._es_field(name.split(".")) for name in fields)
+    code = es_query.compile_loop(objects, f"r.push([{row}]);", result="r")
+    future = _batcher().add(code, objects)
+    result = asyncio.get_running_loop().create_future()
+
+    def to_dicts(done: asyncio.Future):
+        if result.cancelled():
+            return
+        if done.exception() is not None:
+            result.set_exception(done.exception())
+        else:
+            result.set_result([dict(zip(fields, values)) for values in done.result()])
+
+    future.add_done_callback(to_dicts)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Qt integration
+# ---------------------------------------------------------------------------
+
+class QtLoop:
+    """
+    An asyncio loop pumped from the Qt event loop by a timer.
+
+    Each tick runs one loop iteration without blocking (ready callbacks,
+    finished I/O, due timers). The timer stops when no task is left.
+    """
+
+    def __init__(self):
+        from PySide6 import QtCore
+
+        self.loop = asyncio.new_event_loop()
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(PUMP_INTERVAL_MS)
+        self.timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        loop = self.loop
+        if loop.is_running():
+            # Re-entered from a nested Qt event loop (e.g. a modal dialog)
+            return
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+        if not asyncio.all_tasks(loop):
+            self.timer.stop()
+
+    def run(self, coro) -> asyncio.Task:
+        task = self.loop.create_task(coro)
+        if not self.timer.isActive():
+            self.timer.start()
+        return task
+
+
+_qt_loop = None
+
+
+def run(coro) -> asyncio.Task:
+    """Schedule a coroutine on the asyncio loop driven by AE's Qt event loop."""
+    global _qt_loop
+    if _qt_loop is None:
+        _qt_loop = QtLoop()
+    return _qt_loop.run(coro)
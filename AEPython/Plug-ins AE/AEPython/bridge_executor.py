@@ -0,0 +1,240 @@
+"""
+AEPython main-thread bridge executor
+
+AEGP_ExecuteScript must only be called on After Effects' main thread.
+BridgeExecutor is a transport that lets worker threads use ae.* anyway: a
+call made on the main thread goes straight to the host, a call made on any
+other thread is queued, handed to the main thread with a queued Qt
+invocation, and the worker waits on a Future for the answer. Requests queued
+before the main thread gets to them are run together, as one execute_many().
+
+qtae installs it at startup, so inside AE this just works:
+
+Example:
+    import threading
+    import AEPython as ae
+
+    def scan(comp):
+        digests = [hash_file(path) for path in find_footage()]   # off the UI thread
+        for layer, digest in zip(comp.layers, digests):          # routed to the main thread
+            layer.comment = digest
+
+    threading.Thread(target=scan, args=(ae.app.project.activeItem,)).start()
+
+Example (run a whole block on the main thread and get a Future):
+    import bridge_executor
+
+    executor = bridge_executor.install()      # the installed executor
+    future = executor.call(lambda: ae.app.project.numItems)
+    future.add_done_callback(lambda f: print(f.result()))
+
+A worker waiting on the main thread must never be waited on by the main
+thread itself (e.g. thread.join() in a console script): the queued calls
+could not run and both would block. Use Future callbacks or poll instead.
+"""
+
+import threading
+
+import bridge_transport
+
+# Queued requests run per main-thread visit; the rest get another visit
+MAX_BATCH = 512
+
+_EXEC, _POST, _CALL = range(3)
+
+# Threads that must not touch AE (e.g. ae.parallel workers) -> reason
+_forbidden = threading.local()
+
+
+def _future() -> "Future":
+    # concurrent.futures (and logging with it) loads on first use, not at AE launch
+    from concurrent.futures import Future
+    return Future()
+
+
+def forbid_bridge_access(reason: str):
+    """Make bridge calls from the current thread raise instead of queueing."""
+    _forbidden.reason = reason
+
+
+class BridgeExecutor(bridge_transport.Transport):
+    """
+    Transport wrapper marshalling worker-thread calls to the main thread.
+
+    schedule(fn) must arrange for fn to run soon on the main thread without
+    waiting for it; the default is a queued Qt invocation. Without an event
+    loop, call drain() from the main thread instead.
+    """
+
+    def __init__(self, inner: bridge_transport.Transport, schedule=None, timeout: float = None):
+        self.inner = inner
+        self.timeout = timeout
+        self.main_thread = threading.main_thread()
+        self._schedule = schedule or _qt_schedule()
+        # Reentrant: a wrapper freed by the GC while a worker holds the lock
+        # queues its own delete
+        self._lock = threading.RLock()
+        self._pending = []
+        self._scheduled = False
+        self.batches = 0
+
+    def _on_main_thread(self) -> bool:
+        return threading.current_thread() is self.main_thread
+
+    def _enqueue(self, kind: int, payload) -> "Future":
+        reason = getattr(_forbidden, "reason", None)
+        if reason is not None and kind != _POST:
+            # The main thread may be blocked waiting for this thread
+            raise RuntimeError(reason)
+        future = _future()
+        with self._lock:
+            self._pending.append((kind, payload, future))
+            wake = not self._scheduled
+            self._scheduled = True
+        if wake:
+            self._schedule(self.drain)
+        return future
+
+    def drain(self):
+        """Run the queued requests. Main thread only."""
+        with self._lock:
+            batch, self._pending = self._pending[:MAX_BATCH], self._pending[MAX_BATCH:]
+            self._scheduled = bool(self._pending)
+        if self._pending:
+            self._schedule(self.drain)
+        if batch:
+            self.batches += 1
+
+        # Consecutive scripts go to the host together, in queue order
+        scripts = []
+        for kind, payload, future in batch:
+            if kind == _EXEC:
+                scripts.append((payload, future))
+                continue
+            self._run_scripts(scripts)
+            scripts = []
+            if kind == _POST:
+                try:
+                    self.inner.post(payload)
+                except Exception:
+                    pass
+                future.set_result(None)
+            elif future.set_running_or_notify_cancel():
+                fn, args = payload
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        self._run_scripts(scripts)
+
+    def _run_scripts(self, scripts: list):
+        scripts = [(code, future) for code, future in scripts if future.set_running_or_notify_cancel()]
+        if not scripts:
+            return
+        try:
+            results = self.inner.execute_many([code for code, _ in scripts])
+        except Exception as e:
+            results = [e] * len(scripts)
+        for (_, future), result in zip(scripts, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def call(self, fn, *args) -> "Future":
+        """Run fn(*args) on the main thread; returns a Future of its result."""
+        if self._on_main_thread():
+            future = _future()
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        return self._enqueue(_CALL, (fn, args))
+
+    # -- Transport -----------------------------------------------------------
+
+    def submit(self, code: str) -> "Future":
+        """Send a script without waiting; the Future resolves to its result string."""
+        if self._on_main_thread():
+            return self.call(self.inner.execute, code)
+        return self._enqueue(_EXEC, code)
+
+    def execute(self, code: str) -> str:
+        if self._on_main_thread():
+            return self.inner.execute(code)
+        return self._enqueue(_EXEC, code).result(self.timeout)
+
+    def execute_many(self, codes: list) -> list:
+        if self._on_main_thread():
+            return self.inner.execute_many(codes)
+        futures = [self._enqueue(_EXEC, code) for code in codes]
+        results = []
+        for future in futures:
+            error = future.exception(self.timeout)
+            results.append(error if error is not None else future.result())
+        return results
+
+    def post(self, code: str):
+        if self._on_main_thread():
+            self.inner.post(code)
+        else:
+            self._enqueue(_POST, code)
+
+    def start_undo_group(self, name: str):
+        self.call(self.inner.start_undo_group, name).result(self.timeout)
+
+    def end_undo_group(self):
+        self.call(self.inner.end_undo_group).result(self.timeout)
+
+    def close(self):
+        self.inner.close()
+
+    def __repr__(self) -> str:
+        return f"BridgeExecutor({self.inner!r})"
+
+
+def _qt_schedule():
+    """Return a schedule(fn) posting fn to the Qt main thread's event loop."""
+    from PySide6 import QtCore
+
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("BridgeExecutor must be created on the main thread")
+
+    class Scheduler(QtCore.QObject):
+        request = QtCore.Signal(object)
+
+        def __init__(self):
+            super().__init__()
+            self.request.connect(self._run, QtCore.Qt.ConnectionType.QueuedConnection)
+
+        def _run(self, fn):
+            fn()
+
+    scheduler = Scheduler()
+
+    def schedule(fn):
+        scheduler.request.emit(fn)
+
+    schedule.scheduler = scheduler
+    return schedule
+
+
+def install(schedule=None) -> BridgeExecutor:
+    """Route worker-thread bridge calls of this session through a BridgeExecutor."""
+    import AEPython as ae
+
+    if isinstance(ae._transport, BridgeExecutor):
+        return ae._transport
+    executor = BridgeExecutor(ae._transport, schedule)
+    ae.set_transport(executor)
+    return executor
+
+
+def uninstall():
+    """Restore the transport wrapped by install()."""
+    import AEPython as ae
+
+    if isinstance(ae._transport, BridgeExecutor):
+        ae.set_transport(ae._transport.inner)
@@ -0,0 +1,222 @@
+"""
+AEPython N+1 bridge-access detector
+
+Spots loops that cross the bridge once per element: the same operation,
+differing only in ids and indices, issued over and over from one source line.
+When the block ends, each offending line gets a BridgeAccessWarning naming
+the line, the number of round trips and the batch API that replaces them.
+
+Example:
+    import AEPython as ae
+    comp = ae.app.project.activeItem
+
+    with ae.detect_n_plus_one():
+        for i in range(1, comp.numLayers + 1):
+            print(comp.layer(i).name)
+
+    # BridgeAccessWarning: 3 bridge round trip(s) per iteration repeated 120 times
+    # on this line (call .layer() x120, get .name x120). Read the fields in one
+    # trip with comp.layers.select("name") or comp.layers.values("name").
+
+The Python Console runs every execution under a detector when
+Edit > Warn on N+1 Bridge Access is checked.
+"""
+
+import linecache
+import re
+import warnings
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+import bridge_profiler
+
+
+# Round trips from one line with the same shape needed before warning
+DEFAULT_THRESHOLD = 10
+
+# Numbers (object ids, indices, literal values) don't change the shape of an operation
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?")
+
+_GET = re.compile(r"\.(\w+);?$")
+_CALL = re.compile(r"\.(\w+)\(")
+_SET = re.compile(r"__AEPython_setattr\(#, '(\w+)'")
+
+# Methods returning one element of a collection by index or name
+_ELEMENT_METHODS = {"layer", "item", "property", "effect", "mask", "outputModule", "key", "keyValue", "keyTime"}
+
+# Element method -> collection attribute on the same receiver
+_COLLECTIONS = {"layer": "layers", "item": "items", "outputModule": "outputModules"}
+
+
+class BridgeAccessWarning(UserWarning):
+    """A source line issued many structurally identical bridge round trips."""
+
+
+def _shape(code: str) -> str:
+    """Normalize a host payload so per-element variants compare equal."""
+    inner = code
+    if inner.startswith("__AEPython_executeScript(") and inner.endswith(")"):
+        inner = inner[len("__AEPython_executeScript("):-1]
+        # The dispatcher payload is a Python repr of the ES source
+        if len(inner) >= 2 and inner[0] == inner[-1] and inner[0] in "'\"":
+            inner = inner[1:-1]
+    inner = _NUMBER.sub("#", inner)
+    return inner
+
+
+def _describe(kind: str, shape: str) -> str:
+    """Short label for one operation shape, e.g. "get .name"."""
+    if kind == "get":
+        match = _GET.search(shape)
+        return f"get .{match.group(1)}" if match else "get"
+    if kind == "set":
+        match = _SET.search(shape)
+        return f"set .{match.group(1)}" if match else "set"
+    if kind == "call":
+        match = _CALL.search(shape)
+        return f"call .{match.group(1)}()" if match else "call"
+    if kind == "index":
+        return "index [i]"
+    return kind
+
+
+@dataclass
+class Pattern:
+    kind: str
+    shape: str
+    count: int
+
+    @property
+    def label(self) -> str:
+        return _describe(self.kind, self.shape)
+
+
+@dataclass
+class Finding:
+    """One source line that crossed the bridge once per element."""
+    filename: str
+    lineno: int
+    function: str
+    repeats: int
+    round_trips: int
+    per_iteration: int
+    patterns: list = field(default_factory=list)
+
+    @property
+    def suggestion(self) -> str:
+        return _suggest(self.patterns, linecache.getline(self.filename, self.lineno))
+
+    @property
+    def message(self) -> str:
+        ops = ", ".join(f"{p.label} x{p.count}" for p in self.patterns)
+        return (
+            f"{self.per_iteration} bridge round trip(s) per iteration repeated {self.repeats} times "
+            f"on this line ({ops}). {self.suggestion}"
+        )
+
+    def __str__(self) -> str:
+        return f"{self.filename}:{self.lineno} ({self.function}): {self.message}"
+
+
+def _member(regex, pattern: Pattern):
+    match = regex.search(pattern.shape)
+    return match.group(1) if match else None
+
+
+def _collection_expr(patterns: list, source: str) -> str:
+    """Guess the collection a loop walks from the offending source line."""
+    for pattern in patterns:
+        method = _member(_CALL, pattern)
+        if method in _COLLECTIONS:
+            match = re.search(rf"([A-Za-z_][\w.]*)\.{method}\(", source)
+            if match:
+                return f"{match.group(1)}.{_COLLECTIONS[method]}"
+    return "collection"
+
+
+def _suggest(patterns: list, source: str = "") -> str:
+    """Name the batch API that replaces the repeated operations."""
+    kinds = {p.kind for p in patterns}
+    reads = [_member(_GET, p) for p in patterns if p.kind == "get" and _member(_GET, p)]
+    elements = any(p.kind == "index" or _member(_CALL, p) in _ELEMENT_METHODS for p in patterns)
+    collection = _collection_expr(patterns, source)
+
+    if "set" in kinds or ("call" in kinds and not elements):
+        return ("Move the loop into ExtendScript with one @ae.es_function helper, "
+                f"or compute the values with ae.remote_map({collection}, fn).")
+    if "query" in kinds:
+        return f"Hoist the query out of the loop and filter once with {collection}.where(...)."
+    if "new" in kinds:
+        return "Build the objects inside one @ae.es_function helper instead of one bridge call each."
+    if reads:
+        fields = ", ".join(f'"{name}"' for name in dict.fromkeys(reads))
+        hint = f" or {collection}.values({fields})" if len(set(reads)) == 1 else ""
+        return f"Read the fields in one trip with {collection}.select({fields}){hint}."
+    if elements:
+        return f"Fetch the handles in one trip with {collection}.where(...).all()."
+    return f"Batch the loop with {collection}.select(), ae.remote_map() or an @ae.es_function helper."
+
+
+class Detector:
+    """
+    Groups bridge round trips by source line and operation shape.
+    Use via ae.detect_n_plus_one().
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, warn: bool = True):
+        self.threshold = threshold
+        self.warn = warn
+        self._counts = Counter()
+        self._functions = {}
+
+    def __enter__(self):
+        bridge_profiler.add_listener(self.record)
+        return self
+
+    def __exit__(self, *exc):
+        bridge_profiler.remove_listener(self.record)
+        if self.warn:
+            self.emit()
+        return False
+
+    def record(self, call):
+        # Frees are issued by the garbage collector, not by the user's line
+        if call.kind == "delete":
+            return
+        self._counts[(call.filename, call.lineno, call.kind, _shape(call.code))] += 1
+        self._functions[(call.filename, call.lineno)] = call.function
+
+    def findings(self) -> list:
+        """Return offending lines, most round trips first."""
+        lines = defaultdict(list)
+        for (filename, lineno, kind, shape), count in self._counts.items():
+            lines[(filename, lineno)].append(Pattern(kind, shape, count))
+
+        findings = []
+        for (filename, lineno), patterns in lines.items():
+            repeated = [p for p in patterns if p.count >= self.threshold]
+            if not repeated:
+                continue
+            repeated.sort(key=lambda p: p.count, reverse=True)
+            # obj.method(...) costs a get for the method plus the call; only report the call
+            called = {_member(_CALL, p) for p in repeated if p.kind == "call"}
+            shown = [p for p in repeated if not (p.kind == "get" and _member(_GET, p) in called)]
+            findings.append(Finding(
+                filename, lineno, self._functions[(filename, lineno)],
+                repeats=repeated[0].count,
+                round_trips=sum(p.count for p in repeated),
+                per_iteration=len(repeated),
+                patterns=shown,
+            ))
+        findings.sort(key=lambda f: f.round_trips, reverse=True)
+        return findings
+
+    def emit(self):
+        """Issue one BridgeAccessWarning per offending line."""
+        for finding in self.findings():
+            warnings.warn_explicit(finding.message, BridgeAccessWarning, finding.filename, finding.lineno)
+
+
+def detect_n_plus_one(threshold: int = DEFAULT_THRESHOLD, warn: bool = True) -> Detector:
+    """Context manager warning about per-element bridge access in its block."""
+    return Detector(threshold, warn)
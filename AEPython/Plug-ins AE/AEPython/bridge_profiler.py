@@ -0,0 +1,198 @@
+"""
+AEPython bridge profiler
+
+Records every Python -> ExtendScript round trip while a profile is active:
+operation kind, payload sizes, wall-clock latency and the Python line that
+triggered it.
+
+Example:
+    import AEPython as ae
+
+    with ae.profile() as p:
+        run_my_tool()
+
+    print(p.report())              # slowest call sites first
+    print(p.report(sort="count"))  # chattiest call sites first
+
+When no profile is active the bridge only pays a single `is None` check per
+round trip.
+"""
+
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import AEPython as ae
+
+
+# Modules whose frames are skipped when attributing a call to user code
+BRIDGE_MODULES = {
+    "AEPython", "es_query", "es_transpiler", "es_functions", "bridge_profiler", "bridge_patterns",
+    "bridge_recorder", "bridge_aio", "bridge_executor", "bridge_transport", "transport", "cooperative",
+    "ae_parallel", "jsx_api",
+}
+
+# Callbacks receiving every BridgeCall while tracing is on
+_listeners = []
+
+
+@dataclass
+class BridgeCall:
+    """One host round trip."""
+    kind: str
+    code: str
+    code_length: int
+    result_length: int
+    elapsed: float
+    filename: str
+    lineno: int
+    function: str
+    result: str = None
+    error: str = None
+
+
+@dataclass
+class CallSite:
+    """Aggregated round trips issued from one Python source line."""
+    filename: str
+    lineno: int
+    function: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    code_bytes: int = 0
+    result_bytes: int = 0
+    kinds: Counter = field(default_factory=Counter)
+
+    @property
+    def location(self) -> str:
+        return f"{self.filename}:{self.lineno} ({self.function})"
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+def call_site():
+    """Return the first frame outside the bridge modules."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__") in BRIDGE_MODULES:
+        frame = frame.f_back
+    return frame
+
+
+def _trace(code: str, kind: str):
+    """ae._tracer while tracing: time the host call and notify listeners."""
+    start = time.perf_counter()
+    ret = None
+    error = None
+    try:
+        ret = ae._transport.execute(code)
+        return ret
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        frame = call_site()
+        if frame is not None:
+            filename, lineno, function = frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name
+        else:
+            filename, lineno, function = "<bridge>", 0, "<bridge>"
+        call = BridgeCall(kind, code, len(code), len(ret) if ret else 0, elapsed, filename, lineno, function,
+                          ret, error)
+        for listener in list(_listeners):
+            listener(call)
+
+
+def add_listener(listener):
+    """Start delivering BridgeCall records to listener."""
+    _listeners.append(listener)
+    ae._tracer = _trace
+
+
+def remove_listener(listener):
+    """Stop delivering records to listener; tracing turns off with the last one."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+    if not _listeners:
+        ae._tracer = None
+
+
+class Profile:
+    """Collects BridgeCall records per call site. Use via ae.profile()."""
+
+    SORT_KEYS = {
+        "time": lambda site: site.total_time,
+        "count": lambda site: site.count,
+        "avg": lambda site: site.average_time,
+        "max": lambda site: site.max_time,
+        "bytes": lambda site: site.code_bytes + site.result_bytes,
+    }
+
+    def __init__(self):
+        self.sites = {}
+        self.kinds = Counter()
+        self.calls = 0
+        self.total_time = 0.0
+        self.wall_time = 0.0
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        add_listener(self.record)
+        return self
+
+    def __exit__(self, *exc):
+        remove_listener(self.record)
+        self.wall_time = time.perf_counter() - self._start
+        return False
+
+    def record(self, call: BridgeCall):
+        key = (call.filename, call.lineno)
+        site = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = CallSite(call.filename, call.lineno, call.function)
+        site.count += 1
+        site.total_time += call.elapsed
+        site.max_time = max(site.max_time, call.elapsed)
+        site.code_bytes += call.code_length
+        site.result_bytes += call.result_length
+        site.kinds[call.kind] += 1
+
+        self.kinds[call.kind] += 1
+        self.calls += 1
+        self.total_time += call.elapsed
+
+    def top(self, n: int = 20, sort: str = "time") -> list:
+        """Return the n heaviest call sites by time, count, avg, max or bytes."""
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort key {sort!r}, expected one of {', '.join(self.SORT_KEYS)}")
+        return sorted(self.sites.values(), key=self.SORT_KEYS[sort], reverse=True)[:n]
+
+    def report(self, sort: str = "time", limit: int = 20) -> str:
+        """Format the top call sites as a text table."""
+        lines = [
+            f"Bridge profile: {self.calls} round trips, {self.total_time * 1000:.1f} ms in host "
+            f"of {self.wall_time * 1000:.1f} ms wall",
+            "  by kind: " + ", ".join(f"{kind}={count}" for kind, count in self.kinds.most_common()),
+            "",
+            f"{'time ms':>10} {'calls':>7} {'avg ms':>8} {'max ms':>8} {'sent B':>9} {'recv B':>9}  kinds / location",
+        ]
+        for site in self.top(limit, sort):
+            kinds = ",".join(f"{kind}:{count}" for kind, count in site.kinds.most_common())
+            lines.append(
+                f"{site.total_time * 1000:>10.1f} {site.count:>7} {site.average_time * 1000:>8.2f} "
+                f"{site.max_time * 1000:>8.2f} {site.code_bytes:>9} {site.result_bytes:>9}  "
+                f"{kinds}  {site.location}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+def profile() -> Profile:
+    """Context manager profiling every bridge round trip in its block."""
+    return Profile()
@@ -0,0 +1,306 @@
+"""
+AEPython bridge traffic recorder and replayer
+
+Records every executeScript request/response pair, with timings, to an
+append-only JSON Lines log while you work in After Effects. The log can then
+be replayed through a stub _AEPython to re-run the same Python script with no
+After Effects, e.g. to benchmark protocol changes against production traces.
+
+Example (inside AE):
+    import AEPython as ae
+
+    with ae.record("~/Documents/AEPython/bridge_logs/sort.jsonl"):
+        run_my_tool()
+
+Example (anywhere, before `import AEPython`):
+    import bridge_recorder
+
+    host = bridge_recorder.install("sort.jsonl")
+    import my_tool
+    my_tool.run_my_tool()
+    host.round_trips, host.clock   # replayed trips, recorded host time
+
+    # or from a shell:
+    python bridge_recorder.py sort.jsonl my_tool.py
+
+Log format: one JSON object per line. The first line is a header, each
+following line one round trip:
+    {"format": "aepython-bridge-log", "version": 1, "started": "...", ...}
+    {"t": 0.0012, "kind": "get", "code": "...", "result": "object,CompItem,3",
+     "elapsed": 0.0004, "site": "my_tool.py:12"}
+A failed round trip stores "error" instead of "result". Paths ending in .gz
+are gzip-compressed. The UI thread only enqueues records: serialization and
+file I/O happen on a background writer thread.
+"""
+
+import gzip
+import json
+import os
+import platform
+import queue
+import sys
+import threading
+import time
+import types
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+
+from bridge_transport import InProcessTransport
+
+FORMAT = "aepython-bridge-log"
+VERSION = 1
+
+# Default folder for logs recorded from the Python Console
+LOG_DIR = Path.home() / "Documents" / "AEPython" / "bridge_logs"
+
+# How many recorded round trips the replayer looks ahead for a match
+LOOKAHEAD = 256
+
+_DELETE_PREFIX = "__AEPython_deleteObject("
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    """
+    Tees bridge round trips into a log file. Use via ae.record().
+
+    Records are handed to a writer thread through a queue, so the host call
+    only pays for building a tuple.
+    """
+
+    def __init__(self, path, flush_every: int = 256):
+        self.path = Path(os.path.expanduser(str(path)))
+        self.flush_every = flush_every
+        self.count = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def start(self) -> "Recorder":
+        import bridge_profiler
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._start = time.perf_counter()
+        header = {
+            "format": FORMAT,
+            "version": VERSION,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+        }
+        self._thread = threading.Thread(target=self._write_loop, args=(header,),
+                                         name="AEPython bridge recorder", daemon=True)
+        self._thread.start()
+        bridge_profiler.add_listener(self.record)
+        return self
+
+    def stop(self):
+        """Stop recording and wait until every record is on disk."""
+        import bridge_profiler
+
+        bridge_profiler.remove_listener(self.record)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def record(self, call):
+        self.count += 1
+        self._queue.put((time.perf_counter() - self._start, call))
+
+    def _write_loop(self, header: dict):
+        with _open(self.path, "a") as f:
+            f.write(json.dumps(header) + "\n")
+            pending = 0
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                offset, call = item
+                entry = {"t": round(offset, 6), "kind": call.kind, "code": call.code}
+                if call.error is not None:
+                    entry["error"] = call.error
+                else:
+                    entry["result"] = call.result
+                entry["elapsed"] = round(call.elapsed, 6)
+                entry["site"] = f"{os.path.basename(call.filename)}:{call.lineno}"
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                pending += 1
+                # Flush in batches, and whenever the recorder catches up
+                if pending >= self.flush_every or self._queue.empty():
+                    f.flush()
+                    pending = 0
+
+
+def record(path=None) -> Recorder:
+    """
+    Context manager recording every bridge round trip in its block to path
+    (default: a timestamped file in Documents/AEPython/bridge_logs).
+    """
+    if path is None:
+        path = LOG_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+    return Recorder(path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def read_log(path) -> tuple:
+    """Return (header, entries) of a recorded log."""
+    path = Path(os.path.expanduser(str(path)))
+    header = None
+    entries = []
+    with _open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "format" in entry:
+                if entry["format"] != FORMAT or entry.get("version", 0) > VERSION:
+                    raise ValueError(f"{path} is not a version {VERSION} {FORMAT} file")
+                # Appended sessions each start with a header; keep the first
+                header = header or entry
+                continue
+            entries.append(entry)
+    if header is None:
+        raise ValueError(f"{path} has no {FORMAT} header")
+    return header, entries
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class ReplayMismatch(Exception):
+    """The replayed script sent a request the log has no answer for."""
+
+
+class Replayer:
+    """
+    Answers executeScript() from a recorded log, acting as _AEPython.
+
+    Requests are matched in recorded order, looking ahead up to LOOKAHEAD
+    entries so small reorderings (garbage-collected wrappers) do not derail
+    the replay. Object frees are always accepted. With strict=False an
+    unmatched request falls back to any recorded answer for the same code.
+
+    Recorded host time is added to `clock`, or slept when realtime=True.
+    """
+
+    def __init__(self, path, strict: bool = True, realtime: bool = False, lookahead: int = LOOKAHEAD):
+        self.header, entries = read_log(path)
+        self.strict = strict
+        self.realtime = realtime
+        self.lookahead = lookahead
+        self.round_trips = 0
+        self.clock = 0.0
+        self.misses = 0
+        self._pending = deque(e for e in entries if not e["code"].startswith(_DELETE_PREFIX))
+        self._by_code = defaultdict(deque)
+        for entry in self._pending:
+            self._by_code[entry["code"]].append(entry)
+        self.module = self._make_module()
+
+    def _make_module(self) -> types.ModuleType:
+        module = types.ModuleType("_AEPython", "Replayed AEPython host module")
+        module.executeScript = self.executeScript
+        module.getPluginPath = lambda: os.path.join(os.path.dirname(os.path.abspath(__file__)), "AEPython.aex")
+        module.getMainHWND = lambda: 0
+        module.startUndoGroup = lambda name="": None
+        module.endUndoGroup = lambda: None
+        module.locals = {}
+        module.replayer = self
+        return module
+
+    @property
+    def remaining(self) -> int:
+        """Recorded round trips not replayed yet."""
+        return len(self._pending)
+
+    def _take(self, code: str) -> dict:
+        for i, entry in enumerate(self._pending):
+            if i >= self.lookahead:
+                break
+            if entry["code"] == code:
+                del self._pending[i]
+                self._by_code[code].remove(entry)
+                return entry
+        if not self.strict and self._by_code[code]:
+            self.misses += 1
+            return self._by_code[code][0]
+        expected = self._pending[0]["code"] if self._pending else "<end of log>"
+        raise ReplayMismatch(f"No recorded answer for {code!r} (next recorded request: {expected!r})")
+
+    def executeScript(self, code: str) -> str:
+        self.round_trips += 1
+        if code.startswith(_DELETE_PREFIX):
+            return ""
+        entry = self._take(code)
+        elapsed = entry.get("elapsed", 0.0)
+        if self.realtime:
+            time.sleep(elapsed)
+        else:
+            self.clock += elapsed
+        if "error" in entry:
+            raise Exception(entry["error"])
+        return entry["result"]
+
+
+def install(path, **kwargs) -> Replayer:
+    """
+    Register a Replayer for path as the _AEPython module and return it.
+
+    Call before `import AEPython`; if AEPython is already imported its host
+    module is swapped too. kwargs are passed to Replayer().
+    """
+    replayer = Replayer(path, **kwargs)
+    sys.modules["_AEPython"] = replayer.module
+    if "AEPython" in sys.modules:
+        sys.modules["AEPython"].set_transport(InProcessTransport(replayer.module))
+    return replayer
+
+
+def main(argv=None) -> int:
+    import argparse
+    import runpy
+
+    parser = argparse.ArgumentParser(description="Replay a recorded AEPython bridge log")
+    parser.add_argument("log", help="recorded .jsonl or .jsonl.gz log")
+    parser.add_argument("script", help="Python script to run against the log")
+    parser.add_argument("--lenient", action="store_true", help="answer unmatched requests by code")
+    parser.add_argument("--realtime", action="store_true", help="sleep the recorded host time")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    replayer = install(args.log, strict=not args.lenient, realtime=args.realtime)
+    start = time.perf_counter()
+    runpy.run_path(args.script, run_name="__main__")
+    wall = time.perf_counter() - start
+    print(
+        f"Replayed {replayer.round_trips} round trips in {wall * 1000:.1f} ms "
+        f"(recorded host time {replayer.clock * 1000:.1f} ms, {replayer.misses} lenient matches, "
+        f"{replayer.remaining} recorded round trips unused)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
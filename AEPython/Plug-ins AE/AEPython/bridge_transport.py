@@ -0,0 +1,87 @@
+"""
+AEPython transport interface
+
+The Transport interface and the transports that need nothing but this
+process: InProcessTransport (the embedded _AEPython module, the default
+inside After Effects) and NoTransport (outside AE until ae.connect()).
+AEPython imports this module at launch; the socket transport and server
+live in transport.py, which is only imported by ae.connect() and
+transport.serve().
+
+Example:
+    import AEPython as ae
+    from bridge_transport import InProcessTransport
+
+    ae.set_transport(InProcessTransport(stub_module))   # any _AEPython look-alike
+"""
+
+
+class TransportError(Exception):
+    """The connection to the host failed or the protocol was violated."""
+
+
+class Transport:
+    """Interface between the bridge and an ExtendScript host."""
+
+    def execute(self, code: str) -> str:
+        """Run ExtendScript and return the host's result string."""
+        raise NotImplementedError
+
+    def execute_many(self, codes: list) -> list:
+        """Run several scripts in order; returns results, or Exceptions for failed ones."""
+        results = []
+        for code in codes:
+            try:
+                results.append(self.execute(code))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def post(self, code: str):
+        """Run ExtendScript whose result is not needed."""
+        self.execute(code)
+
+    def start_undo_group(self, name: str):
+        raise NotImplementedError
+
+    def end_undo_group(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class InProcessTransport(Transport):
+    """Calls an _AEPython-compatible module in this process."""
+
+    def __init__(self, module):
+        self.module = module
+
+    def execute(self, code: str) -> str:
+        return self.module.executeScript(code)
+
+    def start_undo_group(self, name: str):
+        self.module.startUndoGroup(name)
+
+    def end_undo_group(self):
+        self.module.endUndoGroup()
+
+    def __repr__(self) -> str:
+        return f"InProcessTransport({getattr(self.module, '__name__', self.module)!r})"
+
+
+class NoTransport(Transport):
+    """Placeholder outside After Effects until ae.connect() is called."""
+
+    def execute(self, code: str) -> str:
+        raise TransportError("Not connected to After Effects: run inside AE or call ae.connect()")
+
+    def post(self, code: str):
+        # Nothing to free without a host
+        pass
+
+    def start_undo_group(self, name: str):
+        self.execute("")
+
+    def end_undo_group(self):
+        self.execute("")
@@ -0,0 +1,96 @@
+"""
+AEPython module bundle
+
+Packs the plugin's Python modules into AEPython_modules.zip as precompiled
+bytecode. At launch the plugin puts the zip on sys.path ahead of its own
+folder, so AEPython, qtae, script_library, ... are read from one archive
+(zipimport) instead of being looked up, stat'ed and, where __pycache__ cannot
+be written (Program Files), compiled again on every launch.
+
+Modules missing from the zip, or compiled for another Python version, are
+imported from the plugin folder as before; without a zip (a development
+checkout) everything comes from source. AEPYTHON_FROM_SOURCE=1 ignores an
+existing zip. The search path is set up by the plugin's init script
+(PythonInstance.cpp), which cannot import this module first.
+
+Example (BuildRelease.ps1 runs this with the embedded Python, whose version
+the bytecode must match):
+    python bundle.py                          # writes AEPython_modules.zip next to this file
+    python bundle.py -o build/AEPython_modules.zip --optimize 2
+
+The bytecode is hash-based and unchecked, so nothing is compared against the
+source at import. Sources are stored next to it for tracebacks unless
+--no-source is given. It is compiled like the source fallback (asserts and
+__debug__ blocks kept); --optimize 1 or 2 strips them.
+"""
+
+import argparse
+import importlib.util
+import os
+import py_compile
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+BUNDLE_NAME = "AEPython_modules.zip"
+
+# Development helpers that locate files relative to their own __file__
+EXCLUDE = frozenset(("bundle.py",))
+
+
+def source_files(plugin_dir: Path) -> list:
+    """(path, archive name) of the modules and packages to bundle."""
+    plugin_dir = Path(plugin_dir)
+    files = []
+    for path in sorted(plugin_dir.glob("*.py")):
+        if path.name not in EXCLUDE:
+            files.append((path, path.name))
+    for init in sorted(plugin_dir.glob("*/__init__.py")):
+        package = init.parent
+        for path in sorted(package.rglob("*.py")):
+            if "__pycache__" not in path.parts:
+                files.append((path, path.relative_to(plugin_dir).as_posix()))
+    return files
+
+
+def build(plugin_dir: Path, target: Path = None, optimize: int = 0, include_source: bool = True) -> Path:
+    """Compile the plugin modules into a zip bundle; returns its path."""
+    plugin_dir = Path(plugin_dir)
+    target = Path(target or plugin_dir / BUNDLE_NAME)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".tmp")
+    # Stored, not deflated: zipimport reads members without zlib
+    with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(partial, "w", zipfile.ZIP_STORED) as bundle:
+        for path, name in source_files(plugin_dir):
+            pyc = Path(tmp) / (name + "c")
+            py_compile.compile(
+                str(path), cfile=str(pyc), dfile=name, doraise=True, optimize=optimize,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            bundle.write(pyc, name + "c")
+            if include_source:
+                bundle.write(path, name)
+        bundle.comment = f"AEPython modules, Python {sys.version_info.major}.{sys.version_info.minor}, " \
+                         f"magic {importlib.util.MAGIC_NUMBER.hex()}".encode()
+    os.replace(partial, target)
+    return target
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the precompiled AEPython module bundle")
+    parser.add_argument("-o", "--output", default=None, help=f"zip to write (default: {BUNDLE_NAME} next to this file)")
+    parser.add_argument("-O", "--optimize", type=int, default=0, choices=(0, 1, 2),
+                        help="like python -O / -OO (default 0: keep asserts and __debug__ blocks)")
+    parser.add_argument("--no-source", action="store_true", help="store bytecode only")
+    args = parser.parse_args(argv)
+
+    plugin_dir = Path(__file__).resolve().parent
+    target = build(plugin_dir, args.output, args.optimize, not args.no_source)
+    count = len(source_files(plugin_dir))
+    print(f"Wrote {count} modules to {target} ({target.stat().st_size / 1024:.0f} KB)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+AEPython compiled-code cache
+
+The console, the Script Library and Python.execFile (AEPython.jsx) run
+scripts from source. Parsing and compiling a long script (generated conform
+data can run to tens of thousands of lines) costs far more than running it,
+so the compiled code is kept:
+
+- in memory, in an LRU of up to MAX_ENTRIES scripts / MAX_BYTES of source,
+- on disk, in Documents/AEPython/__pycache__, so it survives AE restarts.
+
+Entries are keyed by a hash of the file name and the source. compile_file()
+also remembers each path's (mtime, size): while those are unchanged the file
+is not even read again.
+
+Example:
+    code, is_generator = code_cache.compile_file("C:/Scripts/conform.py")
+    code, is_generator = code_cache.compile_script(source, "C:/Scripts/conform.py")
+
+    code_cache.exec_file("C:/Scripts/conform.py", namespace)
+
+Sources with a "<...>" file name (console input) are compiled every time.
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import cooperative
+
+CACHE_DIR = Path.home() / "Documents" / "AEPython" / "__pycache__"
+
+# In-memory limits
+MAX_ENTRIES = 128
+MAX_BYTES = 64 * 1024 * 1024
+
+# Files kept in CACHE_DIR (oldest removed first)
+MAX_DISK_ENTRIES = 512
+
+# Bumped when compile_script() output changes shape
+FORMAT_VERSION = 1
+
+_HEADER = importlib.util.MAGIC_NUMBER + bytes((FORMAT_VERSION,))
+
+
+class CodeCache:
+    """Memory LRU in front of a directory of marshalled code objects."""
+
+    def __init__(self, directory: Path = CACHE_DIR, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (code, is_generator, source size)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # path -> (mtime_ns, size, key)
+        self._files = {}
+
+    @staticmethod
+    def key(source: bytes, filename: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(filename.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    # -- lookups -----------------------------------------------------------
+
+    def compile_script(self, source: str, filename: str) -> tuple:
+        """cooperative.compile_script(source, filename), cached."""
+        if filename.startswith("<") and filename.endswith(">"):
+            return cooperative.compile_script(source, filename)
+        data = source.encode("utf-8", "surrogatepass")
+        return self._lookup(self.key(data, filename), source, filename, len(data))
+
+    def compile_file(self, path) -> tuple:
+        """Compile the script at path; returns (code, is_generator)."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            known = self._files.get(path)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size) and known[2] in self._entries:
+                self._entries.move_to_end(known[2])
+                self.hits += 1
+                code, is_generator, _ = self._entries[known[2]]
+                return code, is_generator
+        with open(path, "rb") as f:
+            data = f.read()
+        key = self.key(data, path)
+        with self._lock:
+            self._files[path] = (stat.st_mtime_ns, stat.st_size, key)
+        # Decoded like an imported module: BOM, coding cookie, universal newlines
+        source = importlib.util.decode_source(data)
+        return self._lookup(key, source, path, len(data))
+
+    def _lookup(self, key: str, source: str, filename: str, size: int) -> tuple:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+        compiled = self._load(key)
+        if compiled is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            compiled = cooperative.compile_script(source, filename)
+            self._store(key, compiled)
+        self._remember(key, compiled, size)
+        return compiled
+
+    def _remember(self, key: str, compiled: tuple, size: int):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (compiled[0], compiled[1], size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        """Forget the in-memory entries (the disk cache stays)."""
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+            self._bytes = 0
+
+    # -- disk ----------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.{sys.implementation.cache_tag}.pyc"
+
+    def _load(self, key: str):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(_HEADER):
+            return None
+        try:
+            stored_key, code, is_generator = marshal.loads(data[len(_HEADER):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        if stored_key != key:
+            return None
+        return code, is_generator
+
+    def _store(self, key: str, compiled: tuple):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(partial, "wb") as f:
+                f.write(_HEADER + marshal.dumps((key, compiled[0], compiled[1])))
+            os.replace(partial, path)
+            self._prune()
+        except OSError:
+            # Read-only or full disk: the memory cache still works
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+
+    def _prune(self):
+        files = list(self.directory.glob("*.pyc"))
+        if len(files) <= MAX_DISK_ENTRIES:
+            return
+        files.sort(key=lambda file: file.stat().st_mtime)
+        for file in files[:len(files) - MAX_DISK_ENTRIES]:
+            try:
+                file.unlink()
+            except OSError:
+                pass
+
+
+_cache = CodeCache()
+
+
+def cache() -> CodeCache:
+    """The session's shared cache."""
+    return _cache
+
+
+def compile_script(source: str, filename: str) -> tuple:
+    return _cache.compile_script(source, filename)
+
+
+def compile_file(path) -> tuple:
+    return _cache.compile_file(path)
+
+
+def exec_file(path, globals: dict, locals: dict = None):
+    """
+    Run a script file like Python.execFile always did: in the given
+    namespace, with __file__ set for the duration of the run.
+    """
+    path = os.path.abspath(path)
+    code, is_generator = compile_file(path)
+    namespace = globals if locals is None else locals
+    namespace["__file__"] = path
+    try:
+        if is_generator:
+            _run_generator_script(code, globals, locals)
+        else:
+            exec(code, globals, locals)
+    finally:
+        namespace.pop("__file__", None)
+
+
+def _run_generator_script(code, globals: dict, locals: dict = None):
+    # Nothing advances a generator script here: run it to the end
+    if locals is None or locals is globals:
+        for _ in cooperative.start_script(code, globals):
+            pass
+        return
+    # The script function needs a single globals dict. Run it in a merged
+    # copy and move what it bound or deleted into locals, where a plain
+    # exec(code, globals, locals) would have left it
+    scope = {**globals, **locals}
+    before = dict(scope)
+    try:
+        for _ in cooperative.start_script(code, scope):
+            pass
+    finally:
+        for name, value in scope.items():
+            if before.get(name, _MISSING) is not value:
+                locals[name] = value
+        for name in before.keys() - scope.keys():
+            locals.pop(name, None)
+
+
+_MISSING = object()
@@ -0,0 +1,248 @@
+"""
+AEPython console output sink
+
+print() in the Python Console no longer touches the widget. Writes are
+appended to an in-memory buffer (from any thread) and rendered in coalesced,
+per-color runs by a timer at about 30 Hz. The view is a QPlainTextEdit
+limited to max_lines lines; lines that scroll out of it, or that arrive
+faster than they could ever be shown, are written to a log file in
+Documents/AEPython/logs instead of being kept in memory.
+
+Example:
+    view = console_output.OutputView(max_lines=20000)
+    sys.stdout = PythonWindow.Logger(view, QtGui.QColor("#d4d4d4"))
+    for i in range(100000):
+        print(i)                    # one widget update per timer tick
+
+OutputView keeps the QTextEdit calls the console used (setTextColor, append,
+textColor), so existing callers write through the same ordered buffer.
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+# Lines kept in the output view
+DEFAULT_MAX_LINES = 20_000
+
+# Timer interval rendering buffered output (~30 Hz)
+FLUSH_INTERVAL_MS = 33
+
+# Folder receiving lines that do not fit in the view
+LOG_DIR = Path.home() / "Documents" / "AEPython" / "logs"
+
+
+class Spill:
+    """Append-only log file, created on first use."""
+
+    def __init__(self, directory: Path = LOG_DIR):
+        self.directory = Path(directory)
+        self.path = None
+        self.lines = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, text: str):
+        if not text:
+            return
+        with self._lock:
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self.path = self.directory / f"console-{datetime.now():%Y%m%d-%H%M%S}.log"
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(text)
+            self._file.flush()
+            self.lines += text.count("\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OutputBuffer:
+    """
+    Thread-safe list of (color, text) runs waiting to be rendered.
+
+    Adjacent writes with the same color are merged into one run. When more
+    than max_lines lines are pending, the oldest go to spill right away, so a
+    script printing while the UI cannot update uses bounded memory.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, spill: Spill = None):
+        self.max_lines = max_lines
+        self.spill = spill or Spill()
+        self._lock = threading.Lock()
+        self._runs = []
+        self._lines = 0
+        self._alerts = []
+
+    def write(self, text: str, color=None, alert=None) -> bool:
+        """Queue text; returns True when the buffer was empty before."""
+        with self._lock:
+            was_empty = not self._runs
+            if self._runs and self._runs[-1][0] == color:
+                self._runs[-1][1].append(text)
+            else:
+                self._runs.append((color, [text]))
+            self._lines += text.count("\n")
+            if alert is not None and alert not in self._alerts:
+                self._alerts.append(alert)
+            if self._lines > 2 * self.max_lines:
+                self._trim(self._lines - self.max_lines)
+        return was_empty
+
+    def _trim(self, lines: int):
+        """Move the oldest `lines` pending lines to the spill file."""
+        runs = [(color, "".join(parts)) for color, parts in self._runs]
+        spilled, runs = split_lines(runs, lines)
+        self.spill.write(spilled)
+        self._runs = [(color, [text]) for color, text in runs]
+        self._lines -= spilled.count("\n")
+
+    def take(self) -> tuple:
+        """Return and clear (runs, alerts); runs are (color, text) pairs."""
+        with self._lock:
+            runs = [(color, "".join(parts)) for color, parts in self._runs]
+            alerts = self._alerts
+            self._runs, self._lines, self._alerts = [], 0, []
+        return runs, alerts
+
+    def clear(self):
+        with self._lock:
+            self._runs, self._lines, self._alerts = [], 0, []
+
+
+def split_lines(runs: list, lines: int) -> tuple:
+    """Split runs after their first `lines` newlines: (head text, tail runs)."""
+    head = []
+    for index, (color, text) in enumerate(runs):
+        count = text.count("\n")
+        if count < lines:
+            head.append(text)
+            lines -= count
+            continue
+        cut = -1
+        for _ in range(lines):
+            cut = text.index("\n", cut + 1)
+        head.append(text[:cut + 1])
+        rest = text[cut + 1:]
+        tail = ([(color, rest)] if rest else []) + runs[index + 1:]
+        return "".join(head), tail
+    return "".join(head), []
+
+
+class OutputView(QtWidgets.QPlainTextEdit):
+    """Read-only console output fed through an OutputBuffer."""
+
+    _wake = QtCore.Signal()
+
+    def __init__(self, parent=None, max_lines: int = DEFAULT_MAX_LINES, log_dir: Path = LOG_DIR):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.spill = Spill(log_dir)
+        self.buffer = OutputBuffer(max_lines, self.spill)
+        self.setMaximumBlockCount(max_lines)
+        self._color = self.palette().color(QtGui.QPalette.ColorRole.Text)
+        self._empty = True
+        self._spill_noted = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._schedule, QtCore.Qt.ConnectionType.QueuedConnection)
+        self._main_thread = threading.main_thread()
+
+    # -- configuration ---------------------------------------------------
+
+    @property
+    def max_lines(self) -> int:
+        return self.buffer.max_lines
+
+    def set_max_lines(self, max_lines: int):
+        self.flush()
+        self.buffer.max_lines = max_lines
+        self.setMaximumBlockCount(max_lines)
+
+    # -- writing (any thread) --------------------------------------------
+
+    def write(self, text: str, color=None, alert=None):
+        """Queue text in color (a QColor); alert() is called once at the next render."""
+        if not text:
+            return
+        self._empty = False
+        if self.buffer.write(text, color, alert):
+            if threading.current_thread() is self._main_thread:
+                self._schedule()
+            else:
+                self._wake.emit()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    # -- QTextEdit compatibility ------------------------------------------
+
+    def textColor(self) -> QtGui.QColor:
+        return QtGui.QColor(self._color)
+
+    def setTextColor(self, color: QtGui.QColor):
+        self._color = QtGui.QColor(color)
+
+    def append(self, text: str):
+        """Start a new line with text, in the current text color."""
+        self.write(text if self._empty else "\n" + text, self._color)
+
+    def insertPlainText(self, text: str):
+        self.write(text, self._color)
+
+    def clear(self):
+        self.buffer.clear()
+        super().clear()
+        self._empty = True
+
+    # -- rendering (main thread) -------------------------------------------
+
+    def flush(self):
+        """Render everything buffered so far."""
+        runs, alerts = self.buffer.take()
+        if runs:
+            self._render(runs)
+        for alert in alerts:
+            alert()
+
+    def _render(self, runs: list):
+        document = self.document()
+        lines = sum(text.count("\n") for _, text in runs)
+        blocks = document.blockCount() if not document.isEmpty() else 0
+        overflow = blocks + lines - self.max_lines
+        if overflow > 0:
+            # The oldest lines leave the view: keep them in the log file
+            kept = min(overflow, blocks)
+            self.spill.write("".join(document.findBlockByNumber(i).text() + "\n" for i in range(kept)))
+            if overflow > blocks:
+                head, runs = split_lines(runs, overflow - blocks)
+                self.spill.write(head)
+            if not self._spill_noted:
+                self._spill_noted = True
+                self.setToolTip(f"Older output is saved in {self.spill.path}")
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        cursor = QtGui.QTextCursor(document)
+        cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        char_format = QtGui.QTextCharFormat()
+        for color, text in runs:
+            if color is not None:
+                char_format.setForeground(color)
+            else:
+                char_format.clearForeground()
+            cursor.insertText(text, char_format)
+        cursor.endEditBlock()
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
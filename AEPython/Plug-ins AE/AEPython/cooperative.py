@@ -0,0 +1,334 @@
+"""
+AEPython cooperative script execution
+
+Keeps After Effects responsive while long scripts run on its main thread.
+
+A script with a top-level `yield` runs as a generator: the console advances it
+from a Qt timer, a few dozen milliseconds per tick, and AE repaints and
+handles input in between. What it yields is shown as progress:
+
+Example (console or Script Library):
+    import AEPython as ae
+
+    comp = ae.app.project.activeItem
+    total = comp.numLayers
+    for i in range(1, total + 1):
+        conform(comp.layer(i))
+        yield i, total              # or a fraction 0..1, or a status string
+
+Cancel closes the generator, so `finally` blocks and context managers in the
+script still run.
+
+Scripts without `yield` run as before, but under auto_yield(): every bridge
+round trip checks whether the last event-loop pump is more than
+AUTO_YIELD_INTERVAL ago and, if so, lets Qt process pending events (repaint,
+the Cancel button). A cancelled plain script gets ScriptCancelled raised from
+its next bridge call.
+"""
+
+import ast
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import AEPython as ae
+
+# Name of the function a generator script is compiled into
+SCRIPT_FUNCTION = "__aepython_script__"
+
+# Seconds of script work per timer tick for generator scripts
+TICK_BUDGET = 0.040
+
+# Seconds between event-loop pumps while a plain script calls the bridge
+AUTO_YIELD_INTERVAL = 0.100
+
+
+class ScriptCancelled(KeyboardInterrupt):
+    """Raised into a script the user cancelled."""
+
+
+# ---------------------------------------------------------------------------
+# Compiling
+# ---------------------------------------------------------------------------
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda,
+           ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def _top_level_nodes(statements: list):
+    """Walk statements without entering nested scopes (the scope nodes themselves are yielded)."""
+    stack = list(reversed(statements))
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, _SCOPES):
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def _is_generator_script(tree: ast.Module) -> bool:
+    return any(isinstance(node, (ast.Yield, ast.YieldFrom)) for node in _top_level_nodes(tree.body))
+
+
+def _bound_names(statements: list) -> list:
+    """Names a module body binds, which the wrapper function declares global."""
+    names = {}
+    for node in _top_level_nodes(statements):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names[node.id] = None
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names[node.name] = None
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != "*":
+                    names[alias.asname or alias.name.split(".")[0]] = None
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names[node.name] = None
+    # "x: int = 1" cannot be global; such names stay local to the script
+    for node in _top_level_nodes(statements):
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.pop(node.target.id, None)
+    return list(names)
+
+
+def compile_script(source: str, filename: str) -> tuple:
+    """
+    Compile console or Script Library source: returns (code, is_generator).
+
+    A generator script is compiled into a function named SCRIPT_FUNCTION that
+    declares every name the script binds global, so exec(code, namespace)
+    defines the function and namespace[SCRIPT_FUNCTION]() starts the script
+    with the same globals a plain run would see.
+    """
+    tree = ast.parse(source, filename)
+    if not _is_generator_script(tree):
+        return compile(tree, filename, "exec"), False
+
+    # The docstring and __future__ imports must stay at the top of the module
+    header = 0
+    if tree.body and isinstance(tree.body[0], ast.Expr) and isinstance(tree.body[0].value, ast.Constant) \
+            and isinstance(tree.body[0].value.value, str):
+        header = 1
+    while header < len(tree.body) and isinstance(tree.body[header], ast.ImportFrom) \
+            and tree.body[header].module == "__future__":
+        header += 1
+
+    function = ast.parse(f"def {SCRIPT_FUNCTION}():\n    pass").body[0]
+    body = tree.body[header:]
+    names = _bound_names(body)
+    if names:
+        body.insert(0, ast.Global(names=names))
+    function.body = body
+    ast.copy_location(function, tree.body[header])
+    tree.body = tree.body[:header] + [function]
+    ast.fix_missing_locations(tree)
+    return compile(tree, filename, "exec"), True
+
+
+def start_script(code, namespace: dict):
+    """Run a compiled generator script's definition and return its generator."""
+    exec(code, namespace)
+    return namespace.pop(SCRIPT_FUNCTION)()
+
+
+# ---------------------------------------------------------------------------
+# Generator scripts
+# ---------------------------------------------------------------------------
+
+class ScriptTask:
+    """A generator script advanced in time slices."""
+
+    def __init__(self, generator, name: str = ""):
+        self.generator = generator
+        self.name = name
+        self.state = "running"
+        self.progress = None
+        self.message = ""
+        self.steps = 0
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.state != "running"
+
+    def _report(self, value):
+        if value is None:
+            return
+        if isinstance(value, str):
+            self.message = value
+        elif isinstance(value, tuple) and len(value) == 2:
+            current, total = value
+            self.progress = current / total if total else None
+            self.message = f"{current} / {total}"
+        elif isinstance(value, (int, float)):
+            self.progress = min(1.0, max(0.0, float(value)))
+
+    def run_slice(self, budget: float = TICK_BUDGET) -> bool:
+        """Advance until budget seconds are used up; False once the script ended."""
+        if self.done:
+            return False
+        start = time.perf_counter()
+        deadline = start + budget
+        try:
+            while True:
+                self._report(next(self.generator))
+                self.steps += 1
+                if time.perf_counter() >= deadline:
+                    return True
+        except StopIteration:
+            self.state = "finished"
+        except KeyboardInterrupt as e:
+            # Stopped by the watchdog in the middle of a slice
+            self.state = "cancelled"
+            self.error = e
+            self.generator.close()
+        except BaseException as e:
+            self.state = "failed"
+            self.error = e
+        finally:
+            self.elapsed += time.perf_counter() - start
+        return False
+
+    def cancel(self):
+        """Stop the script; its finally blocks run."""
+        if self.done:
+            return
+        try:
+            self.generator.close()
+        except BaseException as e:
+            self.error = e
+        self.state = "cancelled"
+        if self.error is None:
+            self.error = ScriptCancelled(f"{self.name or 'Script'} cancelled")
+
+
+class CooperativeRunner:
+    """
+    Advances ScriptTasks from a zero-interval QTimer, so every tick runs
+    after Qt has processed pending events. The tick budget is shared by the
+    running tasks. on_progress(task) and on_finished(task) are called on the
+    main thread. Slices run inside guard.armed() when a script_watchdog
+    Watchdog is given.
+    """
+
+    def __init__(self, on_progress=None, on_finished=None, budget: float = TICK_BUDGET, guard=None):
+        from PySide6 import QtCore
+
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.budget = budget
+        self.guard = guard
+        self.tasks = []
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self, generator, name: str = "") -> ScriptTask:
+        task = ScriptTask(generator, name)
+        self.tasks.append(task)
+        if not self.timer.isActive():
+            self.timer.start()
+        return task
+
+    def cancel(self, task: ScriptTask = None):
+        """Cancel task, or every running task."""
+        for running in list(self.tasks):
+            if task is None or running is task:
+                running.cancel()
+                self._finish(running)
+
+    def _finish(self, task: ScriptTask):
+        if task in self.tasks:
+            self.tasks.remove(task)
+            if self.on_finished is not None:
+                self.on_finished(task)
+        if not self.tasks:
+            self.timer.stop()
+
+    def _tick(self):
+        budget = self.budget / max(1, len(self.tasks))
+        for task in list(self.tasks):
+            with self.guard.armed() if self.guard is not None else nullcontext():
+                more = task.run_slice(budget)
+            if more:
+                if self.on_progress is not None:
+                    self.on_progress(task)
+            else:
+                self._finish(task)
+
+
+# ---------------------------------------------------------------------------
+# Plain scripts
+# ---------------------------------------------------------------------------
+
+# Round trips AE records in its undo history: attribute sets, and calls of
+# object-model methods that change the project. Reads (comp.layer(i),
+# layer.property(...)), evals and new Shape() / KeyframeEase(...) do not,
+# and an Edit > Undo after only those would revert the user's previous edit.
+WRITE_KINDS = frozenset(("set",))
+# The called method is the member before the first "(" (ESObjectFunction)
+WRITE_CALL = re.compile(
+    r"[^(]*\.(?:add\w*|remove\w*|set\w*|move\w*|duplicate|apply\w*|replace\w*|import\w*|precompose|copyToComp|"
+    r"createShapeLayer|reload|consolidateFootage|reduceProject|executeCommand)\("
+)
+
+
+def is_write(kind: str, code: str) -> bool:
+    """Whether a round trip (see AEPython._hostExecute) records an undo entry."""
+    return kind in WRITE_KINDS or (kind == "call" and WRITE_CALL.match(code) is not None)
+
+
+class AutoYield:
+    """
+    Bridge hook pumping the event loop and delivering cancellation. mutated
+    tells whether the script sent a write AE records for undo (is_write).
+    """
+
+    def __init__(self, interval: float = AUTO_YIELD_INTERVAL, pump=None):
+        self.interval = interval
+        self.pump = pump or _process_events
+        self.cancelled = False
+        self.mutated = False
+        self._thread = threading.get_ident()
+        self._next = time.perf_counter() + interval
+        self._pumping = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __call__(self, kind: str, code: str = ""):
+        if threading.get_ident() != self._thread or self._pumping:
+            return
+        if not self.mutated and is_write(kind, code):
+            self.mutated = True
+        if self.cancelled:
+            raise ScriptCancelled("Script cancelled")
+        now = time.perf_counter()
+        if now < self._next:
+            return
+        self._pumping = True
+        try:
+            self.pump()
+        finally:
+            self._pumping = False
+            self._next = time.perf_counter() + self.interval
+        if self.cancelled:
+            raise ScriptCancelled("Script cancelled")
+
+
+def _process_events():
+    from PySide6 import QtCore
+
+    QtCore.QCoreApplication.processEvents()
+
+
+@contextmanager
+def auto_yield(interval: float = AUTO_YIELD_INTERVAL, pump=None):
+    """Let bridge calls of the current thread pump the event loop; yields the AutoYield."""
+    hook = AutoYield(interval, pump)
+    previous, ae._yield_hook = ae._yield_hook, hook
+    try:
+        yield hook
+    finally:
+        ae._yield_hook = previous
@@ -0,0 +1,102 @@
+"""
+AEPython registered ExtendScript functions
+
+Installs reusable ExtendScript helpers into the ES global scope once per
+session. Later calls only send the function id and the JSON arguments, so
+large JSX helpers are parsed a single time instead of on every call.
+
+Example:
+    import AEPython as ae
+
+    @ae.es_function('''
+    function (layers, label) {
+        for (var i = 1; i <= layers.length; i++) {
+            layers[i].label = label;
+        }
+        return layers.length;
+    }
+    ''')
+    def set_labels(layers, label):
+        ...
+
+    set_labels(ae.app.project.activeItem.layers, 3)
+
+The decorated Python function only provides the name and docstring; its
+body is never run. Return values cross the bridge as JSON (AE objects come
+back as wrappers). If the ES engine was reset and the helper is gone, it is
+re-installed automatically on the next call.
+"""
+
+import functools
+import hashlib
+import json
+
+import AEPython as ae
+
+
+# Returned by the guarded call when the helper is not installed (anymore)
+_MISSING = "__AEPython_missing__"
+
+# ids installed in the current ES session
+_installed = set()
+
+
+class ESRegisteredFunction:
+    """Callable proxy for an ExtendScript function installed by id."""
+
+    def __init__(self, source: str, name: str):
+        self.source = source.strip()
+        digest = hashlib.sha1(self.source.encode("utf-8")).hexdigest()[:12]
+        self.id = f"{name}_{digest}"
+        self._key = json.dumps(self.id)
+
+    def _install_code(self) -> str:
+        return (
+            "if (typeof __AEPython_functions == 'undefined') { __AEPython_functions = {}; }"
+            f"__AEPython_functions[{self._key}] = ({self.source});"
+        )
+
+    def _call_code(self, args: str) -> str:
+        return f"__AEPython_toJSON(__AEPython_functions[{self._key}]({args}))"
+
+    def install(self):
+        """Install (or re-install) the helper in the ES global scope."""
+        ae.executeScript(f"{self._install_code()} true;", "call")
+        _installed.add(self.id)
+
+    def __call__(self, *args):
+        es_args = ae._toESObject(list(args))[1:-1]
+
+        if self.id not in _installed:
+            # First call: install and call in the same round trip
+            ret = ae.executeScript(f"{self._install_code()} {self._call_code(es_args)};", "call")
+            _installed.add(self.id)
+            return ae._decodeJSON(ret)
+
+        guarded = (
+            f"(typeof __AEPython_functions != 'undefined' && __AEPython_functions[{self._key}])"
+            f" ? {self._call_code(es_args)} : {json.dumps(_MISSING)};"
+        )
+        ret = ae.executeScript(guarded, "call")
+        if ret == _MISSING:
+            _installed.discard(self.id)
+            return self(*args)
+        return ae._decodeJSON(ret)
+
+    def __repr__(self) -> str:
+        return f"<ESRegisteredFunction {self.id}>"
+
+
+def es_function(source: str, name: str = None):
+    """
+    Decorator declaring a Python stub backed by an ExtendScript function.
+
+    source is an ExtendScript function expression ("function (a, b) {...}").
+    name defaults to the decorated function's name and prefixes the ES id.
+    """
+    def decorator(fn):
+        registered = ESRegisteredFunction(source, name or fn.__name__)
+        functools.update_wrapper(registered, fn)
+        return registered
+
+    return decorator
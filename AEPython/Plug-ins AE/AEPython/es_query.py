@@ -0,0 +1,262 @@
+"""
+AEPython ES-side queries
+
+Filters AE collections inside ExtendScript instead of shipping every element
+across the bridge. A query compiles to a single ExtendScript loop and returns
+only the matching handles or records in one round trip.
+
+Example:
+    import AEPython as ae
+    comp = ae.app.project.activeItem
+
+    # Handles, one round trip
+    texts = comp.layers.where(matchName="ADBE Text Layer", locked=False).all()
+
+    # Plain records, one round trip
+    rows = comp.layers.where(inPoint__lt=5).select("name", "index")
+    # -> [{"name": "Title", "index": 1}, ...]
+
+Lookups use Django-style suffixes ("inPoint__lt", "name__contains") and nested
+attributes ("source__name"). Anything that cannot be expressed in ExtendScript
+(callables, non-JSON values) is evaluated in Python on the ES-filtered handles.
+"""
+
+import operator
+
+import AEPython as ae
+
+
+# lookup suffix -> ExtendScript expression template ({0} field, {1} value)
+_ES_OPERATORS = {
+    "eq": "({0} === {1})",
+    "ne": "({0} !== {1})",
+    "lt": "({0} < {1})",
+    "lte": "({0} <= {1})",
+    "gt": "({0} > {1})",
+    "gte": "({0} >= {1})",
+    "in": "__AEPython_contains({1}, {0})",
+    "contains": "__AEPython_contains({0}, {1})",
+    "startswith": "__AEPython_startsWith({0}, {1})",
+    "endswith": "__AEPython_endsWith({0}, {1})",
+    "isnull": "(({0} == null) === {1})",
+}
+
+# lookup suffix -> Python fallback implementation
+_PY_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda field, value: field in value,
+    "contains": lambda field, value: field is not None and value in field,
+    "startswith": lambda field, value: isinstance(field, str) and field.startswith(value),
+    "endswith": lambda field, value: isinstance(field, str) and field.endswith(value),
+    "isnull": lambda field, value: (field is None) == value,
+}
+
+
+def _is_pushable(value) -> bool:
+    """True if value can be embedded as an ExtendScript literal."""
+    if value is None or isinstance(value, (bool, int, float, str, ae.ESWrapper)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_pushable(v) for v in value)
+    return False
+
+
+def _es_field(path: list, var: str = "o") -> str:
+    """ExtendScript expression reading an attribute path from var."""
+    if len(path) == 1:
+        return f"{var}.{path[0]}"
+    return f"__AEPython_get({var}, {ae._toESObject(path)})"
+
+
+def _py_field(obj, path: list):
+    for name in path:
+        if obj is None:
+            return None
+        obj = getattr(obj, name)
+    return obj
+
+
+def compile_loop(collection, body: str, condition: str = "true",
+                 prelude: str = "", result: str = "__AEPython_toJSON(r)") -> str:
+    """
+    Build one ExtendScript loop over collection, binding each element to `o`.
+
+    collection can be a Collection, a Query (its pushed-down predicates become
+    the loop condition) or a list of wrappers/JSON values. `r` starts as an
+    empty array; prelude runs before the loop and result is returned.
+    """
+    if isinstance(collection, Query):
+        query_condition, residual = collection._split()
+        if residual:
+            raise ValueError(f"{collection!r} has Python-only predicates and cannot run in ExtendScript")
+        if condition != "true":
+            query_condition = f"{query_condition} && {condition}"
+        return compile_loop(collection._collection, body, query_condition, prelude, result)
+
+    if isinstance(collection, ae.Collection):
+        source, first = repr(collection), 1  # AE collections are 1-based
+    elif isinstance(collection, (list, tuple)) and _is_pushable(collection):
+        source, first = ae._toESObject(list(collection)), 0
+    else:
+        raise TypeError(f"Cannot loop over {type(collection).__name__} in ExtendScript")
+
+    skip = f"if (!({condition})) continue;" if condition != "true" else ""
+    return (
+        "(function (c) {"
+        f"var r = []; {prelude}"
+        f"for (var i = {first}, n = c.length + {first}; i < n; i++) {{"
+        f"var o = c[i]; {skip} {body}"
+        "}"
+        f"return {result};"
+        f"}})({source})"
+    )
+
+
+class Lookup:
+    """A single field predicate, e.g. inPoint__lt=5."""
+
+    def __init__(self, key: str, value):
+        parts = key.split("__")
+        op = "eq"
+        if len(parts) > 1 and parts[-1] in _ES_OPERATORS:
+            op = parts.pop()
+
+        for part in parts:
+            if not part.isidentifier():
+                raise ValueError(f"Invalid query field: {key!r}")
+
+        self.key = key
+        self.path = parts
+        self.op = op
+        self.value = value
+
+    @property
+    def pushable(self) -> bool:
+        return _is_pushable(self.value)
+
+    def to_es(self) -> str:
+        return _ES_OPERATORS[self.op].format(_es_field(self.path), ae._toESObject(self.value))
+
+    def __call__(self, obj) -> bool:
+        return _PY_OPERATORS[self.op](_py_field(obj, self.path), self.value)
+
+
+class Query:
+    """
+    Lazy ExtendScript-side filter over a Collection.
+
+    Nothing crosses the bridge until the query is consumed with all(),
+    select(), count(), first() or iteration.
+    """
+
+    def __init__(self, collection, predicates: list = None):
+        self._collection = collection
+        self._predicates = predicates or []
+
+    def where(self, *predicates, **lookups) -> "Query":
+        """
+        Return a new query narrowed by more predicates.
+
+        Positional arguments are callables evaluated in Python on each
+        ES-filtered handle; keyword arguments are field lookups.
+        """
+        added = list(predicates)
+        for key, value in lookups.items():
+            added.append(Lookup(key, value))
+
+        for predicate in added:
+            if not callable(predicate):
+                raise TypeError(f"Query predicate must be callable, got {predicate!r}")
+
+        return Query(self._collection, self._predicates + added)
+
+    # -----------------------------------------------------------------------
+    # Compilation
+    # -----------------------------------------------------------------------
+
+    def _split(self):
+        """Split predicates into (ExtendScript condition, Python residuals)."""
+        pushed = []
+        residual = []
+        for predicate in self._predicates:
+            if isinstance(predicate, Lookup) and predicate.pushable:
+                pushed.append(predicate.to_es())
+            else:
+                residual.append(predicate)
+        return " && ".join(pushed) or "true", residual
+
+    def _compile(self, row: str, condition: str, limit: int = None) -> str:
+        """ExtendScript collecting the row expression of every match into r."""
+        stop = f" if (r.length >= {limit}) break;" if limit is not None else ""
+        return compile_loop(self._collection, f"r.push({row});{stop}", condition=condition)
+
+    def _run(self, fields: tuple = (), limit: int = None) -> list:
+        """Execute the query. Returns (handle, values) pairs."""
+        condition, residual = self._split()
+        es_fields = [_es_field(name.split(".")) for name in fields]
+
+        if residual:
+            # Python still needs the handle to evaluate the leftovers
+            row = f"[o, [{', '.join(es_fields)}]]"
+            rows = ae._executeJSON(self._compile(row, condition))
+            matches = []
+            for handle, values in rows:
+                if all(predicate(handle) for predicate in residual):
+                    matches.append((handle, values))
+                    if limit is not None and len(matches) >= limit:
+                        break
+            return matches
+
+        if fields:
+            rows = ae._executeJSON(self._compile(f"[{', '.join(es_fields)}]", condition, limit))
+            return [(None, values) for values in rows]
+
+        rows = ae._executeJSON(self._compile("o", condition, limit))
+        return [(handle, []) for handle in rows]
+
+    # -----------------------------------------------------------------------
+    # Consumers
+    # -----------------------------------------------------------------------
+
+    def all(self) -> list:
+        """Return matching elements as wrapper handles."""
+        return [handle for handle, _ in self._run()]
+
+    def first(self):
+        """Return the first matching element or None."""
+        matches = self._run(limit=1)
+        return matches[0][0] if matches else None
+
+    def select(self, *fields: str) -> list:
+        """
+        Return matching elements as plain dicts of the given fields.
+
+        Dotted names read nested attributes: select("name", "source.name").
+        """
+        if not fields:
+            raise ValueError("select() needs at least one field name")
+        return [dict(zip(fields, values)) for _, values in self._run(fields)]
+
+    def values(self, field: str) -> list:
+        """Return a flat list with one field of each matching element."""
+        return [values[0] for _, values in self._run((field,))]
+
+    def count(self) -> int:
+        """Count matching elements."""
+        condition, residual = self._split()
+        if residual:
+            return len(self._run())
+        code = compile_loop(self._collection, "k++;", condition=condition,
+                            prelude="var k = 0;", result="k")
+        return ae.executeScript(code, "query")
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def __repr__(self) -> str:
+        return f"Query({self._collection!r}, {len(self._predicates)} predicates)"
@@ -0,0 +1,355 @@
+"""
+AEPython Python -> ExtendScript transpiler
+
+Runs small per-element computations inside ExtendScript so a whole
+collection is processed in one bridge round trip.
+
+Example:
+    import AEPython as ae
+    comp = ae.app.project.activeItem
+
+    ae.remote_map(comp.layers, lambda l: (l.name, l.inPoint * 2))
+    # -> [["Title", 0], ["BG", 4.0], ...]
+
+    ae.remote_reduce(comp.layers, lambda total, l: total + (l.outPoint - l.inPoint), 0)
+
+Supported subset (single expression lambdas, or defs whose body is one return):
+    - names: parameters, plus free variables holding JSON values or AE objects
+    - attribute access, subscripts, method calls on AE objects
+    - arithmetic, comparisons, and/or/not, conditional expressions
+    - tuple/list/dict literals, f-strings
+    - builtins: len, abs, min, max, str, int, float, bool
+
+Values follow ExtendScript semantics once on the ES side (e.g. `%` keeps the
+sign of the dividend, empty lists are truthy). Unsupported constructs raise
+ESCompileError before anything is sent to After Effects.
+"""
+
+import ast
+import inspect
+import json
+import linecache
+import math
+from collections import OrderedDict
+
+import AEPython as ae
+from es_query import compile_loop, _is_pushable
+
+
+class ESCompileError(SyntaxError):
+    """A Python construct cannot be expressed in ExtendScript."""
+    pass
+
+
+_BINARY_OPERATORS = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.Mod: "%",
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: "===",
+    ast.NotEq: "!==",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Is: "===",
+    ast.IsNot: "!==",
+}
+
+_UNARY_OPERATORS = {
+    ast.Not: "!",
+    ast.USub: "-",
+    ast.UAdd: "+",
+}
+
+# builtin name -> ExtendScript call template
+_BUILTINS = {
+    "len": lambda args: f"({args[0]}).length",
+    "abs": lambda args: f"Math.abs({args[0]})",
+    "min": lambda args: f"Math.min({', '.join(args)})",
+    "max": lambda args: f"Math.max({', '.join(args)})",
+    "str": lambda args: f"String({args[0]})",
+    "int": lambda args: f"parseInt({args[0]}, 10)",
+    "float": lambda args: f"Number({args[0]})",
+    "bool": lambda args: f"!!({args[0]})",
+}
+
+_BUILTIN_ARITY = {
+    "len": (1, 1), "abs": (1, 1), "min": (2, None), "max": (2, None),
+    "str": (1, 1), "int": (1, 1), "float": (1, 1), "bool": (1, 1),
+}
+
+# code object -> (ast.Lambda | ast.FunctionDef, filename), least recently used first
+_ast_cache = OrderedDict()
+MAX_AST_CACHE = 256
+
+
+def _find_function_node(fn):
+    """Locate the AST node that produced fn by re-parsing its source file."""
+    code = fn.__code__
+    if code in _ast_cache:
+        _ast_cache.move_to_end(code)
+        return _ast_cache[code]
+
+    filename = code.co_filename
+    source = "".join(linecache.getlines(filename, fn.__globals__))
+    if not source:
+        raise ESCompileError(f"Source of {fn.__qualname__} is not available for transpiling")
+
+    candidates = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if isinstance(node, ast.Lambda) or isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            first_line = node.lineno
+            if getattr(node, "decorator_list", None):
+                first_line = node.decorator_list[0].lineno
+            if first_line == code.co_firstlineno:
+                candidates.append(node)
+
+    # Several lambdas can share a line: compare their compiled code
+    for node in candidates:
+        if len(candidates) == 1 or _same_code(node, code, filename):
+            _ast_cache[code] = (node, filename)
+            if len(_ast_cache) > MAX_AST_CACHE:
+                _ast_cache.popitem(last=False)
+            return node, filename
+
+    raise ESCompileError(f"Could not locate the source of {fn.__qualname__}")
+
+
+def _same_code(node, code, filename) -> bool:
+    if isinstance(node, ast.Lambda):
+        module = ast.Expression(node)
+        mode = "eval"
+    else:
+        module = ast.Module([node], type_ignores=[])
+        mode = "exec"
+    try:
+        compiled = compile(ast.fix_missing_locations(module), filename, mode)
+    except SyntaxError:
+        return False
+    for const in compiled.co_consts:
+        if inspect.iscode(const):
+            return (const.co_code == code.co_code and const.co_names == code.co_names
+                    and const.co_consts == code.co_consts)
+    return False
+
+
+class _Transpiler:
+    """Translate one expression tree into ExtendScript source."""
+
+    def __init__(self, fn, filename: str, params: list):
+        self.fn = fn
+        self.filename = filename
+        self.params = {name: f"__py_{name}" for name in params}
+        # ES locals holding the middle operands of chained comparisons
+        self.temporaries = []
+
+        closure = {}
+        if fn.__closure__:
+            for name, cell in zip(fn.__code__.co_freevars, fn.__closure__):
+                try:
+                    closure[name] = cell.cell_contents
+                except ValueError:
+                    pass
+        self.closure = closure
+
+    def error(self, node, message: str):
+        text = linecache.getline(self.filename, node.lineno).rstrip("\n") or None
+        return ESCompileError(message, (self.filename, node.lineno, node.col_offset + 1, text))
+
+    def visit(self, node) -> str:
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported in ExtendScript")
+        return method(node)
+
+    # -- leaves -------------------------------------------------------------
+
+    def visit_Constant(self, node) -> str:
+        value = node.value
+        if value is None or isinstance(value, (bool, int, float, str)):
+            if isinstance(value, float) and not math.isfinite(value):
+                raise self.error(node, "Non-finite numbers are not supported in ExtendScript")
+            return ae._toESObject(value)
+        raise self.error(node, f"{type(value).__name__} constants are not supported in ExtendScript")
+
+    def visit_Name(self, node) -> str:
+        name = node.id
+        if name in self.params:
+            return self.params[name]
+        if name in _BUILTINS:
+            raise self.error(node, f"Builtin '{name}' can only be called")
+
+        if name in self.closure:
+            value = self.closure[name]
+        elif name in self.fn.__globals__:
+            value = self.fn.__globals__[name]
+        else:
+            raise self.error(node, f"Name '{name}' is not defined")
+
+        if not _is_pushable(value):
+            raise self.error(node, f"'{name}' ({type(value).__name__}) cannot be sent to ExtendScript")
+        return ae._toESObject(value)
+
+    # -- compound -----------------------------------------------------------
+
+    def visit_Attribute(self, node) -> str:
+        return f"{self.visit(node.value)}.{node.attr}"
+
+    def visit_Subscript(self, node) -> str:
+        if isinstance(node.slice, ast.Slice):
+            raise self.error(node, "Slices are not supported in ExtendScript")
+        return f"{self.visit(node.value)}[{self.visit(node.slice)}]"
+
+    def visit_Call(self, node) -> str:
+        if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            raise self.error(node, "Keyword and star arguments are not supported in ExtendScript")
+        args = [self.visit(arg) for arg in node.args]
+
+        if isinstance(node.func, ast.Name) and node.func.id not in self.params:
+            name = node.func.id
+            if name not in _BUILTINS:
+                raise self.error(node, f"Only methods of AE objects and {', '.join(_BUILTINS)} can be called")
+            low, high = _BUILTIN_ARITY[name]
+            if len(args) < low or (high is not None and len(args) > high):
+                raise self.error(node, f"Unsupported number of arguments for {name}()")
+            return _BUILTINS[name](args)
+
+        return f"{self.visit(node.func)}({', '.join(args)})"
+
+    def visit_BinOp(self, node) -> str:
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if isinstance(node.op, ast.Pow):
+            return f"Math.pow({left}, {right})"
+        if isinstance(node.op, ast.FloorDiv):
+            return f"Math.floor({left} / {right})"
+        op = _BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise self.error(node, f"Operator {type(node.op).__name__} is not supported in ExtendScript")
+        return f"({left} {op} {right})"
+
+    def visit_UnaryOp(self, node) -> str:
+        op = _UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise self.error(node, f"Operator {type(node.op).__name__} is not supported in ExtendScript")
+        return f"({op}{self.visit(node.operand)})"
+
+    def visit_BoolOp(self, node) -> str:
+        op = " && " if isinstance(node.op, ast.And) else " || "
+        return "(" + op.join(self.visit(value) for value in node.values) + ")"
+
+    def visit_Compare(self, node) -> str:
+        parts = []
+        left = self.visit(node.left)
+        last = len(node.comparators) - 1
+        for i, (op, comparator) in enumerate(zip(node.ops, node.comparators)):
+            right = self.visit(comparator)
+            if i < last and not isinstance(comparator, (ast.Name, ast.Constant)):
+                # a < f(x) < b evaluates f(x) once, like Python
+                temporary = f"__cmp{len(self.temporaries)}"
+                self.temporaries.append(temporary)
+                parts.append(self._compare(op, left, f"({temporary} = {right})"))
+                left = temporary
+            else:
+                parts.append(self._compare(op, left, right))
+                left = right
+        return parts[0] if len(parts) == 1 else "(" + " && ".join(parts) + ")"
+
+    def _compare(self, op, left: str, right: str) -> str:
+        if isinstance(op, (ast.In, ast.NotIn)):
+            test = f"__AEPython_contains({right}, {left})"
+            return test if isinstance(op, ast.In) else f"!{test}"
+        if isinstance(op, (ast.Is, ast.IsNot)) and right == "null":
+            # undefined and null both map to None
+            return f"({left} {'==' if isinstance(op, ast.Is) else '!='} null)"
+        return f"({left} {_COMPARE_OPERATORS[type(op)]} {right})"
+
+    def visit_IfExp(self, node) -> str:
+        return f"({self.visit(node.test)} ? {self.visit(node.body)} : {self.visit(node.orelse)})"
+
+    def visit_Tuple(self, node) -> str:
+        return "[" + ", ".join(self.visit(elt) for elt in node.elts) + "]"
+
+    visit_List = visit_Tuple
+
+    def visit_Dict(self, node) -> str:
+        members = []
+        for key, value in zip(node.keys, node.values):
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                raise self.error(node, "Dict keys must be string literals in ExtendScript")
+            members.append(f"{json.dumps(key.value)}: {self.visit(value)}")
+        return "{" + ", ".join(members) + "}"
+
+    def visit_JoinedStr(self, node) -> str:
+        parts = ['""']
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                if value.format_spec is not None or value.conversion != -1:
+                    raise self.error(value, "f-string format specs are not supported in ExtendScript")
+                parts.append(f"String({self.visit(value.value)})")
+            else:
+                parts.append(self.visit(value))
+        return "(" + " + ".join(parts) + ")"
+
+
+def transpile(fn, arity: int = None) -> str:
+    """
+    Return an ExtendScript function expression equivalent to fn.
+
+    Raises ESCompileError if fn uses anything outside the supported subset.
+    """
+    node, filename = _find_function_node(fn)
+    args = node.args
+
+    if args.vararg or args.kwarg or args.kwonlyargs or args.defaults or args.posonlyargs:
+        raise ESCompileError(f"{fn.__qualname__}: only plain positional parameters are supported")
+    params = [arg.arg for arg in args.args]
+    if arity is not None and len(params) != arity:
+        raise ESCompileError(f"{fn.__qualname__} must take {arity} argument(s), got {len(params)}")
+
+    if isinstance(node, ast.Lambda):
+        body = node.body
+    else:
+        statements = node.body
+        if statements and isinstance(statements[0], ast.Expr) and isinstance(statements[0].value, ast.Constant) \
+                and isinstance(statements[0].value.value, str):
+            statements = statements[1:]  # docstring
+        if len(statements) != 1 or not isinstance(statements[0], ast.Return) or statements[0].value is None:
+            raise ESCompileError(f"{fn.__qualname__}: body must be a single 'return <expression>'")
+        body = statements[0].value
+
+    transpiler = _Transpiler(fn, filename, params)
+    expression = transpiler.visit(body)
+    es_params = ", ".join(transpiler.params[name] for name in params)
+    if transpiler.temporaries:
+        return f"function ({es_params}) {{ var {', '.join(transpiler.temporaries)}; return {expression}; }}"
+    return f"function ({es_params}) {{ return {expression}; }}"
+
+
+def remote_map(collection, fn) -> list:
+    """
+    Evaluate fn(element) for every element inside ExtendScript.
+
+    collection can be a Collection, a Query or a list of AE objects.
+    Tuples in the result come back as lists.
+    """
+    code = compile_loop(collection, "r.push(f(o));", prelude=f"var f = {transpile(fn, 1)};")
+    return ae._executeJSON(code)
+
+
+def remote_reduce(collection, fn, initial=None):
+    """
+    Fold fn(accumulator, element) over the collection inside ExtendScript.
+
+    initial must be a JSON value (or AE object) and seeds the accumulator.
+    """
+    if not _is_pushable(initial):
+        raise TypeError(f"Initial value {initial!r} cannot be sent to ExtendScript")
+    prelude = f"var f = {transpile(fn, 2)}; var a = {ae._toESObject(initial)};"
+    code = compile_loop(collection, "a = f(a, o);", prelude=prelude, result="__AEPython_toJSON(a)")
+    return ae._executeJSON(code)
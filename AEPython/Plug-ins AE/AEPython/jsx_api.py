@@ -0,0 +1,242 @@
+"""
+AEPython JSX API
+
+Python side of the functions the ExternalObject gives ExtendScript
+(ExternalObject.cpp, AEPython.jsx):
+
+    Python.exec(code)        run code, returns undefined
+    Python.runFile(path)     run a script file, compiled once per version (code_cache.py)
+    Python.eval(expression)  evaluate an expression and return its value
+    Python.submit(code)      start code on a worker thread, returns a job id
+    Python.poll(id)          "running", "done", "failed" or "cancelled"
+    Python.result(id)        the job's value (or its error), once it ended
+
+An external function can only hand back a number, a boolean or a string,
+plus "a string that is evaluated as script". run_file() and evaluate()
+return such a script: the value written as an ExtendScript expression, or a
+throw statement when Python raised, so JSX callers get typed values and
+catchable errors:
+
+Example (JSX panel):
+    var stats = Python.eval("analysis.summarize(r'" + file.fsName + "')");
+    alert(stats.count + " keys, mean " + stats.mean);     // a real JS object
+    try {
+        Python.runFile(scriptPath);
+    } catch (e) {
+        alert(e.pythonType + ": " + e.message);
+    }
+
+Jobs are for work that does not touch After Effects (scanning folders,
+hashing, network, parsing) and would otherwise block AE. A job's value is
+that of its last expression statement. Jobs run on the ae.parallel thread
+pool, where AE cannot be accessed. The plugin only holds the GIL while
+Python is called (PythonInstance.cpp), so jobs keep running while AE is
+busy in native code between polls. Finished jobs are kept until their
+result is read, up to MAX_FINISHED_JOBS.
+
+Example (JSX panel, see Python.onResult in AEPython.jsx):
+    var id = Python.submit("import scanner\nscanner.find_footage(r'D:/Shots')");
+    Python.onResult(id, function (files, error) {
+        if (error) { alert(error.message); } else { list.removeAll(); ... }
+    });
+
+Conversions (to_extendscript):
+    None -> null, bool -> boolean, int / float -> number (nan/inf included),
+    str -> string, list / tuple / set -> Array, dict -> Object (keys as
+    strings), datetime -> Date, AEPython objects -> the ExtendScript object
+    they wrap. Anything else raises TypeError.
+
+Tracebacks are printed to the console's stderr like Python.exec errors.
+"""
+
+import ast
+import functools
+import itertools
+import json
+import math
+import sys
+import threading
+import traceback
+from datetime import date, datetime, timezone
+
+import AEPython as ae
+import ae_parallel
+import code_cache
+
+# Ended jobs whose result was never read are dropped beyond this count
+MAX_FINISHED_JOBS = 256
+
+# Wrappers handed to ExtendScript by the previous call; kept alive until the
+# script referencing them has been evaluated
+_returned = []
+
+
+def _quote(text: str) -> str:
+    # JSON string syntax, ASCII only, is valid ExtendScript; U+2028/9 too
+    return json.dumps(text).replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return repr(value)
+
+
+def to_extendscript(value, _depth: int = 0) -> str:
+    """Write value as an ExtendScript expression."""
+    if _depth > 100:
+        raise ValueError("Value nested too deeply (circular reference?)")
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value) if abs(value) < 2 ** 53 else _number(float(value))
+    if isinstance(value, float):
+        return _number(value)
+    if isinstance(value, str):
+        return _quote(value)
+    if isinstance(value, ae.ESWrapper):
+        _returned.append(value)
+        return repr(value)
+    if isinstance(value, dict):
+        members = (f"{_quote(str(key))}:{to_extendscript(item, _depth + 1)}" for key, item in value.items())
+        return "({" + ",".join(members) + "})"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return "[" + ",".join(to_extendscript(item, _depth + 1) for item in value) + "]"
+    if isinstance(value, datetime):
+        moment = value if value.tzinfo is not None else value.astimezone()
+        return f"new Date({_number(moment.astimezone(timezone.utc).timestamp() * 1000)})"
+    if isinstance(value, date):
+        return f"new Date({value.year}, {value.month - 1}, {value.day})"
+    if hasattr(value, "tolist"):
+        # numpy arrays and scalars
+        return to_extendscript(value.tolist(), _depth + 1)
+    if hasattr(value, "__index__"):
+        return to_extendscript(value.__index__(), _depth)
+    if hasattr(value, "__float__"):
+        return _number(float(value))
+    if hasattr(value, "__fspath__"):
+        return _quote(value.__fspath__())
+    raise TypeError(f"{type(value).__name__} values cannot be returned to ExtendScript")
+
+
+def throw_script(error: BaseException) -> str:
+    """A script throwing error as a JS Error (message, pythonType, pythonTraceback)."""
+    message = str(error) or type(error).__name__
+    trace = "".join(traceback.format_exception(error))
+    return (
+        f"(function () {{ var e = new Error({_quote(message)}); "
+        f"e.pythonType = {_quote(type(error).__name__)}; "
+        f"e.pythonTraceback = {_quote(trace)}; throw e; }})()"
+    )
+
+
+def _call(fn, *args) -> str:
+    del _returned[:]
+    try:
+        return fn(*args)
+    except BaseException as e:
+        traceback.print_exception(e, file=sys.stderr)
+        return throw_script(e)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    # Panels tend to evaluate the same few expressions over and over
+    return compile(expression, "<Python.eval>", "eval")
+
+
+def run_file(path: str, globals: dict, locals: dict = None) -> str:
+    """Python.runFile(path): run the file in the JSX namespace; returns a script."""
+    def run():
+        code_cache.exec_file(path, globals, locals)
+        return "undefined"
+    return _call(run)
+
+
+def evaluate(expression: str, globals: dict, locals: dict = None) -> str:
+    """Python.eval(expression): returns a script evaluating to its value."""
+    def run():
+        return to_extendscript(eval(_compile_expression(expression), globals, locals))
+    return _call(run)
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+_job_ids = itertools.count(1)
+_jobs_lock = threading.Lock()
+# id -> Future, in submission order
+_jobs = {}
+
+
+def _compile_job(code: str) -> tuple:
+    """(statements, last expression or None) compiled from a job's source."""
+    tree = ast.parse(code, "<Python.submit>")
+    last = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last = compile(ast.Expression(tree.body.pop().value), "<Python.submit>", "eval")
+    return compile(tree, "<Python.submit>", "exec"), last
+
+
+def _run_job(statements, last):
+    namespace = {"__name__": "__job__", "__builtins__": __builtins__}
+    exec(statements, namespace)
+    return eval(last, namespace) if last is not None else None
+
+
+def _forget_finished():
+    finished = [job_id for job_id, future in _jobs.items() if future.done()]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+
+def _job(job_id: int):
+    with _jobs_lock:
+        future = _jobs.get(int(job_id))
+    if future is None:
+        raise LookupError(f"No Python job {int(job_id)} (unknown, or its result was already read)")
+    return future
+
+
+def job_state(job_id: int) -> str:
+    future = _job(job_id)
+    if future.cancelled():
+        return "cancelled"
+    if not future.done():
+        return "running"
+    return "failed" if future.exception() is not None else "done"
+
+
+def submit(code: str) -> str:
+    """Python.submit(code): returns a script evaluating to the job id."""
+    def start():
+        compiled = _compile_job(code)
+        job_id = next(_job_ids)
+        future = ae_parallel.thread_pool().submit(_run_job, *compiled)
+        with _jobs_lock:
+            _jobs[job_id] = future
+            _forget_finished()
+        return str(job_id)
+    return _call(start)
+
+
+def poll(job_id: int) -> str:
+    """Python.poll(id): returns a script evaluating to the job's state."""
+    return _call(lambda: _quote(job_state(job_id)))
+
+
+def result(job_id: int) -> str:
+    """Python.result(id): the job's value, or its error thrown; the job is then forgotten."""
+    def take():
+        future = _job(job_id)
+        if not future.done():
+            raise RuntimeError(f"Python job {int(job_id)} is still running")
+        with _jobs_lock:
+            _jobs.pop(int(job_id), None)
+        return to_extendscript(future.result())
+    return _call(take)
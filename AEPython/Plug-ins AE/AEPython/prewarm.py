@@ -0,0 +1,248 @@
+"""
+AEPython idle-time import prewarming
+
+Libraries like qfluentwidgets take seconds to import the first time a Script
+Library tool uses them. The prewarmer imports them in the background instead:
+once After Effects has finished launching, a QTimer chain imports a few
+modules per tick, stopping each tick after SLICE_BUDGET seconds, so AE stays
+responsive while the import cache fills up.
+
+What to import is learned. While a Script Library script runs, the library
+modules it loads for the first time (stdlib and site-packages, never the
+user's own modules) are recorded, in the order their imports completed, to
+Documents/AEPython/prewarm.json. Dependencies complete first, so the next
+session imports them one small module at a time before the package that
+needs them. Modules no script has used for FORGET_AFTER sessions are dropped.
+
+Example (prewarm.json, "always" is edited by hand):
+    {
+      "always": ["PySide6.QtSvg"],
+      "session": 12,
+      "modules": [{"name": "darkdetect", "self_us": 900, "last_session": 12}, ...]
+    }
+
+Example (what script_library does around a run):
+    imports = prewarm.ImportRecorder()
+    window.run_code(...)            # the script imports qfluentwidgets
+    imports.stop()                  # remembered for the next launch
+
+A package's own __init__ is imported in one step, so a tick can take longer
+than SLICE_BUDGET when a single module is slow to execute.
+"""
+
+import functools
+import importlib
+import json
+import sys
+import sysconfig
+import time
+from pathlib import Path
+
+from startup_profile import ImportTimer
+
+HISTORY_FILE = Path.home() / "Documents" / "AEPython" / "prewarm.json"
+
+# Seconds after launch before the first import
+START_DELAY_MS = 3000
+
+# Milliseconds between ticks, and seconds of importing per tick
+TICK_INTERVAL_MS = 25
+SLICE_BUDGET = 0.004
+
+# Sessions a learned module is kept without being imported by a script
+FORGET_AFTER = 20
+
+MAX_MODULES = 2000
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+def load_history(path: Path = HISTORY_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        history = {}
+    if not isinstance(history, dict):
+        history = {}
+    history.setdefault("always", [])
+    history.setdefault("session", 0)
+    history.setdefault("modules", [])
+    return history
+
+
+def save_history(history: dict, path: Path = HISTORY_FILE):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+    except OSError as e:
+        print(f"Failed to save the prewarm list: {e}", file=sys.stderr)
+
+
+@functools.cache
+def _library_roots() -> tuple:
+    paths = sysconfig.get_paths()
+    roots = [Path(paths[key]) for key in ("stdlib", "platstdlib") if key in paths]
+    # Extension modules of a Windows install
+    roots.append(Path(sys.base_prefix) / "DLLs")
+    return tuple(str(root.resolve()) for root in roots)
+
+
+def is_library_module(name: str) -> bool:
+    """Whether name is a stdlib or installed-package module (safe to import unasked)."""
+    module = sys.modules.get(name)
+    if module is None or name == "__main__":
+        return False
+    file = getattr(module, "__file__", None)
+    if file is None:
+        # Built-in and namespace packages
+        return getattr(module, "__spec__", None) is not None
+    path = Path(file).resolve()
+    if "site-packages" in path.parts or "dist-packages" in path.parts:
+        return True
+    return str(path).startswith(_library_roots())
+
+
+def learn(history: dict, records: list) -> bool:
+    """Merge ImportTimer records into history; True if it changed."""
+    session = history["session"]
+    known = {entry["name"]: entry for entry in history["modules"]}
+    changed = False
+    for record in records:
+        name = record["module"]
+        if not is_library_module(name):
+            continue
+        entry = known.get(name)
+        if entry is None:
+            entry = known[name] = {"name": name, "self_us": record["self_us"], "last_session": session}
+            history["modules"].append(entry)
+            changed = True
+        elif entry["last_session"] != session:
+            entry["last_session"] = session
+            changed = True
+    del history["modules"][:-MAX_MODULES]
+    return changed
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+# One import hook shared by the recorders of overlapping script runs
+_timer = None
+_recorders = []
+
+
+class ImportRecorder:
+    """Records the modules imported from now until stop() into the history."""
+
+    def __init__(self, path: Path = HISTORY_FILE):
+        global _timer
+        self.path = path
+        if _timer is None:
+            _timer = ImportTimer()
+            _timer.install()
+        self._first = len(_timer.records)
+        _recorders.append(self)
+
+    def stop(self):
+        global _timer
+        if self not in _recorders:
+            return
+        records = _timer.records[self._first:]
+        _recorders.remove(self)
+        if not _recorders:
+            _timer.uninstall()
+            _timer = None
+        if records:
+            history = load_history(self.path)
+            if learn(history, records):
+                save_history(history, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Prewarming
+# ---------------------------------------------------------------------------
+
+class Prewarmer:
+    """Imports modules from a QTimer, SLICE_BUDGET seconds per tick."""
+
+    def __init__(self, modules: list, budget: float = SLICE_BUDGET, on_failed=None):
+        from PySide6 import QtCore
+
+        self.pending = list(modules)
+        self.budget = budget
+        self.on_failed = on_failed
+        self.imported = []
+        self.failed = []
+        self.elapsed = 0.0
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(TICK_INTERVAL_MS)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self, delay_ms: int = 0):
+        from PySide6 import QtCore
+
+        QtCore.QTimer.singleShot(delay_ms, self.timer.start)
+
+    def stop(self):
+        self.timer.stop()
+        self.pending = []
+
+    def _busy(self) -> bool:
+        from PySide6 import QtWidgets
+
+        # Leave drags, menus and dialogs alone
+        return bool(QtWidgets.QApplication.mouseButtons()) or QtWidgets.QApplication.activePopupWidget() is not None \
+            or QtWidgets.QApplication.activeModalWidget() is not None
+
+    def _tick(self):
+        if self._busy():
+            return
+        start = time.perf_counter()
+        while self.pending:
+            name = self.pending.pop(0)
+            if name in sys.modules:
+                continue
+            try:
+                importlib.import_module(name)
+                self.imported.append(name)
+            except Exception:
+                self.failed.append(name)
+            if time.perf_counter() - start >= self.budget:
+                break
+        self.elapsed += time.perf_counter() - start
+        if not self.pending:
+            self.timer.stop()
+            if self.failed and self.on_failed is not None:
+                self.on_failed(self.failed)
+
+
+_prewarmer = None
+
+
+def start(path: Path = HISTORY_FILE, delay_ms: int = START_DELAY_MS) -> Prewarmer:
+    """Start a new session's prewarming (once per launch)."""
+    global _prewarmer
+    if _prewarmer is not None:
+        return _prewarmer
+    history = load_history(path)
+    history["session"] += 1
+    session = history["session"]
+    history["modules"] = [entry for entry in history["modules"] if session - entry["last_session"] <= FORGET_AFTER]
+    save_history(history, path)
+
+    def forget(names: list):
+        # Uninstalled or broken since it was learned
+        current = load_history(path)
+        current["modules"] = [entry for entry in current["modules"] if entry["name"] not in names]
+        save_history(current, path)
+
+    modules = list(history["always"]) + [entry["name"] for entry in history["modules"]]
+    _prewarmer = Prewarmer(modules, on_failed=forget)
+    if modules:
+        _prewarmer.start(delay_ms)
+    return _prewarmer
@@ -1,13 +1,23 @@
+import time
+_import_start = time.perf_counter()
+
 import sys
 import os
 import json
+import linecache
 from pathlib import Path
-from PySide6 import QtGui, QtWidgets, QtCore
+
+import startup_profile
+
+with startup_profile.phase("import PySide6"):
+    from PySide6 import QtGui, QtWidgets, QtCore
 
 import _AEPython as _ae
 import AEPython as ae
 
+import bridge_executor
 import code_editor
+import prewarm
 from highlighter.pyHighlight import PythonHighlighter as PyHighlighter
 
 __MainWindow = None
@@ -577,21 +587,25 @@ class DotSplitter(QtWidgets.QSplitter):
         return DotSplitterHandle(self.orientation(), self)
 
 
+# app.executeCommand id of Edit > Undo
+UNDO_COMMAND = 16
+
+# Console runs whose source stays in linecache (tracebacks, ae.remote_map)
+MAX_CONSOLE_SOURCES = 200
+
+
 class PythonWindow(QtWidgets.QMainWindow):
     STATE_FILE = Path.home() / "Documents" / "AEPython" / ".aepython_state.json"
     
     class Logger:
-        def __init__(self, editor: QtWidgets.QTextEdit, color=None, show=None):
+        def __init__(self, editor: "console_output.OutputView", color=None, show=None):
             self.editor = editor
             self.color = editor.textColor() if color is None else color
             self.show = show
         
         def write(self, message: str):
-            self.editor.moveCursor(QtGui.QTextCursor.MoveOperation.End)
-            self.editor.setTextColor(self.color)
-            self.editor.insertPlainText(message)
-            if self.show is not None:
-                self.show()
+            # Buffered; the view renders (and calls show) at most ~30 times a second
+            self.editor.write(message, self.color, self.show)
         
         def flush(self):
             pass
@@ -604,6 +618,13 @@ class PythonWindow(QtWidgets.QMainWindow):
             'ae': ae,  # AEPython access
             '_ae': _ae  # Internal AEPython
         }
+        self._console_runs = 0
+        self._runner = None
+        self._auto_yield = None
+        self._task_callbacks = {}
+        # Interrupts runaway scripts (Esc, time limit); see script_watchdog.py
+        import script_watchdog
+        self._watchdog = script_watchdog.Watchdog()
         
         self.user_docs_dir = Path.home() / "Documents"
     
@@ -632,7 +653,8 @@ class PythonWindow(QtWidgets.QMainWindow):
         # Current theme
         self.current_theme_key = "vscode_dark"
         themes_dir = Path.home() / "Documents" / "AEPython" / "themes" 
-        self.themes = Themes(str(themes_dir))  # Now self.themes is a dict-accessible 
+        with startup_profile.phase("console window: themes"):
+            self.themes = Themes(str(themes_dir))  # Now self.themes is a dict-accessible 
         
         # Central widget with margins
         self.centralWidget = QtWidgets.QWidget()
@@ -656,8 +678,8 @@ class PythonWindow(QtWidgets.QMainWindow):
         label_output = QtWidgets.QLabel("OUTPUT")
         output_layout.addWidget(label_output)
         
-        self.textedit_output = QtWidgets.QTextEdit()
-        self.textedit_output.setReadOnly(True)
+        import console_output
+        self.textedit_output = console_output.OutputView()
         self.textedit_output.setMinimumHeight(150)
         output_layout.addWidget(self.textedit_output)
         
@@ -706,6 +728,18 @@ class PythonWindow(QtWidgets.QMainWindow):
         
         button_layout.addStretch()
         
+        # Progress of the running script, hidden while idle
+        self.label_run_status = QtWidgets.QLabel()
+        self.progress_run = QtWidgets.QProgressBar()
+        self.progress_run.setMaximumWidth(160)
+        self.progress_run.setTextVisible(False)
+        self.button_cancel = QtWidgets.QPushButton("■ Stop")
+        self.button_cancel.setToolTip("Stop the running script (or hold Esc)")
+        self.button_cancel.clicked.connect(self._cancel_run)
+        for widget in (self.label_run_status, self.progress_run, self.button_cancel):
+            widget.hide()
+            button_layout.addWidget(widget)
+        
         self.button_execute = QtWidgets.QPushButton("▶ Execute Code")
         self.button_execute.setObjectName("executeButton")  # For #executeButton selector
         self.button_execute.clicked.connect(self._execute)
@@ -723,10 +757,12 @@ class PythonWindow(QtWidgets.QMainWindow):
         self._setup_loggers()
         
         # Restore previous session (includes theme)
-        self._restore_state()
+        with startup_profile.phase("console window: restore state"):
+            self._restore_state()
         
         # Apply theme
-        self._apply_theme(self.current_theme_key)
+        with startup_profile.phase("console window: apply theme"):
+            self._apply_theme(self.current_theme_key)
         
         # Welcome message
         self._print_welcome()
@@ -852,6 +888,47 @@ class PythonWindow(QtWidgets.QMainWindow):
         clear_action.triggered.connect(self._clear_output)
         
         edit_menu.addAction(clear_action)
+        edit_menu.addSeparator()
+
+        # Warn about loops that cross the bridge once per element
+        self.n_plus_one_action = QtGui.QAction("Warn on N+1 Bridge Access", self)
+        self.n_plus_one_action.setCheckable(True)
+        edit_menu.addAction(self.n_plus_one_action)
+
+        # Tee bridge traffic to Documents/AEPython/bridge_logs for offline replay
+        self.record_action = QtGui.QAction("Record Bridge Traffic", self)
+        self.record_action.setCheckable(True)
+        self.record_action.toggled.connect(self._toggle_recording)
+        edit_menu.addAction(self.record_action)
+        self._recorder = None
+
+        # Let external Python processes drive this session (see transport.py)
+        self.serve_action = QtGui.QAction("Allow Remote Connections", self)
+        self.serve_action.setCheckable(True)
+        self.serve_action.toggled.connect(self._toggle_serving)
+        edit_menu.addAction(self.serve_action)
+        edit_menu.addSeparator()
+
+        # Stop scripts that keep AE from updating for too long
+        time_limit_action = QtGui.QAction("Script Time Limit...", self)
+        time_limit_action.triggered.connect(self._set_time_limit)
+        edit_menu.addAction(time_limit_action)
+
+        # Older output goes to Documents/AEPython/logs
+        output_limit_action = QtGui.QAction("Output Line Limit...", self)
+        output_limit_action.triggered.connect(self._set_output_limit)
+        edit_menu.addAction(output_limit_action)
+
+        # Undo what a stopped script changed (one undo group per run)
+        self.rollback_action = QtGui.QAction("Undo Changes of Stopped Scripts", self)
+        self.rollback_action.setCheckable(True)
+        self.rollback_action.setChecked(True)
+        edit_menu.addAction(self.rollback_action)
+
+        # Write Documents/AEPython/startup_profile.json at the next launches
+        self.profile_action = QtGui.QAction("Profile Startup", self)
+        self.profile_action.setCheckable(True)
+        edit_menu.addAction(self.profile_action)
         
         # View menu (Themes)
         view_menu = self.menuBar().addMenu("View")
@@ -1141,7 +1218,11 @@ class PythonWindow(QtWidgets.QMainWindow):
         state = {
             "tabs": [],
             "current_index": self.tab_widget.currentIndex(),
-            "theme": self.current_theme_key
+            "theme": self.current_theme_key,
+            "script_time_limit": self._watchdog.budget or 0,
+            "output_max_lines": self.textedit_output.max_lines,
+            "undo_stopped_scripts": self.rollback_action.isChecked(),
+            startup_profile.STATE_KEY: self.profile_action.isChecked()
         }
         
         for i in range(self.tab_widget.count()):
@@ -1160,6 +1241,8 @@ class PythonWindow(QtWidgets.QMainWindow):
     
     def _restore_state(self):
         """Restore previous session tabs"""
+        import console_output
+        
         if not self.STATE_FILE.exists():
             return
         
@@ -1170,6 +1253,11 @@ class PythonWindow(QtWidgets.QMainWindow):
             # Restore theme
             self.current_theme_key = state.get("theme", "vscode_dark")
             
+            self._watchdog.budget = state.get("script_time_limit") or None
+            self.textedit_output.set_max_lines(state.get("output_max_lines", console_output.DEFAULT_MAX_LINES))
+            self.rollback_action.setChecked(state.get("undo_stopped_scripts", True))
+            self.profile_action.setChecked(bool(state.get(startup_profile.STATE_KEY)))
+            
             # Remove initial empty tab if we're restoring tabs
             if state.get("tabs") and self.tab_widget.count() == 1:
                 editor = self.tab_widget.widget(0)
@@ -1221,6 +1309,24 @@ class PythonWindow(QtWidgets.QMainWindow):
             self.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
         self.textedit_output.append("")
     
+    def _toggle_recording(self, checked: bool):
+        if checked and self._recorder is None:
+            self._recorder = ae.record().start()
+            print(f"Recording bridge traffic to {self._recorder.path}")
+        elif not checked and self._recorder is not None:
+            recorder, self._recorder = self._recorder, None
+            recorder.stop()
+            print(f"Recorded {recorder.count} round trips to {recorder.path}")
+
+    def _toggle_serving(self, checked: bool):
+        import transport
+        if checked:
+            server = transport.serve()
+            print(f"Accepting remote connections on {server.url} (details in {transport.REMOTE_FILE})")
+        else:
+            transport.stop_serving()
+            print("Remote connections stopped")
+
     def _clear_output(self):
         self.textedit_output.clear()
         self._print_welcome()
@@ -1276,18 +1382,177 @@ class PythonWindow(QtWidgets.QMainWindow):
             elif '__file__' in self._exec_namespace:
                 del self._exec_namespace['__file__']
             
-            exec(code, self._exec_namespace)
+            # Register the source under a unique name so tracebacks and
+            # ae.remote_map() can see console code
+            self._console_runs += 1
+            filename = f"<console-{self._console_runs}>"
+            linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+            linecache.cache.pop(f"<console-{self._console_runs - MAX_CONSOLE_SOURCES}>", None)
+            
+            self.run_code(code, filename, self._exec_namespace, "Console")
             
-        except Exception as e:
-            import traceback
-            self.textedit_output.setTextColor(QtGui.QColor(colors["error_text"]))
-            self.textedit_output.append("\nError:")
-            traceback.print_exc()
-            self.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
         finally:
             # Don't restore old stdout/stderr - keep using our loggers
             pass
     
+    @property
+    def is_running(self) -> bool:
+        return self._auto_yield is not None or bool(self._runner and self._runner.tasks)
+    
+    def run_code(self, code: str, filename: str, namespace: dict, label: str, on_finished=None):
+        """
+        Run console or Script Library code cooperatively (see cooperative.py).
+        
+        Generator scripts are advanced from a timer with a progress readout;
+        plain scripts run to completion while their bridge calls keep the UI
+        pumping. on_finished(error) gets None, the exception, or
+        ScriptCancelled once the script has ended.
+        """
+        if self.is_running:
+            error = RuntimeError("A script is already running: wait for it or cancel it first")
+            print(error, file=sys.stderr)
+            if on_finished is not None:
+                on_finished(error)
+            return
+        import code_cache
+        import cooperative
+        try:
+            # Script files are compiled once per content (see code_cache.py)
+            compiled, is_generator = code_cache.compile_script(code, filename)
+            if is_generator:
+                generator = cooperative.start_script(compiled, namespace)
+        except Exception as e:
+            self._report_run_error(e)
+            if on_finished is not None:
+                on_finished(e)
+            return
+        
+        if is_generator:
+            if self._runner is None:
+                self._runner = cooperative.CooperativeRunner(self._on_task_progress, self._on_task_finished,
+                                                             guard=self._watchdog)
+            task = self._runner.start(generator, label)
+            self._task_callbacks[task] = on_finished
+            self._show_run_status(label)
+            return
+        
+        error = None
+        hook = None
+        self._show_run_status(label)
+        undo_group = self._begin_undo_group(label)
+        try:
+            with self._watchdog.armed(), cooperative.auto_yield(pump=self._pump) as hook:
+                self._auto_yield = hook
+                if self.n_plus_one_action.isChecked():
+                    with ae.detect_n_plus_one():
+                        exec(compiled, namespace)
+                else:
+                    exec(compiled, namespace)
+        except KeyboardInterrupt as e:
+            error = e
+        except Exception as e:
+            error = e
+            self._report_run_error(e)
+        finally:
+            self._auto_yield = None
+            self._hide_run_status()
+        if undo_group:
+            self._end_undo_group(rollback=isinstance(error, KeyboardInterrupt) and hook is not None and hook.mutated)
+        if isinstance(error, KeyboardInterrupt):
+            print(f"\n{label}: {self._watchdog.reason or 'Stopped'}", file=sys.stderr)
+        if on_finished is not None:
+            on_finished(error)
+    
+    def _pump(self):
+        """Let AE update from inside a plain script's bridge call."""
+        QtCore.QCoreApplication.processEvents()
+        self._watchdog.beat()
+    
+    def _begin_undo_group(self, label: str) -> bool:
+        try:
+            ae.app.beginUndoGroup(f"AEPython: {label}")
+        except Exception:
+            return False
+        return True
+    
+    def _end_undo_group(self, rollback: bool):
+        try:
+            ae.app.endUndoGroup()
+            # rollback only after a write AE recorded (cooperative.is_write):
+            # an empty group is dropped, and Undo would revert the user's
+            # previous edit instead
+            if rollback and self.rollback_action.isChecked():
+                ae.app.executeCommand(UNDO_COMMAND)
+                print("Changes made by the stopped script were undone", file=sys.stderr)
+        except Exception as e:
+            print(f"Could not close the undo group: {e}", file=sys.stderr)
+    
+    def _set_output_limit(self):
+        lines, ok = QtWidgets.QInputDialog.getInt(
+            self, "Output Line Limit",
+            "Lines kept in the output (older lines are saved to a log file):",
+            self.textedit_output.max_lines, 100, 1_000_000,
+        )
+        if ok:
+            self.textedit_output.set_max_lines(lines)
+    
+    def _set_time_limit(self):
+        seconds, ok = QtWidgets.QInputDialog.getInt(
+            self, "Script Time Limit",
+            "Stop scripts that keep After Effects from updating for (seconds, 0 = no limit):",
+            int(self._watchdog.budget or 0), 0, 24 * 3600,
+        )
+        if ok:
+            self._watchdog.budget = seconds or None
+    
+    def _report_run_error(self, error: BaseException):
+        import traceback
+        colors = self.themes.get_highlighter_colors(self.current_theme_key)
+        self.textedit_output.setTextColor(QtGui.QColor(colors["error_text"]))
+        self.textedit_output.append("\nError:")
+        traceback.print_exception(error)
+        self.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
+    
+    def _show_run_status(self, label: str):
+        self.label_run_status.setText(f"Running {label}...")
+        self.progress_run.setRange(0, 0)  # busy until a script reports progress
+        for widget in (self.label_run_status, self.progress_run, self.button_cancel):
+            widget.show()
+        self.button_execute.setEnabled(False)
+    
+    def _hide_run_status(self):
+        for widget in (self.label_run_status, self.progress_run, self.button_cancel):
+            widget.hide()
+        self.button_execute.setEnabled(True)
+    
+    def _on_task_progress(self, task):
+        text = f"{task.name}: {task.message}" if task.message else f"Running {task.name}..."
+        self.label_run_status.setText(text)
+        if task.progress is not None:
+            self.progress_run.setRange(0, 1000)
+            self.progress_run.setValue(int(task.progress * 1000))
+    
+    def _on_task_finished(self, task):
+        if task.state == "failed":
+            self._report_run_error(task.error)
+        elif task.state == "cancelled":
+            reason = str(task.error) or self._watchdog.reason
+            print(f"\n{task.name}: {reason or 'Stopped'} after {task.elapsed:.1f} s of script time", file=sys.stderr)
+        if not self.is_running:
+            self._hide_run_status()
+        on_finished = self._task_callbacks.pop(task, None)
+        if on_finished is not None:
+            on_finished(task.error if task.state != "finished" else None)
+    
+    def _cancel_run(self):
+        if self._auto_yield is not None:
+            self._auto_yield.cancel()
+            # A pure-Python loop makes no further bridge call: interrupt it
+            # directly (resent if it lands in this handler)
+            self._watchdog.interrupt(reason="Stopped")
+        if self._runner is not None:
+            self._runner.cancel()
+    
     def _execute_file(self):
         file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self,
@@ -1305,38 +1570,29 @@ class PythonWindow(QtWidgets.QMainWindow):
         self.textedit_output.append(f"\n>>> Executing: {file_path}")
         self.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
         
-        dont_write_bytecode = sys.dont_write_bytecode
         module_dir = os.path.dirname(file_path)
         sys.path.insert(0, module_dir)
         
+        def cleanup(error):
+            if module_dir in sys.path:
+                sys.path.remove(module_dir)
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 code = f.read()
-        
-            # Fresh namespace for file execution
-            exec_namespace = {
-                '__file__': file_path,
-                '__name__': '__main__',
-                '__builtins__': __builtins__,
-            }
-            
-            exec(compile(code, file_path, 'exec'), exec_namespace)
-            
-            '''
-            # OLD METHOD
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(file_path, file_path)
-            module = importlib.util.module_from_spec(spec)
-            sys.dont_write_bytecode = True
-            spec.loader.exec_module(module)
-            '''
-        except:
+        except OSError:
             import traceback
             traceback.print_exc()
-        finally:
-            sys.dont_write_bytecode = dont_write_bytecode
-            if module_dir in sys.path:
-                sys.path.remove(module_dir)
+            cleanup(None)
+            return
+        
+        # Fresh namespace for file execution
+        exec_namespace = {
+            '__file__': file_path,
+            '__name__': '__main__',
+            '__builtins__': __builtins__,
+        }
+        self.run_code(code, file_path, exec_namespace, os.path.basename(file_path), cleanup)
 
 
 def GetQtAEMainWindow():
@@ -1348,10 +1604,23 @@ def GetQtAEMainWindow():
     return __MainWindow
 
 
+def GetPythonWindow():
+    """The console window, built on first use (not at AE startup)."""
+    global __PythonWindow
+    if __PythonWindow is None:
+        start = time.perf_counter()
+        with startup_profile.phase("console window"):
+            __PythonWindow = PythonWindow(GetQtAEMainWindow())
+        _startup_times["window_build"] = time.perf_counter() - start
+        _EarlyOutput.replay()
+    return __PythonWindow
+
+
 def ShowPythonWindow():
-    __PythonWindow.show()
-    __PythonWindow.raise_()
-    __PythonWindow.activateWindow()
+    window = GetPythonWindow()
+    window.show()
+    window.raise_()
+    window.activateWindow()
 
 
 # ADD THESE TWO FUNCTIONS:
@@ -1370,9 +1639,67 @@ def IsPythonWindowVisible():
         return False
     return __PythonWindow.isVisible()
 
-__init_qt()
-__PythonWindow = PythonWindow(GetQtAEMainWindow())
+
+def startup_times() -> dict:
+    """
+    Seconds spent at AE launch importing qtae ("import") and building the
+    console window ("window_build", None until the console is first opened).
+    """
+    return dict(_startup_times)
+
+
+class _EarlyOutput:
+    """
+    stdout/stderr until the console window exists. Keeps the last writes
+    for the window to show, and opens the console on the first error
+    output, as the window's own stderr logger does.
+    """
+    
+    MAX_WRITES = 2000
+    
+    # (is_error, message), shared by both streams to keep their order
+    writes = []
+    show_scheduled = False
+    
+    def __init__(self, is_error: bool):
+        self.is_error = is_error
+    
+    def write(self, message: str):
+        writes = _EarlyOutput.writes
+        writes.append((self.is_error, message))
+        if len(writes) > self.MAX_WRITES:
+            del writes[:len(writes) - self.MAX_WRITES]
+        if self.is_error and not _EarlyOutput.show_scheduled:
+            _EarlyOutput.show_scheduled = True
+            QtCore.QTimer.singleShot(0, ShowPythonWindow)
+    
+    def flush(self):
+        pass
+    
+    @classmethod
+    def replay(cls):
+        writes, cls.writes = cls.writes, []
+        for is_error, message in writes:
+            (sys.stderr if is_error else sys.stdout).write(message)
+
+
+with startup_profile.phase("QApplication"):
+    __init_qt()
+# Worker threads reach AE through the main thread from here on
+bridge_executor.install()
+
+# The console window is built by the first Show/TogglePythonWindow()
+sys.stdout = _EarlyOutput(False)
+sys.stderr = _EarlyOutput(True)
+
+_startup_times = {"import": time.perf_counter() - _import_start, "window_build": None}
+
+# Import what Script Library scripts used in earlier sessions, once AE is idle
+prewarm.start()
 
 
-# ✅ Expose publicly for other modules
-PythonWindowInstance = __PythonWindow
\ No newline at end of file
+def __getattr__(name):
+    # PythonWindowInstance used to be built at import; build it on first access
+    if name == "PythonWindowInstance":
+        return GetPythonWindow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
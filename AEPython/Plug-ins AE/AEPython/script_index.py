@@ -0,0 +1,181 @@
+"""
+AEPython Script Library index
+
+Which scripts exist under the Script Library folder, kept up to date without
+walking the whole tree each time. The index stores, per directory, its
+mtime, whether it is a package (has __init__.py; its modules are not
+scripts), its subdirectories and its .py files with their mtime and size.
+
+A directory whose mtime did not change has the same entries as before, so
+refresh() costs one stat per directory instead of a listing and a stat per
+file; only directories that gained, lost or renamed entries are listed
+again. refresh(dirs) re-lists just the given directories (what a
+QFileSystemWatcher reported) and their subtrees. The index is saved to a
+JSON file, so the first refresh of a session is incremental too.
+
+Example:
+    index = ScriptIndex(Path.home() / "Documents/AEPython/Scripts", cache_path)
+    if index.refresh():
+        for script_id, (path, mtime_ns, size) in index.scripts().items():
+            ...
+        index.save()
+
+Editing a script does not change its directory's mtime: the file's mtime
+and size in the index are those seen when its directory was last listed.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Bumped when the saved layout changes
+FORMAT_VERSION = 1
+
+
+class ScriptIndex:
+    """Directory-level incremental index of the .py files under root."""
+
+    def __init__(self, root: Path, cache_path: Path = None):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        # relative dir ("" for root, "/"-separated) ->
+        #   {"mtime_ns": int, "package": bool, "subdirs": [names], "files": {name: [mtime_ns, size]}}
+        self.dirs = {}
+        self.listed = 0
+        self._dirty = False
+        self.load()
+
+    # -- persistence ---------------------------------------------------------
+
+    def load(self):
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == FORMAT_VERSION and data.get("root") == str(self.root):
+            self.dirs = data.get("dirs", {})
+
+    def save(self):
+        """Write the index if it changed since it was loaded or saved."""
+        if self.cache_path is None or not self._dirty:
+            return
+        data = {"version": FORMAT_VERSION, "root": str(self.root), "dirs": self.dirs}
+        partial = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(partial, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(partial, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Failed to save the script index: {e}", file=sys.stderr)
+
+    # -- scanning ------------------------------------------------------------
+
+    def _relative(self, path) -> str:
+        rel = Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+        return "" if rel == "." else rel
+
+    def _path(self, rel: str) -> Path:
+        return self.root / rel if rel else self.root
+
+    def _list(self, rel: str, mtime_ns: int) -> dict:
+        self.listed += 1
+        files, subdirs = {}, []
+        with os.scandir(self._path(rel)) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        # Free on Windows: FindNextFile already returned it
+                        stat = entry.stat()
+                        files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+                except OSError:
+                    continue
+        subdirs.sort()
+        return {"mtime_ns": mtime_ns, "package": "__init__.py" in files, "subdirs": subdirs, "files": files}
+
+    def refresh(self, dirs=None) -> bool:
+        """
+        Bring the index up to date; True if the set of files or their
+        mtime/size changed. dirs (absolute paths) are listed again even if
+        their mtime looks unchanged, and only their subtrees are visited.
+        """
+        forced = set()
+        if dirs is None:
+            starts = [""]
+        else:
+            starts = []
+            for path in dirs:
+                try:
+                    rel = self._relative(path)
+                except ValueError:
+                    continue
+                # A removed folder: its parent's listing changed
+                while rel and not self._path(rel).is_dir():
+                    rel = rel.rpartition("/")[0]
+                forced.add(rel)
+                starts.append(rel)
+            # Nested starts are covered by their ancestors' walks
+            starts = [rel for rel in starts
+                      if not any(other != rel and (other == "" or rel.startswith(other + "/")) for other in starts)]
+
+        changed = False
+        for start in starts:
+            changed |= self._walk(start, forced)
+        if changed:
+            self._dirty = True
+        return changed
+
+    def _walk(self, start: str, forced: set) -> bool:
+        changed = False
+        visited = set()
+        stack = [start]
+        while stack:
+            rel = stack.pop()
+            try:
+                mtime_ns = os.stat(self._path(rel)).st_mtime_ns
+            except OSError:
+                continue
+            visited.add(rel)
+            cached = self.dirs.get(rel)
+            if cached is None or cached["mtime_ns"] != mtime_ns or rel in forced:
+                try:
+                    record = self._list(rel, mtime_ns)
+                except OSError:
+                    continue
+                if record != cached:
+                    self.dirs[rel] = record
+                    changed = True
+                cached = record
+            for name in reversed(cached["subdirs"]):
+                stack.append(f"{rel}/{name}" if rel else name)
+
+        # Directories of the walked subtree that are gone
+        prefix = start + "/" if start else ""
+        for rel in [rel for rel in self.dirs if (rel == start or rel.startswith(prefix)) and rel not in visited]:
+            del self.dirs[rel]
+            changed = True
+        return changed
+
+    # -- queries -------------------------------------------------------------
+
+    def scripts(self) -> dict:
+        """script_id ("Category/name.py") -> (path, mtime_ns, size), packages skipped."""
+        scripts = {}
+        for rel, record in self.dirs.items():
+            if record["package"]:
+                continue
+            for name, (mtime_ns, size) in record["files"].items():
+                script_id = f"{rel}/{name}" if rel else name
+                scripts[script_id] = (str(self._path(rel) / name), mtime_ns, size)
+        return scripts
+
+    def directories(self) -> list:
+        """Absolute paths of the indexed directories (to watch)."""
+        return [str(self._path(rel)) for rel in self.dirs]
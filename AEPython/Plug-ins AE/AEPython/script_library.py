@@ -6,6 +6,7 @@ custom Python scripts for After Effects.
 
 Features:
 - Folder-based categories
+- Incremental, watcher-driven indexing (script_index.py)
 - JSON metadata for tags, favorites, descriptions
 - Search and filter functionality
 - Script execution and editing
@@ -16,6 +17,7 @@ Features:
 import sys
 import os
 import json
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -23,14 +25,23 @@ from PySide6 import QtGui, QtWidgets, QtCore
 import _AEPython as _ae
 import AEPython as ae
 
+import prewarm
 from qtae import DotSplitter
 
 from completer import HighlightedCompleter
+from script_index import ScriptIndex
+from script_list import ScriptFilterProxyModel, ScriptIdRole, ScriptItemDelegate, ScriptListModel
 
 
 __MainWindow = None
 __ScriptLibraryWindow = None
 
+# Watcher events are collected for this long before rescanning
+WATCH_DELAY_MS = 500
+# Rescan interval while the window is shown, for network drives whose
+# changes the watcher does not see
+POLL_INTERVAL_MS = 60000
+
 
 class ScriptMetadata:
     """Represents metadata for a single script"""
@@ -63,10 +74,22 @@ class ScriptMetadata:
         }
 
 
+class ScriptCatalog:
+    """
+    One version of the library as the window shows it. The script list, the
+    category filter and the search completer all read the same catalog.
+    """
+    
+    def __init__(self, version: int, scripts):
+        self.version = version
+        self.scripts: List[ScriptMetadata] = sorted(scripts, key=lambda m: (not m.favorite, m.category, m.name))
+        self.categories: List[str] = sorted(set(meta.category for meta in self.scripts))
+
+
 class ScriptLibraryManager:
     """Manages script metadata and file system operations"""
     
-    def __init__(self, metadata_path: Path, scripts_root: Path):
+    def __init__(self, metadata_path: Path, scripts_root: Path, index_path: Path = None):
         self.metadata_path = metadata_path
         self.scripts_root = scripts_root
         self.scripts: Dict[str, ScriptMetadata] = {}
@@ -75,8 +98,27 @@ class ScriptLibraryManager:
         self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
         self.scripts_root.mkdir(parents=True, exist_ok=True)
         
+        # Which .py files exist, updated incrementally (script_index.py)
+        self.index = ScriptIndex(scripts_root, index_path)
+        # (mtime_ns, size) of the metadata file as last loaded or saved
+        self._metadata_stamp = None
+        self._synced = False
+        # time.monotonic() of the last refresh
+        self.refreshed_at = None
+        
+        # Bumped on every change to self.scripts; catalog() is rebuilt from it
+        self.version = 0
+        self._catalog: Optional[ScriptCatalog] = None
+        
         self.load_metadata()
     
+    def _stat_metadata(self):
+        try:
+            stat = self.metadata_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
     def load_metadata(self):
         """Load metadata from JSON file"""
         if self.metadata_path.exists():
@@ -87,6 +129,7 @@ class ScriptLibraryManager:
                         self.scripts[script_id] = ScriptMetadata(script_id, metadata)
             except Exception as e:
                 print(f"Failed to load metadata: {e}", file=sys.stderr)
+        self._metadata_stamp = self._stat_metadata()
     
     def save_metadata(self):
         """Save metadata to JSON file"""
@@ -96,48 +139,78 @@ class ScriptLibraryManager:
                 json.dump(data, f, indent=2)
         except Exception as e:
             print(f"Failed to save metadata: {e}", file=sys.stderr)
+        self._metadata_stamp = self._stat_metadata()
+    
+    def refresh(self, dirs: List[str] = None) -> bool:
+        """
+        Update the scripts from the index; True if any were added, removed or
+        moved. dirs limits the rescan to those directories (watcher events).
+        Metadata is only reloaded / saved when it changed.
+        """
+        self.refreshed_at = time.monotonic()
+        reloaded = False
+        if self._stat_metadata() != self._metadata_stamp:
+            # Edited outside this session (another AE, a text editor)
+            self.load_metadata()
+            reloaded = True
+        
+        index_changed = self.index.refresh(dirs)
+        if not (index_changed or reloaded or not self._synced):
+            return False
+        
+        changed = self._sync()
+        self._synced = True
+        if changed:
+            self.save_metadata()
+        self.index.save()
+        if changed or reloaded:
+            self.version += 1
+            return True
+        return False
     
-    def scan_scripts(self) -> List[ScriptMetadata]:
-        """Scan ALL .py files, skip folders with __init__.py (modules/packages)"""
+    def _sync(self) -> bool:
+        """Match self.scripts to the index; True if metadata changed."""
         found_scripts = {}
+        changed = False
         
-        self.load_metadata()
-        
-        # Scan all .py files recursively
-        for py_file in self.scripts_root.rglob('*.py'):
-            rel_path = py_file.relative_to(self.scripts_root)
-            script_id = str(rel_path.as_posix())
-            
-            # ✅ Skip if parent folder has __init__.py (is a module/package)
-            parent_folder = py_file.parent
-            if (parent_folder / '__init__.py').exists():
-                continue  # Skip modules
-            
+        for script_id, (file_path, mtime_ns, _) in self.index.scripts().items():
             # Get category from FIRST parent folder (or immediate parent)
-            category_parts = rel_path.parent.parts
+            category_parts = script_id.split('/')[:-1]
             category = category_parts[0] if category_parts else 'Uncategorized'
             
             # Check if we have metadata
-            if script_id in self.scripts:
-                metadata = self.scripts[script_id]
-                metadata.file_path = str(py_file)
-                metadata.category = category
-            else:
+            metadata = self.scripts.get(script_id)
+            if metadata is None:
                 metadata = ScriptMetadata(script_id, {
-                    'name': py_file.stem,
+                    'name': Path(script_id).stem,
                     'category': category,
-                    'file_path': str(py_file),
+                    'file_path': file_path,
                     'created': datetime.now().isoformat(),
-                    'modified': datetime.fromtimestamp(py_file.stat().st_mtime).isoformat()
+                    'modified': datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
                 })
+                changed = True
+            elif metadata.file_path != file_path or metadata.category != category:
+                metadata.file_path = file_path
+                metadata.category = category
+                changed = True
             
             found_scripts[script_id] = metadata
         
         # Remove stale metadata
+        changed = changed or found_scripts.keys() != self.scripts.keys()
         self.scripts = found_scripts
-        self.save_metadata()
-        
+        return changed
+    
+    def scan_scripts(self, dirs: List[str] = None) -> List[ScriptMetadata]:
+        """All .py files, skipping folders with __init__.py (modules/packages)"""
+        self.refresh(dirs)
         return list(self.scripts.values())
+    
+    def catalog(self) -> ScriptCatalog:
+        """The current catalog, rebuilt only after the scripts changed"""
+        if self._catalog is None or self._catalog.version != self.version:
+            self._catalog = ScriptCatalog(self.version, self.scripts.values())
+        return self._catalog
 
     
     def get_categories(self) -> List[str]:
@@ -160,6 +233,7 @@ class ScriptLibraryManager:
                 if hasattr(metadata, key):
                     setattr(metadata, key, value)
             metadata.modified = datetime.now().isoformat()
+            self.version += 1
             self.save_metadata()
     
     def create_script(self, name: str, category: str, content: str = "") -> Optional[str]:
@@ -188,6 +262,7 @@ class ScriptLibraryManager:
                 'created': datetime.now().isoformat(),
                 'modified': datetime.now().isoformat()
             })
+            self.version += 1
             self.save_metadata()
             
             return script_id
@@ -208,118 +283,6 @@ class ScriptLibraryManager:
             return None
 
 
-class ScriptListItem(QtWidgets.QWidget):
-    """Custom widget for displaying a script in the list"""
-    
-    clicked = QtCore.Signal(str)
-    double_clicked = QtCore.Signal(str)
-    
-    def __init__(self, metadata: ScriptMetadata):
-        super().__init__()
-        self.metadata = metadata
-        self.selected = False
-        
-        # Get current theme colors from qtae
-        from qtae import PythonWindowInstance
-        self.theme_colors = PythonWindowInstance.themes.get_highlighter_colors(
-            PythonWindowInstance.current_theme_key
-        ) if PythonWindowInstance else {}
-        
-        self.setup_ui()
-    
-    def setup_ui(self):
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(8, 4, 8, 4)
-        
-        # Favorite icon - uses theme colors
-        self.fav_label = QtWidgets.QLabel("★" if self.metadata.favorite else "☆")
-        self.fav_label.setFixedWidth(20)
-        fav_color = self.theme_colors.get('brace_color' if self.metadata.favorite else 'output_text', '#ffd700')
-        self.fav_label.setStyleSheet(f"color: {fav_color}; font-weight: bold;")
-        layout.addWidget(self.fav_label)
-        
-        # Script info
-        info_layout = QtWidgets.QVBoxLayout()
-        info_layout.setSpacing(2)
-        
-        # Name - uses theme text color
-        name_label = QtWidgets.QLabel(self.metadata.name)
-        text_color = self.theme_colors.get('output_text', '#d4d4d4')
-        name_label.setStyleSheet(f"color: {text_color}; font-weight: bold; font-size: 11px;")
-        info_layout.addWidget(name_label)
-        
-        # Description - uses muted theme color
-        if self.metadata.description:
-            desc_label = QtWidgets.QLabel(self.metadata.description)
-            muted_color = self.theme_colors.get('line_number', '#858585')
-            desc_label.setStyleSheet(f"color: {muted_color}; font-size: 9px;")
-            desc_label.setWordWrap(True)
-            info_layout.addWidget(desc_label)
-        
-        # Tags - uses theme accent colors
-        if self.metadata.tags:
-            tags_widget = QtWidgets.QWidget()
-            tags_layout = QtWidgets.QHBoxLayout(tags_widget)
-            tags_layout.setContentsMargins(0, 0, 0, 0)
-            tags_layout.setSpacing(4)
-            
-            for tag in self.metadata.tags[:5]:  # Limit display
-                tag_label = QtWidgets.QLabel(f"#{tag}")
-                accent_color = self.theme_colors.get('keyword_color', '#569cd6')
-                tag_label.setStyleSheet(f"""
-                    background-color: {accent_color};
-                    color: #ffffff;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                    font-size: 8px;
-                    font-weight: 500;
-                """)
-                tags_layout.addWidget(tag_label)
-            
-            tags_layout.addStretch()
-            info_layout.addWidget(tags_widget)
-        
-        layout.addLayout(info_layout, 1)
-        
-        # Category badge - uses theme background/button colors
-        category_label = QtWidgets.QLabel(self.metadata.category)
-        bg_color = self.theme_colors.get('background', '#1e1e1e')
-        cat_text_color = self.theme_colors.get('output_text', '#d4d4d4')
-        category_label.setStyleSheet(f"""
-            background-color: {QtGui.QColor(bg_color).lighter(170).name()};
-            color: {cat_text_color};
-            padding: 4px 8px;
-            border-radius: 3px;
-            font-size: 9px;
-        """)
-        category_label.setFixedHeight(24)
-        layout.addWidget(category_label)
-    
-    def mousePressEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.LeftButton:
-            self.clicked.emit(self.metadata.script_id)
-    
-    def mouseDoubleClickEvent(self, event):
-        if event.button() == QtCore.Qt.MouseButton.LeftButton:
-            self.double_clicked.emit(self.metadata.script_id)
-    
-    def set_selected(self, selected: bool):
-        self.selected = selected
-        if selected:
-            # Use theme selection color
-            sel_color = self.theme_colors.get('current_line', '#264f78')
-            self.setStyleSheet(f"background-color: {sel_color}; border-radius: 2px;")
-        else:
-            self.setStyleSheet("background-color: transparent;")
-    
-    def update_favorite(self, is_favorite: bool):
-        self.metadata.favorite = is_favorite
-        self.fav_label.setText("★" if is_favorite else "☆")
-        fav_color = self.theme_colors.get('brace_color' if is_favorite else 'output_text', '#ffd700')
-        self.fav_label.setStyleSheet(f"color: {fav_color}; font-weight: bold;")
-
-
-
 class ScriptEditorDialog(QtWidgets.QDialog):
     """Dialog for editing script metadata"""
     
@@ -417,11 +380,13 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         # Initialize manager
         self.manager = ScriptLibraryManager(
             metadata_path=user_docs / "script_library.json",
-            scripts_root=user_docs / "Scripts"
+            scripts_root=user_docs / "Scripts",
+            index_path=user_docs / "script_index.json"
         )
         
         self.current_script_id: Optional[str] = None
-        self.script_widgets: Dict[str, ScriptListItem] = {}
+        # Version of the catalog the list, filter and completer show
+        self.catalog_version: Optional[int] = None
         
         self.setWindowTitle("AE Python Script Library")
         self.resize(800, 600)
@@ -446,7 +411,11 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         
         self.setup_completer()
         
-        self.refresh_scripts()
+        self.setup_watcher()
+        
+        # Built when the window is first shown
+        self.manager.refresh()
+        self.watch_directories()
     
     def closeEvent(self, event):
         """Hide window instead of closing when user clicks X"""
@@ -457,7 +426,59 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         """Auto-refresh when window shown/brought to front"""
         super().showEvent(event)
         self.reset_preview()
-        QtCore.QTimer.singleShot(100, self.refresh_scripts)
+        self.update_list_theme()
+        self.poll_timer.start()
+        # Nothing to do unless the watcher saw changes while hidden
+        self.show_catalog()
+        refreshed_at = self.manager.refreshed_at
+        if refreshed_at is None or time.monotonic() - refreshed_at > POLL_INTERVAL_MS / 1000:
+            QtCore.QTimer.singleShot(100, self.poll_scripts)
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.poll_timer.stop()
+    
+    def setup_watcher(self):
+        """Rescan only the folders the file system reports as changed"""
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.watched_dirs = set()
+        self.changed_dirs = set()
+        
+        self.change_timer = QtCore.QTimer(self)
+        self.change_timer.setSingleShot(True)
+        self.change_timer.setInterval(WATCH_DELAY_MS)
+        self.change_timer.timeout.connect(self.apply_directory_changes)
+        
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll_scripts)
+    
+    def watch_directories(self):
+        """Watch the indexed folders (new ones added, removed ones dropped)"""
+        wanted = set(self.manager.index.directories())
+        gone = self.watched_dirs - wanted
+        new = wanted - self.watched_dirs
+        if gone:
+            self.watcher.removePaths(list(gone))
+        if new:
+            self.watcher.addPaths(list(new))
+        self.watched_dirs = wanted
+    
+    def on_directory_changed(self, path):
+        # Saving a script often touches its folder several times in a row
+        self.changed_dirs.add(path)
+        self.change_timer.start()
+    
+    def apply_directory_changes(self):
+        dirs = list(self.changed_dirs)
+        self.changed_dirs.clear()
+        if self.manager.refresh(dirs):
+            self.watch_directories()
+        self.show_catalog()
+    
+    def poll_scripts(self):
+        self.refresh_scripts()
     
     def setup_ui(self):
         """Setup the UI"""
@@ -505,20 +526,24 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         
         list_layout.addWidget(QtWidgets.QLabel("Scripts"))
         
-        # Scroll area for scripts
-        scroll = QtWidgets.QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        self.script_list_widget = QtWidgets.QWidget()
-        self.script_list_widget.setObjectName("scriptListContainer")
-        self.script_list_layout = QtWidgets.QVBoxLayout(self.script_list_widget)
-        self.script_list_layout.setSpacing(0)
-        self.script_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.script_list_layout.addStretch()
-        
-        scroll.setWidget(self.script_list_widget)
-        list_layout.addWidget(scroll)
+        # Script list: rows painted by the delegate, filtered by the proxy
+        self.script_list_model = ScriptListModel(self)
+        self.script_filter = ScriptFilterProxyModel(self)
+        self.script_filter.setSourceModel(self.script_list_model)
+        
+        self.script_list = QtWidgets.QListView()
+        self.script_list.setObjectName("scriptList")
+        self.script_list.setModel(self.script_filter)
+        self.script_delegate = ScriptItemDelegate(self.script_list)
+        self.script_list.setItemDelegate(self.script_delegate)
+        self.script_list.setUniformItemSizes(True)
+        self.script_list.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.script_list.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.script_list.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.script_list.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.script_list.selectionModel().currentChanged.connect(self.on_current_script_changed)
+        self.script_list.doubleClicked.connect(lambda index: self.run_script(index.data(ScriptIdRole)))
+        list_layout.addWidget(self.script_list)
         
         splitter.addWidget(list_widget)
         
@@ -590,6 +615,9 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         """Reset script preview to default state"""
         self.current_script_id = None
         
+        # Deselect the script item
+        self.script_list.selectionModel().clear()
+        
         # Clear preview
         self.info_label.setText("Select a script to view details")
         self.code_preview.setPlainText("")
@@ -600,10 +628,6 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         self.edit_meta_btn.setEnabled(False)
         self.toggle_fav_btn.setEnabled(False)
         self.toggle_fav_btn.setText("☆ Favorite")
-        
-        # Deselect all script items
-        for widget in self.script_widgets.values():
-            widget.set_selected(False)
 
     def setup_completer(self):
         """Setup Houdini-style search completer"""
@@ -619,8 +643,7 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         # ✅ SINGLE CONNECTION - handles BOTH completer AND list filtering
         self.search_input.textChanged.connect(self.on_search_changed)
         #self.completer.activated.connect(self.on_completer_activated)
-        
-        self.update_completer_model()
+
 
     def on_completer_activated(self, selected_text):
         """Handle completer item selection"""
@@ -632,17 +655,16 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
             item = self.script_model.item(i)
             if item.text().lower() == selected_text.lower():
                 script_id = item.data(QtCore.Qt.ItemDataRole.UserRole)
-                if script_id and script_id in self.script_widgets:
+                if script_id and self.script_list_model.row_of(script_id) is not None:
                     self.select_script(script_id)
                     self.search_input.clear()
                     break
 
-    def update_completer_model(self):
+    def update_completer_model(self, catalog: ScriptCatalog):
         """Update completer model with current scripts"""
         self.script_model.clear()
-        scripts = self.manager.scan_scripts()
         
-        for metadata in scripts:
+        for metadata in catalog.scripts:
             item = QtGui.QStandardItem(metadata.name)
             item.setData(metadata.script_id, QtCore.Qt.ItemDataRole.UserRole)  # Store script_id
             self.script_model.appendRow(item)
@@ -677,73 +699,75 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
     
     def refresh_scripts(self):
         """Refresh script list from disk"""
-        # Scan and update
-        scripts = self.manager.scan_scripts()
+        if self.manager.refresh():
+            self.watch_directories()
+        self.show_catalog()
+    
+    def show_catalog(self):
+        """Rebuild the list, category filter and completer if the catalog changed"""
+        # Hidden: rebuilt on the next show instead
+        if not self.isVisible():
+            return
+        catalog = self.manager.catalog()
+        if catalog.version == self.catalog_version:
+            return
+        self.catalog_version = catalog.version
         
         # Update category filter
-        categories = self.manager.get_categories()
+        categories = catalog.categories
         current = self.category_combo.currentText()
+        self.category_combo.blockSignals(True)
         self.category_combo.clear()
         self.category_combo.addItem("All Categories")
         self.category_combo.addItems(categories)
         if current in categories or current == "All Categories":
             self.category_combo.setCurrentText(current)
+        self.category_combo.blockSignals(False)
         
-        # Clear existing list
-        while self.script_list_layout.count() > 1:  # Keep stretch
-            item = self.script_list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        self.script_widgets.clear()
-        
-        # Add scripts to list
-        for metadata in sorted(scripts, key=lambda m: (not m.favorite, m.category, m.name)):
-            item = ScriptListItem(metadata)
-            item.clicked.connect(self.select_script)
-            item.double_clicked.connect(self.run_script)
-            
-            self.script_list_layout.insertWidget(self.script_list_layout.count() - 1, item)
-            self.script_widgets[metadata.script_id] = item
-        
+        self.script_list_model.set_scripts(catalog.scripts)
         self.filter_scripts()
-        self.update_completer_model()
+        if self.current_script_id is not None:
+            self.select_list_row(self.current_script_id)
+        
+        self.update_completer_model(catalog)
     
     def filter_scripts(self):
         """Filter scripts based on search and filters"""
         # ✅ Use completer's cleaned search text
-        search_text = self.search_input.text().lower()
         category = self.category_combo.currentText()
-        favorites_only = self.favorites_btn.isChecked()
-        
-        for script_id, widget in self.script_widgets.items():
-            metadata = widget.metadata
-            
-            # Enhanced search matching (like completer)
-            matches_search = (
-                not search_text or
-                any(term in metadata.name.lower() or 
-                    term in metadata.description.lower() or 
-                    any(term in tag.lower() for tag in metadata.tags)
-                    for term in search_text.split())
-            )
-            
-            matches_category = category == "All Categories" or metadata.category == category
-            matches_favorite = not favorites_only or metadata.favorite
-            
-            widget.setVisible(matches_search and matches_category and matches_favorite)
-
+        self.script_filter.set_filter(
+            self.search_input.text(),
+            None if category == "All Categories" else category,
+            self.favorites_btn.isChecked()
+        )
+    
+    def update_list_theme(self):
+        """Paint the list with the console's current theme colors"""
+        from qtae import PythonWindowInstance
+        self.script_delegate.set_theme_colors(PythonWindowInstance.themes.get_highlighter_colors(
+            PythonWindowInstance.current_theme_key
+        ) if PythonWindowInstance else {})
+        self.script_list.viewport().update()
+    
+    def select_list_row(self, script_id: str):
+        """Make script_id the list's current row (if it passes the filters)"""
+        row = self.script_list_model.row_of(script_id)
+        if row is None:
+            return
+        index = self.script_filter.mapFromSource(self.script_list_model.index(row))
+        if index.isValid():
+            self.script_list.setCurrentIndex(index)
+            self.script_list.scrollTo(index)
+    
+    def on_current_script_changed(self, current, previous):
+        script_id = current.data(ScriptIdRole) if current.isValid() else None
+        if script_id and script_id != self.current_script_id:
+            self.select_script(script_id)
     
     def select_script(self, script_id: str):
         """Select a script and show preview"""
-        # Deselect previous
-        if self.current_script_id and self.current_script_id in self.script_widgets:
-            self.script_widgets[self.current_script_id].set_selected(False)
-        
-        # Select new
         self.current_script_id = script_id
-        if script_id in self.script_widgets:
-            self.script_widgets[script_id].set_selected(True)
+        self.select_list_row(script_id)
         
         # Load and display
         metadata = self.manager.scripts[script_id]
@@ -785,64 +809,50 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         metadata = self.manager.scripts[script_id]
         script_path = metadata.file_path
         
-        try:
-            # Execute in main console context
-            from qtae import PythonWindowInstance
-            window = PythonWindowInstance
-            colors = window.themes.get_highlighter_colors(window.current_theme_key)
-            
-            window.textedit_output.setTextColor(QtGui.QColor(colors["code_prefix"]))
-            window.textedit_output.append(f"\n>>> Running: {metadata.name}")
-            window.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))   
-            
-            # Create execution namespace with __file__ set correctly
-            '''
-            exec_globals = globals().copy()
-            exec_globals['__file__'] = script_path
-            '''
-            
-            ## OR # Create clean execution namespace
-            _exec_namespace = {
-                '__name__': '__main__',
-                '__builtins__': __builtins__,
-                'ae': ae,  # AEPython access
-                '_ae': _ae  # Internal AEPython
-            }
-            
-            if script_path:
-                _exec_namespace['__file__'] = script_path
-                module_dir = os.path.dirname(script_path)
-                sys.path.insert(0, module_dir)
-                exec(compile(content, script_path, 'exec'), _exec_namespace)
-            elif '__file__' in _exec_namespace:
-                del _exec_namespace['__file__']
-                exec(code, _exec_namespace)    
-            
-            # Success message
-            window.textedit_output.setTextColor(QtGui.QColor(colors["success_text"]))
-            window.textedit_output.append(f"✓ Script '{metadata.name}' executed successfully!\n")
-            window.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
-
-            '''
-            QtWidgets.QMessageBox.information(
-                self,
-                "Success",
-                f"Script '{metadata.name}' executed successfully!"
-            )
-            '''
-        except Exception as e:
-            import traceback
-            error_msg = traceback.format_exc()
-            
-            window.textedit_output.setTextColor(QtGui.QColor(colors["error_text"]))
-            window.textedit_output.append(f"\nError executing script:\n{error_msg}\n")
-            window.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
-
-            QtWidgets.QMessageBox.critical(
-                self,
-                "Script Error",
-                f"Error executing script:\n\n{error_msg}"
-            )
+        # Execute in main console context
+        from qtae import PythonWindowInstance
+        window = PythonWindowInstance
+        colors = window.themes.get_highlighter_colors(window.current_theme_key)
+        
+        window.textedit_output.setTextColor(QtGui.QColor(colors["code_prefix"]))
+        window.textedit_output.append(f"\n>>> Running: {metadata.name}")
+        window.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))   
+        
+        # Create clean execution namespace
+        _exec_namespace = {
+            '__name__': '__main__',
+            '__builtins__': __builtins__,
+            'ae': ae,  # AEPython access
+            '_ae': _ae  # Internal AEPython
+        }
+        
+        if script_path:
+            _exec_namespace['__file__'] = script_path
+            module_dir = os.path.dirname(script_path)
+            sys.path.insert(0, module_dir)
+        
+        # Libraries the script loads are prewarmed at the next launches
+        imports = prewarm.ImportRecorder()
+        
+        def finished(error):
+            imports.stop()
+            if error is None:
+                # Success message
+                window.textedit_output.setTextColor(QtGui.QColor(colors["success_text"]))
+                window.textedit_output.append(f"✓ Script '{metadata.name}' executed successfully!\n")
+                window.textedit_output.setTextColor(QtGui.QColor(colors["output_text"]))
+            elif not isinstance(error, KeyboardInterrupt):
+                import traceback
+                error_msg = "".join(traceback.format_exception(error))
+                QtWidgets.QMessageBox.critical(
+                    self,
+                    "Script Error",
+                    f"Error executing script:\n\n{error_msg}"
+                )
+        
+        # Generator scripts (with top-level yield) run in slices with progress
+        # and Cancel in the console; the traceback is printed there too
+        window.run_code(content, script_path or f"<{metadata.name}>", _exec_namespace, metadata.name, finished)
 
     
     def edit_metadata(self):
@@ -871,8 +881,7 @@ class ScriptLibraryWindow(QtWidgets.QMainWindow):
         self.manager.update_script_metadata(self.current_script_id, favorite=new_favorite)
         
         # Update UI
-        if self.current_script_id in self.script_widgets:
-            self.script_widgets[self.current_script_id].update_favorite(new_favorite)
+        self.script_list_model.script_changed(self.current_script_id)
         
         self.toggle_fav_btn.setText("★ Unfavorite" if new_favorite else "☆ Favorite")
     
@@ -978,11 +987,19 @@ def GetQtAEMainWindow():
         win32gui.SetParent(int(__MainWindow.winId()), _ae.getMainHWND())
     return __MainWindow
 
+def GetScriptLibraryWindow():
+    """The script library window, built on first use (not at import)."""
+    global __ScriptLibraryWindow
+    if __ScriptLibraryWindow is None:
+        __ScriptLibraryWindow = ScriptLibraryWindow(GetQtAEMainWindow())
+    return __ScriptLibraryWindow
+
 def ShowScriptLibrary():
-    """Show the script library window"""      
-    __ScriptLibraryWindow.show()
-    __ScriptLibraryWindow.raise_()
-    __ScriptLibraryWindow.activateWindow()
+    """Show the script library window"""
+    window = GetScriptLibraryWindow()
+    window.show()
+    window.raise_()
+    window.activateWindow()
 
 # ADD THESE TWO FUNCTIONS:
 def ToggleScriptLibrary():
@@ -1000,8 +1017,10 @@ def IsScriptLibraryVisible():
         return False
     return __ScriptLibraryWindow.isVisible()
 
-__ScriptLibraryWindow = ScriptLibraryWindow(GetQtAEMainWindow())
-
 
-# ✅ Expose publicly for other modules
-ScriptLibraryWindowInstance = __ScriptLibraryWindow
\ No newline at end of file
+def __getattr__(name):
+    # ScriptLibraryWindowInstance used to be built at import (which needs
+    # win32gui and AE's main window); build it on first access
+    if name == "ScriptLibraryWindowInstance":
+        return GetScriptLibraryWindow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,225 @@
+"""
+AEPython Script Library list
+
+Model/view pieces of the Script Library's script list. Scripts are rows of
+a ScriptListModel, filtered by a ScriptFilterProxyModel and painted by a
+ScriptItemDelegate into a QListView, so no widget exists per script: memory
+and paint time follow the rows on screen, not the size of the library.
+
+Example:
+    model = ScriptListModel()
+    proxy = ScriptFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = QtWidgets.QListView()
+    view.setModel(proxy)
+    view.setItemDelegate(ScriptItemDelegate(view))
+    view.setUniformItemSizes(True)
+
+    model.set_scripts(catalog.scripts)          # ScriptMetadata, in display order
+    proxy.set_filter("fade", "Animation", favorites_only=False)
+
+Rows have one height (name line plus description line), which lets the
+view lay out 10,000 scripts without measuring each one.
+"""
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+ScriptIdRole = QtCore.Qt.ItemDataRole.UserRole
+MetadataRole = QtCore.Qt.ItemDataRole.UserRole + 1
+
+
+class ScriptListModel(QtCore.QAbstractListModel):
+    """ScriptMetadata objects as list rows"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scripts = []
+        self._rows = {}
+        # Lowercased (name, description, tags) per row, for filtering
+        self.search_keys = []
+
+    def set_scripts(self, scripts):
+        self.beginResetModel()
+        self.scripts = list(scripts)
+        self._rows = {meta.script_id: row for row, meta in enumerate(self.scripts)}
+        self.search_keys = [
+            (meta.name.lower(), meta.description.lower(), [tag.lower() for tag in meta.tags])
+            for meta in self.scripts
+        ]
+        self.endResetModel()
+
+    def row_of(self, script_id: str):
+        return self._rows.get(script_id)
+
+    def script_changed(self, script_id: str):
+        """Repaint (and refilter) a script whose metadata was edited in place"""
+        row = self._rows.get(script_id)
+        if row is None:
+            return
+        meta = self.scripts[row]
+        self.search_keys[row] = (meta.name.lower(), meta.description.lower(), [tag.lower() for tag in meta.tags])
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.scripts)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        meta = self.scripts[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return meta.name
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return meta.file_path
+        if role == ScriptIdRole:
+            return meta.script_id
+        if role == MetadataRole:
+            return meta
+        return None
+
+
+class ScriptFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """Search terms (name, description or tags), category and favorites filters"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_terms = []
+        self.category = None
+        self.favorites_only = False
+
+    def set_filter(self, search_text: str, category: str = None, favorites_only: bool = False):
+        """category None shows all categories"""
+        search_terms = search_text.lower().split()
+        if (search_terms, category, favorites_only) == (self.search_terms, self.category, self.favorites_only):
+            return
+        self.search_terms = search_terms
+        self.category = category
+        self.favorites_only = favorites_only
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        meta = model.scripts[source_row]
+        if self.favorites_only and not meta.favorite:
+            return False
+        if self.category is not None and meta.category != self.category:
+            return False
+        if not self.search_terms:
+            return True
+        name, description, tags = model.search_keys[source_row]
+        return any(
+            term in name or term in description or any(term in tag for tag in tags)
+            for term in self.search_terms
+        )
+
+
+class ScriptItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a script row: favorite star, name, tags, description and category badge"""
+
+    MARGIN = 8
+    PADDING = 4
+    MAX_TAGS = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.theme_colors = {}
+
+        base = QtWidgets.QApplication.font()
+        self.name_font = QtGui.QFont(base)
+        self.name_font.setPixelSize(11)
+        self.name_font.setBold(True)
+        self.description_font = QtGui.QFont(base)
+        self.description_font.setPixelSize(9)
+        self.tag_font = QtGui.QFont(base)
+        self.tag_font.setPixelSize(8)
+        self.tag_font.setWeight(QtGui.QFont.Weight.Medium)
+        self.badge_font = QtGui.QFont(base)
+        self.badge_font.setPixelSize(9)
+
+        self.name_metrics = QtGui.QFontMetrics(self.name_font)
+        self.description_metrics = QtGui.QFontMetrics(self.description_font)
+        self.tag_metrics = QtGui.QFontMetrics(self.tag_font)
+        self.badge_metrics = QtGui.QFontMetrics(self.badge_font)
+
+    def set_theme_colors(self, colors: dict):
+        """Colors from qtae's current theme (get_highlighter_colors)"""
+        self.theme_colors = colors or {}
+
+    def color(self, key: str, default: str) -> QtGui.QColor:
+        return QtGui.QColor(self.theme_colors.get(key, default))
+
+    def sizeHint(self, option, index):
+        height = self.name_metrics.height() + 2 + self.description_metrics.height() + 2 * self.PADDING + 4
+        return QtCore.QSize(option.rect.width(), max(height, 32))
+
+    def paint(self, painter, option, index):
+        meta = index.data(MetadataRole)
+        if meta is None:
+            return
+        rect = option.rect
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+
+        if option.state & QtWidgets.QStyle.StateFlag.State_Selected:
+            painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            painter.setBrush(self.color('current_line', '#264f78'))
+            painter.drawRoundedRect(rect, 2, 2)
+
+        text_color = self.color('output_text', '#d4d4d4')
+        x = rect.left() + self.MARGIN
+
+        # Favorite star
+        painter.setFont(self.name_font)
+        painter.setPen(self.color('brace_color', '#ffd700') if meta.favorite else text_color)
+        star = QtCore.QRect(x, rect.top(), 20, rect.height())
+        painter.drawText(star, QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
+                         "★" if meta.favorite else "☆")
+        x += 20
+
+        # Category badge, right-aligned
+        badge_width = self.badge_metrics.horizontalAdvance(meta.category) + 16
+        badge = QtCore.QRect(rect.right() - self.MARGIN - badge_width, rect.center().y() - 11, badge_width, 22)
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(self.color('background', '#1e1e1e').lighter(170))
+        painter.drawRoundedRect(badge, 3, 3)
+        painter.setFont(self.badge_font)
+        painter.setPen(text_color)
+        painter.drawText(badge, QtCore.Qt.AlignmentFlag.AlignCenter, meta.category)
+        right = badge.left() - self.MARGIN
+
+        # Name, then as many tags as fit after it
+        top = rect.top() + self.PADDING + 2
+        name_height = self.name_metrics.height()
+        name = self.name_metrics.elidedText(meta.name, QtCore.Qt.TextElideMode.ElideRight, max(0, right - x))
+        painter.setFont(self.name_font)
+        painter.drawText(QtCore.QRect(x, top, right - x, name_height),
+                         QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter, name)
+
+        tag_x = x + self.name_metrics.horizontalAdvance(name) + 8
+        tag_height = self.tag_metrics.height() + 2
+        painter.setFont(self.tag_font)
+        accent = self.color('keyword_color', '#569cd6')
+        for tag in meta.tags[:self.MAX_TAGS]:
+            label = f"#{tag}"
+            chip = QtCore.QRect(tag_x, top + (name_height - tag_height) // 2,
+                                self.tag_metrics.horizontalAdvance(label) + 12, tag_height)
+            if chip.right() > right:
+                break
+            painter.setPen(QtCore.Qt.PenStyle.NoPen)
+            painter.setBrush(accent)
+            painter.drawRoundedRect(chip, 3, 3)
+            painter.setPen(QtGui.QColor("#ffffff"))
+            painter.drawText(chip, QtCore.Qt.AlignmentFlag.AlignCenter, label)
+            tag_x = chip.right() + 5
+
+        # Description, one elided line
+        if meta.description:
+            painter.setFont(self.description_font)
+            painter.setPen(self.color('line_number', '#858585'))
+            description = self.description_metrics.elidedText(
+                " ".join(meta.description.split()), QtCore.Qt.TextElideMode.ElideRight, max(0, right - x))
+            painter.drawText(QtCore.QRect(x, top + name_height + 2, right - x, self.description_metrics.height()),
+                             QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter, description)
+
+        painter.restore()
@@ -0,0 +1,168 @@
+"""
+AEPython script watchdog
+
+Stops a runaway console script without force-quitting After Effects.
+
+While a script runs on the main thread the watchdog thread is armed. It
+raises ScriptCancelled into the script (PyThreadState_SetAsyncExc, delivered
+at the next Python bytecode) when
+
+    - the user holds Esc while AE or the console has focus (Windows), or
+    - the script has kept the UI from updating for longer than the time
+      budget (cooperative pumps and generator ticks reset the clock).
+
+The interrupt is a KeyboardInterrupt, so `except Exception` in the script does
+not swallow it. Code blocked inside a single host call (a long ExtendScript
+loop) is interrupted when that call returns.
+
+Example:
+    import script_watchdog
+
+    guard = script_watchdog.Watchdog(budget=60)
+    with guard.armed():
+        exec(code, namespace)       # raises ScriptTimeout after 60 s without a beat()
+"""
+
+import ctypes
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from cooperative import ScriptCancelled
+
+# Seconds between watchdog checks
+POLL_INTERVAL = 0.05
+
+# Seconds Esc must be held to stop a script
+ESCAPE_HOLD = 0.3
+
+# Seconds after which an interrupt that did not stop the script is sent again
+# (it can land in, and be swallowed by, a Qt event handler run by a pump)
+RESEND_AFTER = 1.0
+
+
+class ScriptTimeout(ScriptCancelled):
+    """The script exceeded its time budget without letting AE update."""
+
+
+def _set_async_exc(thread_id: int, exception) -> int:
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exception) if exception is not None else None
+    )
+
+
+if sys.platform == "win32":
+    _user32 = ctypes.windll.user32
+
+    def _escape_held() -> bool:
+        """Esc is down and the foreground window belongs to this process."""
+        if not _user32.GetAsyncKeyState(0x1B) & 0x8000:
+            return False
+        pid = ctypes.c_ulong()
+        _user32.GetWindowThreadProcessId(_user32.GetForegroundWindow(), ctypes.byref(pid))
+        return pid.value == os.getpid()
+else:
+    def _escape_held() -> bool:
+        return False
+
+
+class Watchdog:
+    """
+    Background thread interrupting the thread that armed it.
+
+    budget is the number of seconds the armed thread may run without
+    calling beat(); None or 0 disables the limit (Esc still works).
+    """
+
+    def __init__(self, budget: float = None, escape: bool = True):
+        self.budget = budget
+        self.escape = escape
+        self.reason = None
+        self._lock = threading.Lock()
+        self._target = None
+        self._last_beat = 0.0
+        self._sent = None
+        # Interrupt asked for on the guarded thread itself, sent by the watchdog thread
+        self._requested = None
+        self._escape_since = None
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="AEPython watchdog", daemon=True)
+            self._thread.start()
+
+    def arm(self):
+        """Start guarding the current thread."""
+        with self._lock:
+            self._target = threading.get_ident()
+            self._last_beat = time.monotonic()
+            self._sent = None
+            self._requested = None
+            self._escape_since = None
+            self.reason = None
+        self._ensure_thread()
+
+    def disarm(self):
+        """Stop guarding; drops an interrupt that was sent but not delivered yet."""
+        with self._lock:
+            if self._sent is not None and self._target is not None:
+                _set_async_exc(self._target, None)
+            self._target = None
+            self._requested = None
+
+    @contextmanager
+    def armed(self):
+        self.arm()
+        try:
+            yield self
+        finally:
+            self.disarm()
+
+    def beat(self):
+        """The script let AE update: restart the time budget."""
+        self._last_beat = time.monotonic()
+
+    def interrupt(self, exception=ScriptCancelled, reason: str = "Stopped"):
+        """Raise exception (a class) in the guarded thread at its next bytecode."""
+        with self._lock:
+            if self._target is None or self._sent is not None:
+                return
+            if threading.get_ident() == self._target:
+                # From a handler run by a pump (the Stop button): raised now it
+                # would end that handler, not the script
+                self._requested = (exception, reason)
+                return
+            self._sent = (exception, time.monotonic())
+            self.reason = reason
+            _set_async_exc(self._target, exception)
+
+    def _loop(self):
+        while True:
+            time.sleep(POLL_INTERVAL)
+            if self._target is None:
+                continue
+            now = time.monotonic()
+            requested = self._requested
+            if requested is not None:
+                self._requested = None
+                self.interrupt(*requested)
+                continue
+            if self._sent is not None:
+                with self._lock:
+                    if self._target is not None and self._sent is not None and now - self._sent[1] > RESEND_AFTER:
+                        self._sent = (self._sent[0], now)
+                        _set_async_exc(self._target, self._sent[0])
+                continue
+            if self.escape and _escape_held():
+                if self._escape_since is None:
+                    self._escape_since = now
+                elif now - self._escape_since >= ESCAPE_HOLD:
+                    self.interrupt(ScriptCancelled, "Stopped with Esc")
+                    continue
+            else:
+                self._escape_since = None
+            if self.budget and now - self._last_beat > self.budget:
+                self.interrupt(ScriptTimeout, f"Stopped after {self.budget:g} s without letting After Effects update")
@@ -0,0 +1,210 @@
+"""
+AEPython startup profiler
+
+Opt-in trace of what the Python bridge adds to After Effects' launch. Turn it
+on with the AEPYTHON_STARTUP_PROFILE=1 environment variable, or with Edit >
+Profile Startup in the Python Console (stored as "startup_profile" in
+Documents/AEPython/.aepython_state.json), then restart AE.
+
+Each profiled launch writes Documents/AEPython/startup_profile.json:
+
+    {
+      "interpreter_init": 0.081,            # seconds, measured by the plugin
+      "phases": [                           # seconds since profiling started
+        {"name": "import AEPython", "start": 0.0, "duration": 0.012},
+        {"name": "import qtae", "start": 0.012, "duration": 0.310},
+        {"name": "console window: themes", ...},
+        {"name": "console window: restore state", ...}
+      ],
+      "imports": [                          # like python -X importtime
+        {"module": "PySide6.QtCore", "self_us": 41000, "cumulative_us": 52000, "depth": 2},
+        ...
+      ],
+      "packages": {"PySide6": 198000, ...}  # self time per top-level package (us)
+    }
+
+The console window is built on first use, so its phases are added (and the
+report rewritten) when it is first opened.
+
+Example:
+    with startup_profile.phase("import qtae"):
+        import qtae
+    startup_profile.finish()
+
+When profiling is off, phase() is a no-op and no import hook is installed.
+"""
+
+import builtins
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Environment variable turning the profiler on ("1", "true", "yes")
+ENV_VAR = "AEPYTHON_STARTUP_PROFILE"
+
+# Setting in the console state file turning the profiler on
+STATE_KEY = "startup_profile"
+
+STATE_FILE = Path.home() / "Documents" / "AEPython" / ".aepython_state.json"
+REPORT_FILE = Path.home() / "Documents" / "AEPython" / "startup_profile.json"
+
+_profile = None
+
+
+def enabled() -> bool:
+    """Whether this launch should be profiled."""
+    value = os.environ.get(ENV_VAR)
+    if value is not None:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return bool(json.load(f).get(STATE_KEY))
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+class ImportTimer:
+    """
+    builtins.__import__ wrapper recording the modules each import statement
+    loads, with self and cumulative time as -X importtime reports them.
+    Modules loaded through importlib.import_module() are counted in the
+    import statement that triggered them.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._original = None
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            name_resolved = f"{base}.{name}" if name else base
+        else:
+            name_resolved = name
+        # "from pkg import submodule" loads pkg.submodule even when pkg is loaded
+        wanted = [name_resolved] + [f"{name_resolved}.{item}" for item in fromlist or () if item != "*"]
+        new = [module for module in wanted if module not in sys.modules]
+        if not new:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        loaded = False
+        try:
+            module = original(name, globals, locals, fromlist, level)
+            loaded = True
+            return module
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            # Failed imports (optional modules) only count in their parent.
+            # Names in fromlist that were attributes, not submodules, stay out
+            # of sys.modules; the rest share the statement's time.
+            new = [module for module in new if module in sys.modules] if loaded else []
+            for module in new:
+                self.records.append({
+                    "module": module,
+                    "self_us": round((elapsed - children) * 1e6 / len(new)),
+                    "cumulative_us": round(elapsed * 1e6 / len(new)),
+                    "depth": len(self._stack),
+                })
+
+
+class Profile:
+    """Phases and imports of one launch."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.started = datetime.now()
+        self.phases = []
+        self.imports = ImportTimer()
+        self.finished = False
+
+    def add_phase(self, name: str, start: float, end: float):
+        self.phases.append({
+            "name": name,
+            "start": round(start - self.origin, 6),
+            "duration": round(end - start, 6),
+        })
+
+    def report(self) -> dict:
+        host = sys.modules.get("_AEPython")
+        packages = {}
+        for record in self.imports.records:
+            package = record["module"].split(".")[0]
+            packages[package] = packages.get(package, 0) + record["self_us"]
+        return {
+            "timestamp": self.started.isoformat(timespec="seconds"),
+            "python": sys.version,
+            "executable": sys.executable,
+            "interpreter_init": getattr(host, "interpreter_init_time", None),
+            "phases": sorted(self.phases, key=lambda phase: phase["start"]),
+            "imports": self.imports.records,
+            "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        }
+
+    def write(self, path: Path = None):
+        path = Path(path or REPORT_FILE)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError as e:
+            print(f"Failed to write the startup profile: {e}", file=sys.stderr)
+
+
+def start() -> Profile:
+    """Start profiling if enabled(); returns the Profile or None."""
+    global _profile
+    if _profile is None and enabled():
+        _profile = Profile()
+        _profile.imports.install()
+    return _profile
+
+
+def active() -> bool:
+    return _profile is not None
+
+
+@contextmanager
+def phase(name: str):
+    """Time a startup phase (no-op unless profiling)."""
+    profile = _profile
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, start, time.perf_counter())
+        if profile.finished:
+            # A late phase (the console window): refresh the written report
+            profile.write()
+
+
+def finish():
+    """End of plugin init: stop timing imports and write the report."""
+    profile = _profile
+    if profile is None or profile.finished:
+        return
+    profile.imports.uninstall()
+    profile.finished = True
+    profile.write()
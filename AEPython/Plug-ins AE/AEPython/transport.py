@@ -0,0 +1,454 @@
+"""
+AEPython transports
+
+How the bridge reaches the ExtendScript host. InProcessTransport calls the
+embedded _AEPython module directly (the default inside After Effects; it
+lives in bridge_transport.py, which AEPython imports at launch).
+SocketTransport talks to a TransportServer over a local TCP or Unix socket,
+so an external CPython process (render-farm controller, Jupyter, pytest) can
+drive AE through the same ae.app... API.
+
+Example (inside AE, from the Python Console):
+    import transport
+    transport.serve()               # 127.0.0.1:5890, writes Documents/AEPython/remote.json
+
+Example (external process):
+    import AEPython as ae
+    ae.connect()                    # reads remote.json, or ae.connect("tcp://127.0.0.1:5890", token)
+    print(ae.app.project.activeItem.name)
+
+Example (local stand-in server backed by the emulator, e.g. for tests):
+    python emulator/ae_emulator.py --port 5890     # from a source checkout
+
+Protocol: every frame is a 4-byte big-endian length followed by a UTF-8 JSON
+object. Requests carry an "id" that the response echoes, so a client can
+keep many requests in flight (pipelining) and match answers as they arrive.
+Requests:
+    {"id": 1, "op": "hello", "token": "..."}     -> {"id": 1, "result": {...}}
+    {"id": 2, "op": "exec", "code": "..."}       -> {"id": 2, "result": "..."} / {"id": 2, "error": "..."}
+    {"id": 3, "op": "batch", "codes": [...]}     -> {"id": 3, "results": [["ok", "..."], ["error", "..."]]}
+    {"id": 4, "op": "undo", "action": "begin", "name": "..."}
+Requests are executed in arrival order. "post" is "exec" without a response
+and is used for fire-and-forget traffic such as object frees.
+"""
+
+import json
+import os
+import secrets
+import socket
+import struct
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+from bridge_transport import InProcessTransport, NoTransport, Transport, TransportError
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 5890
+
+# Connection details written by serve() and read by connect() without arguments
+REMOTE_FILE = Path.home() / "Documents" / "AEPython" / "remote.json"
+
+# Seconds TransportServer.stop() waits for its accept thread
+STOP_TIMEOUT = 5.0
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME = 256 * 1024 * 1024
+
+
+def _send_frame(sock, message: dict):
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock) -> dict:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > MAX_FRAME:
+        raise TransportError(f"Frame of {size} bytes exceeds the {MAX_FRAME} byte limit")
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+def parse_address(address):
+    """"tcp://host:port", "host:port", port or "unix:///path" -> (family, sockaddr)."""
+    if isinstance(address, int):
+        return socket.AF_INET, ("127.0.0.1", address)
+    if isinstance(address, tuple):
+        return socket.AF_INET, address
+    if address.startswith("unix://"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise TransportError("Unix sockets are not available on this platform")
+        return socket.AF_UNIX, address[len("unix://"):]
+    if address.startswith("tcp://"):
+        address = address[len("tcp://"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class SocketTransport(Transport):
+    """
+    Client side of the socket protocol.
+
+    submit() sends a request and returns a Future without waiting, so
+    several requests can be in flight; a reader thread resolves the futures
+    as responses arrive. execute() is submit().result().
+    """
+
+    def __init__(self, address=DEFAULT_PORT, token: str = None, timeout: float = None):
+        family, sockaddr = parse_address(address)
+        self.address = address
+        self.timeout = timeout
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.connect(sockaddr)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._next_id = 0
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="AEPython transport reader", daemon=True)
+        self._reader.start()
+        self.server_info = self._wait(self._request({"op": "hello", "token": token, "version": PROTOCOL_VERSION}), timeout)
+
+    # -- framing -------------------------------------------------------------
+
+    def _request(self, message: dict, expect_reply: bool = True) -> Future:
+        future = Future()
+        with self._send_lock:
+            if self._closed:
+                raise TransportError("Transport is closed")
+            self._next_id += 1
+            message["id"] = future.request_id = self._next_id
+            if expect_reply:
+                self._pending[self._next_id] = future
+            else:
+                future.set_result(None)
+            try:
+                _send_frame(self._sock, message)
+            except OSError as e:
+                self._pending.pop(self._next_id, None)
+                raise TransportError(f"Lost connection to {self.address}: {e}")
+        return future
+
+    def _wait(self, future: Future, timeout: float = None):
+        """future.result(timeout); on timeout the request is given up and its late reply dropped."""
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self._pending.pop(future.request_id, None)
+            raise
+
+    def _read_loop(self):
+        error = TransportError(f"Connection to {self.address} closed")
+        try:
+            while True:
+                message = _recv_frame(self._sock)
+                future = self._pending.pop(message.get("id"), None)
+                if future is None:
+                    # Reply to a request given up after a timeout
+                    continue
+                if "error" in message:
+                    future.set_exception(_remote_error(message["error"]))
+                elif "results" in message:
+                    future.set_result([r if status == "ok" else _remote_error(r) for status, r in message["results"]])
+                else:
+                    future.set_result(message.get("result"))
+        except (EOFError, OSError, ValueError, TransportError) as e:
+            if not self._closed:
+                error = TransportError(f"Connection to {self.address} lost: {e}")
+        finally:
+            self._closed = True
+            for future in list(self._pending.values()):
+                future.set_exception(error)
+            self._pending.clear()
+
+    # -- Transport -----------------------------------------------------------
+
+    def submit(self, code: str) -> Future:
+        """Send a script without waiting; the Future resolves to its result string."""
+        return self._request({"op": "exec", "code": code})
+
+    def execute(self, code: str) -> str:
+        return self._wait(self.submit(code), self.timeout)
+
+    def execute_many(self, codes: list) -> list:
+        """Run several scripts in one frame and one network round trip."""
+        if not codes:
+            return []
+        return self._wait(self._request({"op": "batch", "codes": list(codes)}), self.timeout)
+
+    def post(self, code: str):
+        # Frees of a closed session are dropped, not raised from __del__
+        try:
+            self._request({"op": "post", "code": code}, expect_reply=False)
+        except TransportError:
+            pass
+
+    def start_undo_group(self, name: str):
+        self._wait(self._request({"op": "undo", "action": "begin", "name": name}), self.timeout)
+
+    def end_undo_group(self):
+        self._wait(self._request({"op": "undo", "action": "end"}), self.timeout)
+
+    def close(self):
+        with self._send_lock:
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def __repr__(self) -> str:
+        return f"SocketTransport({self.address!r})"
+
+
+def _remote_error(message: str) -> Exception:
+    # The in-process host raises a plain Exception too
+    return Exception(message)
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class TransportServer:
+    """
+    Serves an _AEPython-compatible host module over a socket.
+
+    Each connection gets a thread that reads frames and answers them in
+    order. invoke(fn) runs fn on the thread allowed to touch the host and
+    returns its result; the default calls fn directly, which suits
+    thread-agnostic hosts such as the emulator. Inside After Effects use
+    qt_invoke so scripts run on AE's main thread.
+    """
+
+    def __init__(self, host_module, address=DEFAULT_PORT, token: str = None, invoke=None):
+        self.host = host_module
+        self.token = token
+        self.invoke = invoke or self._invoke_locked
+        self._lock = threading.Lock()
+        family, sockaddr = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(sockaddr)
+        self._server.listen()
+        self.address = self._server.getsockname()
+        self._family = family
+        self._connections = set()
+        self._running = False
+        self._thread = None
+
+    def _invoke_locked(self, fn):
+        # Connections have their own threads; the host sees one call at a time
+        with self._lock:
+            return fn()
+
+    @property
+    def url(self) -> str:
+        if self._family == socket.AF_INET:
+            return f"tcp://{self.address[0]}:{self.address[1]}"
+        return f"unix://{self.address}"
+
+    def start(self) -> "TransportServer":
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name="AEPython transport server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._running = True
+        self._accept_loop()
+
+    def stop(self):
+        self._running = False
+        # close() alone does not wake a thread blocked in accept() on Linux/macOS
+        try:
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        for conn in list(self._connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            # Daemon thread: never hang the caller if accept() stays blocked
+            self._thread.join(STOP_TIMEOUT)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            if self._family == socket.AF_INET:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.add(conn)
+            threading.Thread(target=self._serve_connection, args=(conn,), name="AEPython transport connection",
+                             daemon=True).start()
+
+    def _serve_connection(self, conn):
+        authorized = False
+        try:
+            while True:
+                message = _recv_frame(conn)
+                op = message.get("op")
+                if op == "hello":
+                    if self.token is not None and not secrets.compare_digest(str(message.get("token")), self.token):
+                        _send_frame(conn, {"id": message.get("id"), "error": "Invalid token"})
+                        break
+                    authorized = True
+                    _send_frame(conn, {"id": message.get("id"), "result": {
+                        "version": PROTOCOL_VERSION,
+                        "plugin_path": self.host.getPluginPath(),
+                        "pid": os.getpid(),
+                    }})
+                    continue
+                if not authorized:
+                    _send_frame(conn, {"id": message.get("id"), "error": "Handshake required"})
+                    break
+                reply = self._handle(message)
+                if reply is not None:
+                    _send_frame(conn, reply)
+        except (EOFError, OSError, ValueError, TransportError):
+            pass
+        finally:
+            self._connections.discard(conn)
+            conn.close()
+
+    def _handle(self, message: dict):
+        op = message.get("op")
+        reply = {"id": message.get("id")}
+        try:
+            if op == "exec":
+                reply["result"] = self.invoke(lambda: self.host.executeScript(message["code"]))
+            elif op == "post":
+                try:
+                    self.invoke(lambda: self.host.executeScript(message["code"]))
+                except Exception:
+                    pass
+                return None
+            elif op == "batch":
+                reply["results"] = self.invoke(lambda: self._run_batch(message["codes"]))
+            elif op == "undo":
+                if message.get("action") == "begin":
+                    self.invoke(lambda: self.host.startUndoGroup(message.get("name", "")))
+                else:
+                    self.invoke(self.host.endUndoGroup)
+                reply["result"] = None
+            else:
+                reply["error"] = f"Unknown op {op!r}"
+        except Exception as e:
+            reply["error"] = str(e)
+        return reply
+
+    def _run_batch(self, codes: list) -> list:
+        results = []
+        for code in codes:
+            try:
+                results.append(["ok", self.host.executeScript(code)])
+            except Exception as e:
+                results.append(["error", str(e)])
+        return results
+
+
+def qt_invoke():
+    """
+    Return an invoke(fn) that runs fn on the Qt main thread and waits for
+    it. Must be called on the main thread (it creates the receiving QObject).
+    """
+    from PySide6 import QtCore
+
+    class Invoker(QtCore.QObject):
+        request = QtCore.Signal(object)
+
+        def __init__(self):
+            super().__init__()
+            self.request.connect(self._run, QtCore.Qt.ConnectionType.QueuedConnection)
+
+        def _run(self, job):
+            fn, done, box = job
+            try:
+                box.append(("ok", fn()))
+            except BaseException as e:
+                box.append(("error", e))
+            finally:
+                done.set()
+
+    invoker = Invoker()
+
+    def invoke(fn):
+        if threading.current_thread() is threading.main_thread():
+            return fn()
+        done, box = threading.Event(), []
+        invoker.request.emit((fn, done, box))
+        done.wait()
+        status, value = box[0]
+        if status == "error":
+            raise value
+        return value
+
+    invoke.invoker = invoker
+    return invoke
+
+
+_server = None
+
+
+def serve(address=("127.0.0.1", DEFAULT_PORT), token: str = None, host_module=None, invoke=None,
+          write_remote_file: bool = True) -> TransportServer:
+    """
+    Start accepting remote connections to this AE session.
+
+    A random token is generated unless one is given; it is written with the
+    address to Documents/AEPython/remote.json for ae.connect().
+    """
+    global _server
+    if _server is not None:
+        return _server
+    if host_module is None:
+        import _AEPython as host_module
+        invoke = invoke or qt_invoke()
+    token = token or secrets.token_hex(16)
+    _server = TransportServer(host_module, address, token, invoke).start()
+    if write_remote_file:
+        REMOTE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        REMOTE_FILE.write_text(json.dumps({"address": _server.url, "token": token}), encoding="utf-8")
+    return _server
+
+
+def stop_serving():
+    """Stop the server started by serve()."""
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+        if REMOTE_FILE.exists():
+            REMOTE_FILE.unlink()
+
+
+def connect(address=None, token: str = None, timeout: float = None) -> SocketTransport:
+    """Connect to a serving AE session; defaults come from remote.json."""
+    if address is None:
+        if not REMOTE_FILE.exists():
+            raise TransportError(f"No address given and {REMOTE_FILE} not found: is AE serving?")
+        info = json.loads(REMOTE_FILE.read_text(encoding="utf-8"))
+        address = info["address"]
+        token = token or info.get("token")
+    return SocketTransport(address, token, timeout)
@@ -2,21 +2,47 @@
 
 Python.execFile = function (path) {
     const file = new File(path);
-    if (file.exist == false) {
+    if (file.exists == false) {
         alert(file.fsName + " not found.");
         return;
     }
 
-    if (file.open("r") == false) {
-        alert("Failed to open " + file.fsName);
-        return;
+    // Read and compiled on the Python side, once per file version (code_cache.py);
+    // the traceback of a failing script is already in the Python console
+    try {
+        Python.runFile(file.fsName);
+    } catch (e) {
+        // Not a Python error (e.g. a plugin without runFile): let it through
+        if (e.pythonType === undefined) {
+            throw e;
+        }
     }
-    const code = file.read();
-    file.close();
+}
 
-    Python.exec("__file__ = r'" + file.fsName + "'");
-    Python.exec(code);
-    Python.exec("del __file__");
+// Call callback(value, error) once a Python.submit() job has ended, polling
+// it every interval ms (default 100) from app.scheduleTask
+Python.onResult = function (id, callback, interval) {
+    __AEPython_jobCallbacks[id] = callback;
+    __AEPython_pollJob(id, interval || 100);
+}
+
+__AEPython_jobCallbacks = {}
+
+function __AEPython_pollJob(id, interval) {
+    if (Python.poll(id) == "running") {
+        app.scheduleTask("__AEPython_pollJob(" + id + ", " + interval + ")", interval, false);
+        return;
+    }
+    const callback = __AEPython_jobCallbacks[id];
+    delete __AEPython_jobCallbacks[id];
+    var value = undefined;
+    var error = null;
+    try {
+        value = Python.result(id);
+    } catch (e) {
+        error = e;
+    }
+    callback(value, error);
 }
 
 __AEPython_objects = {}
@@ -35,12 +61,11 @@ function __AEPython_executeScript(code) {
 
     const type = typeof (ret);
     if (type == "object" || type == "function") {
-        __AEPython_objects_count = Math.round(__AEPython_objects_count + 1);
-        __AEPython_objects[__AEPython_objects_count] = ret;
+        const id = __AEPython_register(ret);
         if (type == "object"){
-            return [type, ret.constructor.name, __AEPython_objects_count];
+            return [type, ret.constructor.name, id];
         }else{
-            return [type, null, __AEPython_objects_count];
+            return [type, null, id];
         }
     } else {
         return [type, ret];
@@ -69,3 +94,76 @@ function __AEPython_callObject(id, _args) {
 
     return eval(code);
 }
+
+
+function __AEPython_register(obj) {
+    __AEPython_objects_count = Math.round(__AEPython_objects_count + 1);
+    __AEPython_objects[__AEPython_objects_count] = obj;
+    return __AEPython_objects_count;
+}
+
+function __AEPython_quote(str) {
+    return '"' + str.replace(/[\\"\u0000-\u001f\u2028\u2029]/g, function (c) {
+        if (c == '"' || c == "\\") { return "\\" + c; }
+        return "\\u" + ("0000" + c.charCodeAt(0).toString(16)).slice(-4);
+    }) + '"';
+}
+
+// Serialize a value to JSON in one pass. Plain values are copied, AE objects
+// are registered in __AEPython_objects and travel as {"__es_object__": [type, class, id]}.
+function __AEPython_toJSON(value) {
+    if (value === null || value === undefined) { return "null"; }
+
+    const type = typeof (value);
+    if (type == "boolean") { return value ? "true" : "false"; }
+    if (type == "number") { return isFinite(value) ? String(value) : "null"; }
+    if (type == "string") { return __AEPython_quote(value); }
+
+    if (value instanceof Array) {
+        var items = [];
+        for (var i = 0; i < value.length; i++) {
+            items.push(__AEPython_toJSON(value[i]));
+        }
+        return "[" + items.join(",") + "]";
+    }
+
+    if (type == "object" && value.constructor === Object) {
+        var members = [];
+        for (var key in value) {
+            if (value.hasOwnProperty(key)) {
+                members.push(__AEPython_quote(key) + ":" + __AEPython_toJSON(value[key]));
+            }
+        }
+        return "{" + members.join(",") + "}";
+    }
+
+    const id = __AEPython_register(value);
+    const className = type == "object" ? __AEPython_quote(value.constructor.name) : "null";
+    return '{"__es_object__":[' + __AEPython_quote(type) + "," + className + "," + id + "]}";
+}
+
+// Read a dotted attribute path, stopping at the first null/undefined link.
+function __AEPython_get(obj, path) {
+    for (var i = 0; i < path.length; i++) {
+        if (obj === null || obj === undefined) { return undefined; }
+        obj = obj[path[i]];
+    }
+    return obj;
+}
+
+function __AEPython_contains(container, item) {
+    if (container === null || container === undefined) { return false; }
+    if (typeof (container) == "string") { return container.indexOf(item) != -1; }
+    for (var i = 0; i < container.length; i++) {
+        if (container[i] === item) { return true; }
+    }
+    return false;
+}
+
+function __AEPython_startsWith(str, prefix) {
+    return typeof (str) == "string" && str.substring(0, prefix.length) == prefix;
+}
+
+function __AEPython_endsWith(str, suffix) {
+    return typeof (str) == "string" && str.length >= suffix.length && str.substring(str.length - suffix.length) == suffix;
+}
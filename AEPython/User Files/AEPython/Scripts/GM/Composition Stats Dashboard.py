@@ -73,7 +73,7 @@ class CompDashboard(QtWidgets.QDialog):
         
         # Layer stats
         total_layers = comp.numLayers
-        selected = len(comp.selectedLayers)
+        selected = comp.layers.where(selected=True).count()
         
         # Count layer types
         video_layers = 0
@@ -83,10 +83,8 @@ class CompDashboard(QtWidgets.QDialog):
         camera_layers = 0
         light_layers = 0
         
-        for i in range(1, total_layers + 1):
-            layer = comp.layer(i)
-            match_name = layer.matchName
-            
+        # One round trip for all match names instead of two per layer
+        for match_name in comp.layers.values("matchName"):
             if "Text" in match_name:
                 text_layers += 1
             elif "Shape" in match_name:
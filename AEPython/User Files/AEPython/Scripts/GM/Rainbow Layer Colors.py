@@ -105,7 +105,7 @@ class RainbowColors(QtWidgets.QDialog):
             return
         
         ae.app.beginUndoGroup("Reset Colors")
-        for layer in comp.selectedLayers:
+        for layer in comp.layers.where(selected=True, label__ne=0):
             layer.label = 0
         ae.app.endUndoGroup()
         print("✓ Reset layer colors")
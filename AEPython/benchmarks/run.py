@@ -0,0 +1,214 @@
+"""
+AEPython bridge benchmarks
+
+Runs the workloads in workloads.py against the in-process host emulator and
+reports, per workload, wall time, bridge round trips, simulated host time
+(round trips x --latency) and peak Python memory as JSON.
+
+Usage:
+    python benchmarks/run.py                          # all workloads, JSON to stdout
+    python benchmarks/run.py -o baseline.json         # store a baseline
+    python benchmarks/run.py --baseline baseline.json # compare, exit 1 on regression
+    python benchmarks/run.py -w rename_layers -w sort_layers --scale 0.1
+
+Round trips are deterministic and any increase counts as a regression. Wall
+time and peak memory regress when they grow by more than --tolerance.
+Workloads whose requirements (e.g. PySide6) are missing are reported as
+skipped.
+"""
+
+import argparse
+import functools
+import gc
+import importlib.util
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent / "Plug-ins AE" / "AEPython"
+EMULATOR_DIR = Path(__file__).resolve().parent.parent / "emulator"
+sys.path[:0] = [str(PLUGIN_DIR), str(EMULATOR_DIR)]
+
+import ae_emulator  # noqa: E402
+
+ae_emulator.install()
+
+from workloads import WORKLOADS  # noqa: E402
+
+
+# Metrics compared against a baseline: name -> exact (no tolerance)
+METRICS = {"round_trips": True, "wall_time": False, "peak_memory": False}
+
+
+class _Discard:
+    def write(self, text):
+        pass
+
+
+@functools.cache
+def _pyside_drops_none() -> bool:
+    """
+    Whether this PySide6 build loses a reference to None on every call of a
+    void method (seen with PySide6 6.12 on Python 3.11). Painting a long list
+    then deallocates None and aborts the interpreter; from Python 3.12 on,
+    None is immortal and the count does not move.
+    """
+    from PySide6 import QtCore
+
+    probe = QtCore.QObject()
+    before = sys.getrefcount(None)
+    for _ in range(100):
+        probe.setObjectName("probe")
+    return sys.getrefcount(None) < before - 50
+
+
+def _missing(requires: tuple) -> list:
+    missing = [name for name in requires if importlib.util.find_spec(name) is None]
+    if "PySide6" in requires and "PySide6" not in missing and _pyside_drops_none():
+        missing.append(f"a PySide6 build that keeps None's reference count on Python {platform.python_version()}")
+    return missing
+
+
+def measure(workload, size: int, latency: float, seed: int, trace_memory: bool) -> dict:
+    """Run one workload on a fresh emulated host and return its metrics."""
+    host = ae_emulator.install(ae_emulator.Emulator(latency=latency, seed=seed, stdout=_Discard()))
+    steps = workload.fn(host, size)
+    run = next(steps)
+    try:
+        gc.collect()
+        host.reset_stats()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        wall_time = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    round_trips, host_time = host.round_trips, host.clock
+    # Cleanup (and any checks) after the yield
+    for _ in steps:
+        pass
+    return {
+        "wall_time": wall_time,
+        "round_trips": round_trips,
+        "host_time": host_time,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_workload(workload, args) -> dict:
+    missing = _missing(workload.requires)
+    if missing:
+        return {"skipped": f"requires {', '.join(missing)}"}
+
+    size = max(1, int(workload.size * args.scale))
+    runs = [measure(workload, size, args.latency, args.seed, False) for _ in range(args.repeat)]
+    best = min(runs, key=lambda r: r["wall_time"])
+    result = {"size": size, **best}
+    result["peak_memory"] = (
+        measure(workload, size, args.latency, args.seed, True)["peak_memory"] if args.memory else None
+    )
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return (workload, metric, baseline, current, ratio, regressed) rows."""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or "skipped" in current or "skipped" in before:
+            continue
+        if before.get("size") != current.get("size"):
+            continue
+        for metric, exact in METRICS.items():
+            old, new = before.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            ratio = new / old if old else (1.0 if new == old else float("inf"))
+            regressed = new > old if exact else ratio > 1 + tolerance
+            rows.append((name, metric, old, new, ratio, regressed))
+    return rows
+
+
+def _format_value(metric: str, value) -> str:
+    if metric == "wall_time":
+        return f"{value * 1000:.1f} ms"
+    if metric == "peak_memory":
+        return f"{value / 1024:.0f} KiB"
+    return str(value)
+
+
+def print_comparison(rows: list, file=sys.stderr):
+    print(f"{'workload':<22} {'metric':<12} {'baseline':>14} {'current':>14} {'change':>8}", file=file)
+    for name, metric, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<22} {metric:<12} {_format_value(metric, old):>14} {_format_value(metric, new):>14} "
+            f"{(ratio - 1) * 100:>+7.1f}%{flag}",
+            file=file,
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AEPython bridge benchmarks")
+    parser.add_argument("-w", "--workload", action="append", choices=sorted(WORKLOADS),
+                        help="run only this workload (repeatable)")
+    parser.add_argument("-o", "--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="compare against a stored results file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative growth of wall time and peak memory (default 0.2)")
+    parser.add_argument("--latency", type=float, default=0.0005,
+                        help="simulated seconds per round trip (default 0.0005)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every workload size")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per workload, best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="fixture random seed")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the extra traced run measuring peak memory")
+    parser.add_argument("--list", action="store_true", help="list workloads and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, workload in WORKLOADS.items():
+            print(f"{name:<22} {workload.size:>7}  {workload.description}")
+        return 0
+
+    results = {}
+    for name in args.workload or WORKLOADS:
+        print(f"{name}...", file=sys.stderr, flush=True)
+        results[name] = run_workload(WORKLOADS[name], args)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        rows = compare(results, baseline, args.tolerance)
+        print_comparison(rows)
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
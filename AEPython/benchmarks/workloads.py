@@ -0,0 +1,378 @@
+"""
+AEPython benchmark workloads
+
+Each workload is a generator registered with @workload(name, size). It gets
+a fresh emulated host and its size, builds its fixture, then yields the
+callable to time. Code after the yield is cleanup and is not measured.
+
+The workloads are written the way scripts in the Script Library talk to the
+bridge today, so a bridge change that saves round trips shows up here.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import AEPython as ae
+
+# Dev-only host emulator, not part of the plugin folder
+EMULATOR_DIR = str(Path(__file__).resolve().parent.parent / "emulator")
+
+
+@dataclass
+class Workload:
+    name: str
+    fn: object
+    size: int
+    requires: tuple = field(default_factory=tuple)
+    description: str = ""
+
+
+WORKLOADS = {}
+
+
+def workload(name: str, size: int, requires: tuple = ()):
+    """Register a workload generator fn(host, size)."""
+    def decorator(fn):
+        WORKLOADS[name] = Workload(name, fn, size, tuple(requires), (fn.__doc__ or "").strip())
+        return fn
+    return decorator
+
+
+def _active_comp():
+    return ae.app.project.activeItem
+
+
+# ---------------------------------------------------------------------------
+# Layers
+# ---------------------------------------------------------------------------
+
+@workload("iterate_layers", size=10_000)
+def iterate_layers(host, size):
+    """Fetch a handle to every layer of a comp, one index lookup each."""
+    host.add_comp("Layers", layers=size)
+
+    def run():
+        layers = _active_comp().layers
+        for i in range(1, layers.length + 1):
+            layers[i]
+    yield run
+
+
+@workload("read_fields", size=10_000)
+def read_fields(host, size):
+    """Read 5 fields of every layer through per-layer handles."""
+    host.add_comp("Layers", layers=size)
+
+    def run():
+        layers = _active_comp().layers
+        rows = []
+        for i in range(1, layers.length + 1):
+            layer = layers[i]
+            rows.append((layer.name, layer.index, layer.inPoint, layer.outPoint, layer.label))
+        return rows
+    yield run
+
+
+@workload("read_fields_batched", size=10_000)
+def read_fields_batched(host, size):
+    """Read 5 fields of every layer with one Collection.select() round trip."""
+    host.add_comp("Layers", layers=size)
+
+    def run():
+        return _active_comp().layers.select("name", "index", "inPoint", "outPoint", "label")
+    yield run
+
+
+@workload("rename_layers", size=2_000)
+def rename_layers(host, size):
+    """Rename every layer of a comp (unlocked fixture)."""
+    host.add_comp("Layers", layers=size, locked=0)
+
+    def run():
+        layers = _active_comp().layers
+        for i in range(1, layers.length + 1):
+            layers[i].name = f"Renamed {i:05d}"
+    yield run
+
+
+@workload("sort_layers", size=1_000)
+def sort_layers(host, size):
+    """Reorder a comp's layers by inPoint: one batched read, one move per layer."""
+    host.add_comp("Layers", layers=size, locked=0)
+
+    def run():
+        layers = _active_comp().layers
+        in_points = layers.values("inPoint")
+        handles = [layers[i] for i in range(1, len(in_points) + 1)]
+        for _, layer in sorted(zip(in_points, handles), key=lambda pair: pair[0]):
+            layer.moveToEnd()
+    yield run
+
+    comp = host.app.project.activeItem
+    in_points = [layer.inPoint for layer in comp.layers._items]
+    assert in_points == sorted(in_points), "sort_layers produced the wrong order"
+
+
+@workload("keyframe_read", size=200)
+def keyframe_read(host, size):
+    """Read time and value of every Position key of `size` layers with 10 keys each."""
+    host.add_comp("Keys", layers=size, keyframes=10)
+
+    def run():
+        comp = _active_comp()
+        keys = []
+        for i in range(1, comp.numLayers + 1):
+            position = comp.layer(i).transform.position
+            for k in range(1, position.numKeys + 1):
+                keys.append((position.keyTime(k), position.keyValue(k)))
+        return keys
+    yield run
+
+
+@workload("project_audit", size=2_000)
+def project_audit(host, size):
+    """Walk every project item; summarize each comp's layers with a select()."""
+    comps = 20
+    for c in range(comps):
+        host.add_comp(f"Comp {c + 1}", layers=size // comps)
+
+    def run():
+        project = ae.app.project
+        report = Counter()
+        for i in range(1, project.numItems + 1):
+            item = project.item(i)
+            report[item.typeName] += 1
+            if isinstance(item, ae.CompItem):
+                for row in item.layers.select("enabled", "locked", "matchName"):
+                    report["disabled"] += not row["enabled"]
+                    report["locked"] += row["locked"]
+                    report[row["matchName"]] += 1
+        return report
+    yield run
+
+
+# ---------------------------------------------------------------------------
+# UI-side workloads (no bridge traffic)
+# ---------------------------------------------------------------------------
+
+def _write_script_tree(root: Path, size: int, seed: int = 0):
+    """`size` scripts in 25 categories, some nested, plus a support package to skip."""
+    rnd = random.Random(seed)
+    for i in range(size):
+        folder = root / f"Category {i % 25:02d}"
+        if rnd.random() < 0.3:
+            folder = folder / f"Sub {i % 7}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"script_{i:05d}.py").write_text(f"# Script {i}\nprint({i})\n", encoding="utf-8")
+    package = root / "Category 00" / "support"
+    package.mkdir(parents=True, exist_ok=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "helpers.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+
+
+def _import_ui(name: str):
+    """Import a UI module offscreen, keeping the benchmark's own stdout/stderr."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    streams = sys.stdout, sys.stderr
+    try:
+        return __import__(name)
+    finally:
+        # qtae captures both streams until the console window exists
+        sys.stdout, sys.stderr = streams
+
+
+@workload("script_library_scan", size=5_000, requires=("PySide6",))
+def script_library_scan(host, size):
+    """Rescan a Script Library folder of `size` scripts with existing metadata."""
+    ScriptLibraryManager = _import_ui("script_library").ScriptLibraryManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "Scripts"
+        _write_script_tree(root, size)
+        manager = ScriptLibraryManager(Path(tmp) / "metadata.json", root)
+        manager.scan_scripts()
+        yield manager.scan_scripts
+
+
+@workload("script_index_refresh", size=6_000)
+def script_index_refresh(host, size):
+    """Load a saved index of `size` scripts and bring it up to date after one folder changed."""
+    from script_index import ScriptIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "Scripts"
+        cache = Path(tmp) / "script_index.json"
+        _write_script_tree(root, size)
+        index = ScriptIndex(root, cache)
+        index.refresh()
+        index.save()
+        counter = iter(range(10 ** 9))
+
+        def run():
+            (root / "Category 03" / f"new_{next(counter)}.py").write_text("pass\n", encoding="utf-8")
+            ScriptIndex(root, cache).refresh()
+        yield run
+
+
+@workload("script_library_list", size=10_000, requires=("PySide6",))
+def script_library_list(host, size):
+    """Load `size` scripts into the Script Library list, filter it twice and paint it."""
+    from types import SimpleNamespace
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtCore, QtWidgets
+    from script_list import ScriptFilterProxyModel, ScriptItemDelegate, ScriptListModel
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    rnd = random.Random(0)
+    words = ["fade", "wiggle", "render", "rename", "export", "import", "align", "text", "mask", "camera"]
+    scripts = [
+        SimpleNamespace(
+            script_id=f"Category {i % 25:02d}/script_{i:05d}.py", name=f"{rnd.choice(words)} script {i}",
+            description=" ".join(rnd.choice(words) for _ in range(8)), category=f"Category {i % 25:02d}",
+            tags=rnd.sample(words, 3), favorite=i % 50 == 0, file_path="",
+        )
+        for i in range(size)
+    ]
+    view = QtWidgets.QListView()
+    model = ScriptListModel(view)
+    proxy = ScriptFilterProxyModel(view)
+    proxy.setSourceModel(model)
+    view.setModel(proxy)
+    view.setItemDelegate(ScriptItemDelegate(view))
+    view.setUniformItemSizes(True)
+    view.resize(400, 600)
+    view.show()
+
+    def run():
+        model.set_scripts(scripts)
+        app.processEvents()
+        view.grab()
+        proxy.set_filter("fade mask")
+        view.grab()
+        proxy.set_filter("", "Category 03")
+        view.grab()
+    yield run
+
+    # Destroyed now (the model and proxy with it), not while the QApplication
+    # is torn down at exit
+    view.close()
+    view.deleteLater()
+    del view, model, proxy
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+
+@workload("console_output", size=100_000, requires=("PySide6",))
+def console_output(host, size):
+    """print() `size` lines into the Python Console's output view and render them."""
+    qtae = _import_ui("qtae")
+    from PySide6 import QtGui, QtWidgets
+    import console_output
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    logs = tempfile.TemporaryDirectory()
+    output = console_output.OutputView(log_dir=logs.name)
+    stdout = qtae.PythonWindow.Logger(output, QtGui.QColor("#d4d4d4"))
+    stderr = qtae.PythonWindow.Logger(output, QtGui.QColor("#f48771"))
+
+    def run():
+        for i in range(size):
+            print(f"line {i}: the quick brown fox jumps over the lazy dog", file=stderr if i % 100 == 0 else stdout)
+        output.flush()
+        app.processEvents()
+    yield run
+
+    assert output.document().blockCount() <= output.max_lines
+    output.spill.close()
+    logs.cleanup()
+    output.deleteLater()
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+
+@workload("qtae_import", size=1, requires=("PySide6",))
+def qtae_import(host, size):
+    """What AE pays at launch: a fresh interpreter importing AEPython and qtae (`size` times)."""
+    plugin_dir = Path(ae.__file__).resolve().parent
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=os.pathsep.join((str(plugin_dir), EMULATOR_DIR)))
+    code = "import ae_emulator; ae_emulator.install(); import AEPython; import qtae"
+
+    def run():
+        for _ in range(size):
+            subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+    yield run
+
+
+def _startup_layout(root: Path, layout: str) -> str:
+    """Lay the plugin modules out in root as "source", "pyc" or "zip"; returns the sys.path entry."""
+    import bundle
+    import compileall
+    import shutil
+
+    plugin_dir = Path(ae.__file__).resolve().parent
+    if layout == "zip":
+        return str(bundle.build(plugin_dir, root / bundle.BUNDLE_NAME))
+    for path, name in bundle.source_files(plugin_dir):
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, root / name)
+    if layout == "pyc":
+        compileall.compile_dir(str(root), quiet=1)
+    return str(root)
+
+
+def _startup_workload(layout: str):
+    def fn(host, size):
+        with tempfile.TemporaryDirectory() as tmp:
+            entry = _startup_layout(Path(tmp), layout)
+            # Like AE: bundle or folder after the stdlib, emulator found behind it
+            code = (f"import sys; sys.path += [{entry!r}, {EMULATOR_DIR!r}]; "
+                    "import ae_emulator; ae_emulator.install(); import AEPython; import qtae")
+            # Program Files: no __pycache__ written, the source layout recompiles every launch
+            env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1",
+                       HOME=tmp, USERPROFILE=tmp)
+            env.pop("PYTHONPATH", None)
+
+            def run():
+                for _ in range(size):
+                    subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+            yield run
+    return fn
+
+
+for _layout, _description in (
+    ("source", "loose .py files, compiled on every launch"),
+    ("pyc", "loose .py files with __pycache__ bytecode"),
+    ("zip", "the precompiled AEPython_modules.zip bundle"),
+):
+    _fn = _startup_workload(_layout)
+    _fn.__doc__ = f"Launch `size` interpreters importing AEPython and qtae from {_description}."
+    workload(f"startup_{_layout}", size=5, requires=("PySide6",))(_fn)
+
+
+@workload("console_window_build", size=1, requires=("PySide6",))
+def console_window_build(host, size):
+    """Build the Python Console window `size` times (deferred to its first opening)."""
+    qtae = _import_ui("qtae")
+    from PySide6 import QtWidgets
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    streams = sys.stdout, sys.stderr
+    windows = []
+
+    def run():
+        for _ in range(size):
+            windows.append(qtae.PythonWindow(None))
+        app.processEvents()
+    yield run
+
+    sys.stdout, sys.stderr = streams
+    for window in windows:
+        window.deleteLater()
@@ -0,0 +1,275 @@
+"""
+AEPython host emulator
+
+A pure-Python stand-in for the embedded _AEPython module. executeScript() runs
+the real Scripts AE/Startup/AEPython.jsx dispatcher in es_interpreter against
+the synthetic object model in ae_model, so the bridge, the samples and the
+batching features run without After Effects (e.g. on a Linux CI box).
+
+Example:
+    import ae_emulator
+
+    host = ae_emulator.install(latency=0.002)     # before `import AEPython`
+    comp = host.add_comp("Main", layers=500, keyframes=4)
+
+    import AEPython as ae
+    names = ae.app.project.activeItem.layers.values("name")
+
+    host.round_trips    # -> 1
+    host.clock          # -> 0.002 simulated seconds spent in the host
+
+Latency is simulated per round trip. By default it only advances host.clock,
+which keeps benchmarks deterministic; realtime=True sleeps instead.
+
+The emulator is a development tool and is not part of the release. Importing
+it puts the plugin folder on sys.path (after existing entries), so AEPython
+and the other plugin modules import as they do inside AE.
+
+Example (local stand-in server for ae.connect(), e.g. for tests):
+    python emulator/ae_emulator.py --port 5890
+"""
+
+import os
+import random
+import sys
+import time
+import traceback
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PLUGIN_DIR = os.path.normpath(os.path.join(ROOT, "Plug-ins AE", "AEPython"))
+DEFAULT_JSX_PATH = os.path.normpath(os.path.join(ROOT, "Scripts AE", "Startup", "AEPython.jsx"))
+
+if PLUGIN_DIR not in sys.path:
+    sys.path.append(PLUGIN_DIR)
+
+import ae_model  # noqa: E402
+import es_interpreter as es  # noqa: E402
+from bridge_transport import InProcessTransport  # noqa: E402
+
+
+class ExecuteScriptError(Exception):
+    """Raised by executeScript() when the script throws, like the real host."""
+
+    def __init__(self, message: str = ""):
+        super().__init__("ExecuteScriptError")
+        self.message = message
+
+
+class Emulator:
+    """
+    One emulated After Effects session: an ES global environment with the
+    dispatcher loaded, an Application model and round-trip accounting.
+    """
+
+    def __init__(self, latency: float = 0.0, realtime: bool = False, jsx_path: str = None,
+                 plugin_path: str = None, seed: int = 0, stdout=None):
+        self.latency = latency
+        self.realtime = realtime
+        self.round_trips = 0
+        self.clock = 0.0
+        self.alerts = []
+        self.random = random.Random(seed)
+        self.plugin_path = plugin_path or os.path.join(PLUGIN_DIR, "AEPython.aex")
+        self.locals = {}
+        self.app = ae_model.Application()
+        self.interpreter = es.Interpreter(stdout=stdout)
+        self.python_globals = {"__name__": "__main__", "__builtins__": __builtins__, "sys": sys, "os": os}
+        self.module = self._make_module()
+        self.python_globals["_AEPython"] = self.module
+        self._define_globals()
+        self.load_script(jsx_path or DEFAULT_JSX_PATH)
+
+    # -----------------------------------------------------------------------
+    # Setup
+    # -----------------------------------------------------------------------
+
+    def _make_module(self) -> types.ModuleType:
+        module = types.ModuleType("_AEPython", "Emulated AEPython host module")
+        module.executeScript = self.executeScript
+        module.getPluginPath = lambda: self.plugin_path
+        module.getMainHWND = lambda: 0
+        module.startUndoGroup = self.app.beginUndoGroup
+        module.endUndoGroup = self.app.endUndoGroup
+        module.locals = self.locals
+        module.emulator = self
+        return module
+
+    def _define_globals(self):
+        interpreter = self.interpreter
+        interpreter.define("app", self.app)
+        interpreter.define("system", ae_model.System())
+        for name, values in ae_model.ENUMS.items():
+            interpreter.define(name, values)
+        for cls in ae_model.CLASSES:
+            interpreter.define_class(cls)
+
+        interpreter.define_function("alert", self._alert)
+        interpreter.define_function("confirm", lambda message=None, *args: True)
+        interpreter.define_function("prompt", lambda message=None, default="", *args: default)
+        interpreter.define_function("writeLn", lambda *args: interpreter._write(" ".join(map(str, args)) + "\n"))
+        interpreter.define_function("clearOutput", lambda: None)
+        interpreter.define_function("isValid", lambda obj: obj is not None and not getattr(obj, "_removed", False))
+
+        interpreter.define("BridgeTalk", es.JSObject(es.ObjectPrototype, {
+            "appName": "aftereffects",
+            "getAppPath": es.NativeFunction("getAppPath", lambda this, args: os.path.dirname(self.plugin_path)),
+        }))
+        interpreter.globals["ExternalObject"] = es.NativeFunction(
+            "ExternalObject", lambda this, args: es.UNDEFINED, construct=self._external_object,
+        )
+
+    def _external_object(self, args):
+        """new ExternalObject("lib:.../AEPython.aex"): the Python object of the C++ plugin."""
+        def script_function(name, call):
+            # Returned as kTypeScript: ExtendScript evaluates the source jsx_api wrote
+            return es.NativeFunction(name, lambda this, args: self.interpreter.run(call(*args)))
+
+        def jsx_api():
+            import jsx_api
+            return jsx_api
+
+        return es.JSObject(es.ObjectPrototype, {
+            "exec": es.NativeFunction("exec", lambda this, args: self.exec_python(es.to_string(args[0]))),
+            "runFile": script_function("runFile", lambda path, *_: jsx_api().run_file(
+                es.to_string(path), self.python_globals, self.locals)),
+            "eval": script_function("eval", lambda expression, *_: jsx_api().evaluate(
+                es.to_string(expression), self.python_globals, self.locals)),
+            "submit": script_function("submit", lambda code, *_: jsx_api().submit(es.to_string(code))),
+            "poll": script_function("poll", lambda job_id, *_: jsx_api().poll(int(es.to_number(job_id)))),
+            "result": script_function("result", lambda job_id, *_: jsx_api().result(int(es.to_number(job_id)))),
+        })
+
+    def _alert(self, message=None, *args):
+        self.alerts.append(es.to_string(message))
+
+    def load_script(self, path: str):
+        """Run an ExtendScript file in the global scope, like a Startup script."""
+        with open(path, encoding="utf-8-sig") as f:
+            self.interpreter.run(f.read())
+
+    # -----------------------------------------------------------------------
+    # _AEPython interface
+    # -----------------------------------------------------------------------
+
+    def exec_python(self, code: str):
+        """Python.exec(code) as called from ExtendScript."""
+        try:
+            exec(code, self.python_globals, self.locals)
+        except Exception:
+            traceback.print_exc()
+        return es.UNDEFINED
+
+    def executeScript(self, code: str) -> str:
+        """Evaluate ExtendScript and return its result as a string, like AEGP_ExecuteScript."""
+        self.round_trips += 1
+        if self.latency:
+            if self.realtime:
+                time.sleep(self.latency)
+            else:
+                self.clock += self.latency
+        try:
+            ret = self.interpreter.run(code)
+        except es.JSThrow as e:
+            raise ExecuteScriptError(str(e))
+        except RecursionError:
+            raise ExecuteScriptError("Stack overrun")
+        if ret is es.UNDEFINED:
+            return ""
+        return es.to_string(ret)
+
+    def reset_stats(self):
+        """Zero the round-trip counter and the simulated clock."""
+        self.round_trips = 0
+        self.clock = 0.0
+
+    # -----------------------------------------------------------------------
+    # Fixtures
+    # -----------------------------------------------------------------------
+
+    def add_comp(self, name: str = "Comp 1", layers: int = 0, keyframes: int = 0, width: int = 1920,
+                 height: int = 1080, duration: float = 10.0, frameRate: float = 25.0, locked: float = 0.05,
+                 active: bool = True):
+        """
+        Add a composition with `layers` deterministic layers (a mix of solids,
+        text, shapes and nulls with varied in points, labels and flags) and
+        `keyframes` position keys on each. About `locked` of the layers are
+        locked. It becomes the active item.
+        """
+        comp = self.app.project.items.addComp(name, width, height, 1, duration, frameRate)
+        rnd = self.random
+        for i in range(layers):
+            kind = i % 4
+            if kind == 0:
+                layer = comp.layers.addSolid([rnd.random(), rnd.random(), rnd.random()], f"Solid {i + 1}",
+                                             width, height, 1)
+            elif kind == 1:
+                layer = comp.layers.addText(f"Text {i + 1}")
+            elif kind == 2:
+                layer = comp.layers.addShape()
+                layer.name = f"Shape {i + 1}"
+            else:
+                layer = comp.layers.addNull()
+                layer.name = f"Null {i + 1}"
+            layer.inPoint = round(rnd.uniform(0, duration / 2), 2)
+            layer.outPoint = round(rnd.uniform(layer.inPoint + 0.5, duration), 2)
+            layer.label = rnd.randint(0, 16)
+            layer.selected = rnd.random() < 0.1
+            position = layer.property("ADBE Transform Group").property("ADBE Position")
+            for k in range(keyframes):
+                position.setValueAtTime(k * duration / keyframes,
+                                        [rnd.uniform(0, width), rnd.uniform(0, height), 0])
+            layer.locked = rnd.random() < locked
+        if active:
+            self.app.project._active_item = comp
+        return comp
+
+    def set_active_item(self, item):
+        self.app.project._active_item = item
+
+
+def install(emulator: Emulator = None, **kwargs) -> Emulator:
+    """
+    Register an emulator as the _AEPython module and return it.
+
+    Call before `import AEPython`; if AEPython is already imported its host
+    module is swapped too. kwargs are passed to Emulator().
+    """
+    emulator = emulator or Emulator(**kwargs)
+    sys.modules["_AEPython"] = emulator.module
+    if "AEPython" in sys.modules:
+        sys.modules["AEPython"].set_transport(InProcessTransport(emulator.module))
+    return emulator
+
+
+def uninstall():
+    """Remove the emulated _AEPython module."""
+    module = sys.modules.get("_AEPython")
+    if getattr(module, "emulator", None) is not None:
+        del sys.modules["_AEPython"]
+
+
+def main(argv=None) -> int:
+    import argparse
+    import transport
+
+    parser = argparse.ArgumentParser(description="Local AEPython transport server backed by the emulator")
+    parser.add_argument("--address", default=None, help="tcp://host:port or unix:///path")
+    parser.add_argument("--port", type=int, default=transport.DEFAULT_PORT)
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--layers", type=int, default=100, help="layers in the emulated active comp")
+    args = parser.parse_args(argv)
+
+    host = Emulator()
+    host.add_comp("Comp 1", layers=args.layers)
+    server = transport.TransportServer(host.module, args.address or ("127.0.0.1", args.port), args.token)
+    print(f"Serving emulated After Effects on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1421 @@
+"""
+AEPython synthetic After Effects object model
+
+A small in-memory After Effects DOM (project, items, comps, layers, property
+groups, properties and keyframes) exposed to es_interpreter as host objects.
+ae_emulator puts it behind the AEPython.jsx dispatcher; it can also be
+driven directly from Python to set up fixtures.
+
+Example:
+    from ae_model import Application
+
+    app = Application()
+    comp = app.project.items.addComp("Main", 1920, 1080, 1, 10, 25)
+    solid = comp.layers.addSolid([1, 0, 0], "Red", 1920, 1080, 1)
+    solid.property("ADBE Transform Group").property("ADBE Position").setValueAtTime(1, [0, 0, 0])
+
+Names, matchNames, collection indexing (1-based) and the behaviours scripts
+usually trip over (locked layers, properties with keyframes, removed objects)
+follow After Effects. Rendering, expressions and footage decoding are not
+modelled: values are stored, never computed.
+"""
+
+import copy
+import itertools
+
+from es_interpreter import HostObject, JSThrow, UNDEFINED, make_error
+
+
+# ---------------------------------------------------------------------------
+# Enumerations (same numeric values as After Effects)
+# ---------------------------------------------------------------------------
+
+PropertyType = {"PROPERTY": 6212, "NAMED_GROUP": 6213, "INDEXED_GROUP": 6214}
+
+PropertyValueType = {
+    "NO_VALUE": 6412, "ThreeD_SPATIAL": 6413, "ThreeD": 6414, "TwoD_SPATIAL": 6415, "TwoD": 6416,
+    "OneD": 6417, "COLOR": 6418, "CUSTOM_VALUE": 6419, "MARKER": 6420, "LAYER_INDEX": 6421,
+    "MASK_INDEX": 6422, "SHAPE": 6423, "TEXT_DOCUMENT": 6424,
+}
+
+KeyframeInterpolationType = {"LINEAR": 6612, "BEZIER": 6613, "HOLD": 6614}
+
+LightType = {"PARALLEL": 4412, "SPOT": 4413, "POINT": 4414, "AMBIENT": 4415}
+
+ENUMS = {
+    "PropertyType": PropertyType,
+    "PropertyValueType": PropertyValueType,
+    "KeyframeInterpolationType": KeyframeInterpolationType,
+    "LightType": LightType,
+}
+
+_PVT = PropertyValueType
+_LINEAR = KeyframeInterpolationType["LINEAR"]
+_HOLD = KeyframeInterpolationType["HOLD"]
+
+
+def _error(message: str):
+    return JSThrow(make_error("Error", message))
+
+
+def _index(value) -> int:
+    return int(round(float(value)))
+
+
+# ---------------------------------------------------------------------------
+# Plain value objects
+# ---------------------------------------------------------------------------
+
+class TextDocument(HostObject):
+    def __init__(self, docText: str = ""):
+        self.text = "" if docText is None else str(docText)
+        self.font = "ArialMT"
+        self.fontSize = 36.0
+        self.fillColor = [1.0, 1.0, 1.0]
+        self.strokeColor = [0.0, 0.0, 0.0]
+        self.strokeWidth = 0.0
+        self.applyFill = True
+        self.applyStroke = False
+        self.justification = 7413
+        self.tracking = 0.0
+        self.leading = 43.0
+
+    @classmethod
+    def es_construct(cls, docText: str = ""):
+        return cls(docText)
+
+    def es_to_string(self) -> str:
+        return self.text
+
+
+class KeyframeEase(HostObject):
+    def __init__(self, speed: float = 0.0, influence: float = 16.666667):
+        self.speed = float(speed or 0.0)
+        self.influence = float(influence if influence is not None else 16.666667)
+
+    @classmethod
+    def es_construct(cls, speed=0.0, influence=16.666667):
+        return cls(speed, influence)
+
+
+class MarkerValue(HostObject):
+    def __init__(self, comment: str = "", chapter: str = "", url: str = "", frameTarget: str = "",
+                 cuePointName: str = "", params: dict = None):
+        self.comment = comment or ""
+        self.chapter = chapter or ""
+        self.url = url or ""
+        self.frameTarget = frameTarget or ""
+        self.cuePointName = cuePointName or ""
+        self.duration = 0.0
+        self.label = 0
+        self._params = dict(params or {})
+
+    @classmethod
+    def es_construct(cls, *args):
+        return cls(*args)
+
+    def getParameters(self) -> dict:
+        return dict(self._params)
+
+    def setParameters(self, params: dict):
+        self._params = dict(params or {})
+
+
+class Shape(HostObject):
+    def __init__(self):
+        self.vertices = []
+        self.inTangents = []
+        self.outTangents = []
+        self.closed = True
+        self.featherSegLocs = []
+        self.featherRelSegLocs = []
+        self.featherRadii = []
+
+    @classmethod
+    def es_construct(cls):
+        return cls()
+
+
+class File(HostObject):
+    def __init__(self, path: str = ""):
+        self.fsName = str(path or "")
+        self.name = self.fsName.replace("\\", "/").rsplit("/", 1)[-1]
+        self._handle = None
+
+    @classmethod
+    def es_construct(cls, path=""):
+        return cls(path)
+
+    @property
+    def exists(self) -> bool:
+        import os
+        return os.path.exists(self.fsName)
+
+    @property
+    def fullName(self) -> str:
+        return self.fsName.replace("\\", "/")
+
+    def open(self, mode: str = "r") -> bool:
+        try:
+            self._handle = open(self.fsName, {"r": "r", "w": "w", "a": "a", "e": "r+"}.get(mode, "r"),
+                                encoding="utf-8")
+        except OSError:
+            return False
+        return True
+
+    def read(self) -> str:
+        return self._handle.read() if self._handle else ""
+
+    def write(self, *text) -> bool:
+        if self._handle is None:
+            return False
+        self._handle.write("".join(str(t) for t in text))
+        return True
+
+    def close(self) -> bool:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        return True
+
+    def es_to_string(self) -> str:
+        return self.fullName
+
+
+class ImportOptions(HostObject):
+    def __init__(self, file: File = None):
+        self.file = file
+        self.sequence = False
+        self.forceAlphabetical = False
+        self.importAs = 3812
+
+    @classmethod
+    def es_construct(cls, file=None):
+        return cls(file)
+
+    def canImportAs(self, type) -> bool:
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Base classes
+# ---------------------------------------------------------------------------
+
+class ModelObject(HostObject):
+    """Common behaviour: removed objects raise when touched, like in AE."""
+    _removed = False
+
+    def es_get(self, key: str):
+        if self._removed and key != "constructor":
+            raise _error("Object is invalid")
+        return super().es_get(key)
+
+    def es_put(self, key: str, value):
+        if self._removed:
+            raise _error("Object is invalid")
+        super().es_put(key, value)
+
+
+class Collection(ModelObject):
+    """1-based collection (ItemCollection, LayerCollection, ...)."""
+
+    def __init__(self):
+        self._items = []
+
+    @property
+    def length(self) -> int:
+        return len(self._items)
+
+    def es_get(self, key: str):
+        if key.isdigit():
+            index = int(key)
+            if 1 <= index <= len(self._items):
+                return self._items[index - 1]
+            return UNDEFINED
+        return super().es_get(key)
+
+    def es_keys(self) -> list:
+        return [str(i) for i in range(1, len(self._items) + 1)]
+
+    def _item(self, index):
+        index = _index(index)
+        if not 1 <= index <= len(self._items):
+            raise _error(f"Index {index} out of range (1..{len(self._items)})")
+        return self._items[index - 1]
+
+
+# ---------------------------------------------------------------------------
+# Properties
+# ---------------------------------------------------------------------------
+
+class PropertyBase(ModelObject):
+    def __init__(self, matchName: str, name: str, attr: str = None):
+        self.matchName = matchName
+        self._name = name
+        self._attr = attr
+        self._parent = None
+        self.enabled = True
+        self.selected = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self.propertyType == PropertyType["PROPERTY"] or not isinstance(self._parent, PropertyGroup) \
+                or self._parent.propertyType != PropertyType["INDEXED_GROUP"]:
+            raise _error(f"Can not rename {self._name}: name is read-only")
+        self._name = str(value)
+
+    @property
+    def parentProperty(self):
+        return self._parent if isinstance(self._parent, PropertyBase) else None
+
+    @property
+    def propertyIndex(self) -> int:
+        if self._parent is None:
+            return 0
+        return self._parent._children.index(self) + 1
+
+    @property
+    def propertyDepth(self) -> int:
+        depth = 0
+        parent = self._parent
+        while isinstance(parent, PropertyBase):
+            depth += 1
+            parent = parent._parent
+        return depth + 1
+
+    @property
+    def active(self) -> bool:
+        return self.enabled
+
+    @property
+    def isModified(self) -> bool:
+        return False
+
+    def propertyGroup(self, countUp=1):
+        target = self
+        for _ in range(_index(countUp)):
+            target = target._parent
+            if target is None:
+                return None
+        return target
+
+    def _layer(self):
+        parent = self._parent
+        while isinstance(parent, PropertyBase):
+            parent = parent._parent
+        return parent
+
+    def _check_unlocked(self):
+        layer = self._layer()
+        if layer is not None and layer.locked:
+            raise _error(f"Can not modify {self._name}: layer '{layer.name}' is locked")
+
+    def _clone(self):
+        clone = copy.copy(self)
+        clone._parent = None
+        return clone
+
+
+class Property(PropertyBase):
+    propertyType = PropertyType["PROPERTY"]
+
+    def __init__(self, matchName: str, name: str, attr: str, value, valueType: int):
+        super().__init__(matchName, name, attr)
+        self._value = value
+        self.propertyValueType = valueType
+        self._keys = []
+        self.expression = ""
+        self.expressionEnabled = False
+        self.expressionError = ""
+        self.canSetExpression = valueType not in (_PVT["NO_VALUE"], _PVT["CUSTOM_VALUE"])
+        self.canVaryOverTime = valueType not in (_PVT["NO_VALUE"], _PVT["CUSTOM_VALUE"])
+        self.unitsText = ""
+        self.hasMin = False
+        self.hasMax = False
+        self.dimensionsSeparated = False
+
+    # -- values -------------------------------------------------------------
+
+    def _coerce(self, value):
+        if isinstance(value, (TextDocument, Shape, MarkerValue)):
+            return copy.deepcopy(value)
+        if isinstance(self._value, list):
+            if not isinstance(value, list):
+                raise _error(f"{self._name}: expected an array of {len(self._value)} values")
+            value = [float(v) for v in value]
+            if len(value) < len(self._value):
+                value = value + self._value[len(value):]
+            return value[:len(self._value)]
+        if isinstance(self._value, (int, float)) and not isinstance(self._value, bool):
+            if isinstance(value, list) or value is None:
+                raise _error(f"{self._name}: expected a number")
+            return float(value)
+        return value
+
+    @staticmethod
+    def _copy_out(value):
+        if isinstance(value, (list, TextDocument, Shape, MarkerValue)):
+            return copy.deepcopy(value)
+        return value
+
+    @property
+    def value(self):
+        if self._keys:
+            return self.valueAtTime(self._time(), False)
+        return self._copy_out(self._value)
+
+    def _time(self) -> float:
+        layer = self._layer()
+        comp = getattr(layer, "containingComp", None)
+        return comp.time if comp is not None else 0.0
+
+    def setValue(self, newValue):
+        self._check_unlocked()
+        if self._keys:
+            raise _error(f"Can not set value of {self._name}: property has keyframes; use setValueAtTime()")
+        self._value = self._coerce(newValue)
+
+    def valueAtTime(self, time, preExpression=False):
+        if not self._keys:
+            return self._copy_out(self._value)
+        time = float(time)
+        keys = self._keys
+        if time <= keys[0]["time"]:
+            return self._copy_out(keys[0]["value"])
+        if time >= keys[-1]["time"]:
+            return self._copy_out(keys[-1]["value"])
+        for left, right in zip(keys, keys[1:]):
+            if left["time"] <= time <= right["time"]:
+                a, b = left["value"], right["value"]
+                if left["out"] == _HOLD or time == left["time"]:
+                    return self._copy_out(a)
+                t = (time - left["time"]) / (right["time"] - left["time"])
+                if isinstance(a, list):
+                    return [x + (y - x) * t for x, y in zip(a, b)]
+                if isinstance(a, float):
+                    return a + (b - a) * t
+                return self._copy_out(a)
+
+    # -- keyframes ----------------------------------------------------------
+
+    @property
+    def numKeys(self) -> int:
+        return len(self._keys)
+
+    @property
+    def isTimeVarying(self) -> bool:
+        return bool(self._keys) or (self.expressionEnabled and bool(self.expression))
+
+    def _key(self, keyIndex) -> dict:
+        index = _index(keyIndex)
+        if not 1 <= index <= len(self._keys):
+            raise _error(f"{self._name}: key index {index} out of range (1..{len(self._keys)})")
+        return self._keys[index - 1]
+
+    def addKey(self, time) -> int:
+        self._check_unlocked()
+        time = float(time)
+        for i, key in enumerate(self._keys):
+            if key["time"] == time:
+                return i + 1
+        key = {
+            "time": time, "value": self.valueAtTime(time) if self._keys else self._copy_out(self._value),
+            "in": _LINEAR, "out": _LINEAR, "ease_in": None, "ease_out": None, "selected": False,
+        }
+        self._keys.append(key)
+        self._keys.sort(key=lambda k: k["time"])
+        return self._keys.index(key) + 1
+
+    def removeKey(self, keyIndex):
+        self._check_unlocked()
+        key = self._key(keyIndex)
+        self._keys.remove(key)
+        if not self._keys:
+            self._value = key["value"]
+
+    def setValueAtTime(self, time, newValue):
+        index = self.addKey(time)
+        self._keys[index - 1]["value"] = self._coerce(newValue)
+
+    def setValuesAtTimes(self, times: list, newValues: list):
+        if len(times) != len(newValues):
+            raise _error("setValuesAtTimes(): times and values must have the same length")
+        for time, value in zip(times, newValues):
+            self.setValueAtTime(time, value)
+
+    def setValueAtKey(self, keyIndex, newValue):
+        self._check_unlocked()
+        self._key(keyIndex)["value"] = self._coerce(newValue)
+
+    def keyTime(self, keyIndex) -> float:
+        return self._key(keyIndex)["time"]
+
+    def keyValue(self, keyIndex):
+        return self._copy_out(self._key(keyIndex)["value"])
+
+    def nearestKeyIndex(self, time) -> int:
+        if not self._keys:
+            raise _error(f"{self._name} has no keyframes")
+        time = float(time)
+        best = min(range(len(self._keys)), key=lambda i: abs(self._keys[i]["time"] - time))
+        return best + 1
+
+    def keySelected(self, keyIndex) -> bool:
+        return self._key(keyIndex)["selected"]
+
+    def setSelectedAtKey(self, keyIndex, onOff):
+        self._key(keyIndex)["selected"] = bool(onOff)
+
+    @property
+    def selectedKeys(self) -> list:
+        return [i + 1 for i, key in enumerate(self._keys) if key["selected"]]
+
+    def keyInInterpolationType(self, keyIndex) -> int:
+        return self._key(keyIndex)["in"]
+
+    def keyOutInterpolationType(self, keyIndex) -> int:
+        return self._key(keyIndex)["out"]
+
+    def setInterpolationTypeAtKey(self, keyIndex, inType, outType=None):
+        key = self._key(keyIndex)
+        key["in"] = _index(inType)
+        key["out"] = _index(inType if outType is None else outType)
+
+    def keyInTemporalEase(self, keyIndex) -> list:
+        return list(self._key(keyIndex)["ease_in"] or [KeyframeEase()])
+
+    def keyOutTemporalEase(self, keyIndex) -> list:
+        return list(self._key(keyIndex)["ease_out"] or [KeyframeEase()])
+
+    def setTemporalEaseAtKey(self, keyIndex, inTemporalEase, outTemporalEase=None):
+        key = self._key(keyIndex)
+        key["ease_in"] = list(inTemporalEase)
+        key["ease_out"] = list(outTemporalEase if outTemporalEase is not None else inTemporalEase)
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._value = copy.deepcopy(self._value)
+        clone._keys = copy.deepcopy(self._keys)
+        return clone
+
+
+class PropertyGroup(PropertyBase):
+    propertyType = PropertyType["NAMED_GROUP"]
+
+    def __init__(self, matchName: str, name: str, attr: str = None, children=(), indexed: bool = False):
+        super().__init__(matchName, name, attr)
+        self._children = []
+        if indexed:
+            self.propertyType = PropertyType["INDEXED_GROUP"]
+        for child in children:
+            self._adopt(child)
+
+    def _adopt(self, child):
+        child._parent = self
+        self._children.append(child)
+        return child
+
+    @property
+    def numProperties(self) -> int:
+        return len(self._children)
+
+    def property(self, indexOrName):
+        if isinstance(indexOrName, str):
+            for child in self._children:
+                if indexOrName in (child.matchName, child._name):
+                    return child
+            return None
+        index = _index(indexOrName)
+        if 1 <= index <= len(self._children):
+            return self._children[index - 1]
+        return None
+
+    def es_get(self, key: str):
+        value = super().es_get(key)
+        if value is UNDEFINED:
+            child = self._find_attr(key)
+            if child is not None:
+                return child
+        return value
+
+    def _find_attr(self, key: str):
+        for child in self._children:
+            if child._attr == key:
+                return child
+        return None
+
+    def canAddProperty(self, name: str) -> bool:
+        return self.propertyType == PropertyType["INDEXED_GROUP"]
+
+    def addProperty(self, name: str):
+        if not self.canAddProperty(name):
+            raise _error(f"Can not add property {name} to {self._name}")
+        self._check_unlocked()
+        factory = _ADDABLE.get(self.matchName)
+        child = factory(name, len(self._children) + 1) if factory else PropertyGroup(name, name)
+        return self._adopt(child)
+
+    def remove(self):
+        self._check_unlocked()
+        parent = self._parent
+        if not isinstance(parent, PropertyGroup) or parent.propertyType != PropertyType["INDEXED_GROUP"]:
+            raise _error(f"Can not remove {self._name}")
+        parent._children.remove(self)
+        self._removed = True
+
+    def duplicate(self):
+        parent = self._parent
+        clone = self._clone()
+        clone._parent = parent
+        parent._children.insert(parent._children.index(self) + 1, clone)
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._children = []
+        for child in self._children:
+            clone._adopt(child._clone())
+        return clone
+
+
+def _effect(matchName: str, index: int) -> PropertyGroup:
+    name = matchName.replace("ADBE ", "").replace(" Control", "").strip() or matchName
+    return PropertyGroup(matchName, f"{name} {index}" if index > 1 else name, None, [
+        Property(f"{matchName}-0001", "Slider", "slider", 0.0, _PVT["OneD"]),
+    ])
+
+
+def _mask(matchName: str, index: int) -> PropertyGroup:
+    group = PropertyGroup("ADBE Mask Atom", f"Mask {index}", None, [
+        Property("ADBE Mask Shape", "Mask Path", "maskShape", Shape(), _PVT["SHAPE"]),
+        Property("ADBE Mask Feather", "Mask Feather", "maskFeather", [0.0, 0.0], _PVT["TwoD"]),
+        Property("ADBE Mask Opacity", "Mask Opacity", "maskOpacity", 100.0, _PVT["OneD"]),
+        Property("ADBE Mask Offset", "Mask Expansion", "maskExpansion", 0.0, _PVT["OneD"]),
+    ])
+    group.es_class = "MaskPropertyGroup"
+    group.inverted = False
+    group.locked = False
+    group.maskMode = 6812
+    return group
+
+
+def _vector(matchName: str, index: int) -> PropertyGroup:
+    return PropertyGroup(matchName, f"{matchName.replace('ADBE Vector ', '')} {index}", None, [], indexed=True)
+
+
+_ADDABLE = {
+    "ADBE Effect Parade": _effect,
+    "ADBE Mask Parade": _mask,
+    "ADBE Root Vectors Group": _vector,
+}
+
+
+class MaskPropertyGroup(PropertyGroup):
+    pass
+
+
+def _transform(width: float, height: float, camera: bool = False) -> PropertyGroup:
+    children = [
+        Property("ADBE Anchor Point", "Anchor Point", "anchorPoint", [0.0, 0.0, 0.0], _PVT["ThreeD_SPATIAL"]),
+        Property("ADBE Position", "Position", "position", [width / 2, height / 2, 0.0], _PVT["ThreeD_SPATIAL"]),
+    ]
+    if not camera:
+        children.append(Property("ADBE Scale", "Scale", "scale", [100.0, 100.0, 100.0], _PVT["ThreeD"]))
+    children += [
+        Property("ADBE Orientation", "Orientation", "orientation", [0.0, 0.0, 0.0], _PVT["ThreeD"]),
+        Property("ADBE Rotate X", "X Rotation", "xRotation", 0.0, _PVT["OneD"]),
+        Property("ADBE Rotate Y", "Y Rotation", "yRotation", 0.0, _PVT["OneD"]),
+        Property("ADBE Rotate Z", "Rotation", "rotation", 0.0, _PVT["OneD"]),
+    ]
+    if not camera:
+        children.append(Property("ADBE Opacity", "Opacity", "opacity", 100.0, _PVT["OneD"]))
+    return PropertyGroup("ADBE Transform Group", "Transform", "transform", children)
+
+
+# ---------------------------------------------------------------------------
+# Layers
+# ---------------------------------------------------------------------------
+
+class Layer(ModelObject):
+    _match_name = "ADBE AV Layer"
+    _ids = itertools.count(1)
+
+    def __init__(self, comp: "CompItem", name: str):
+        self._comp = comp
+        self._name = name
+        self._parent_layer = None
+        self._groups = []
+        self.id = next(Layer._ids)
+        self.comment = ""
+        self.label = 1
+        self.enabled = True
+        self.selected = False
+        self.shy = False
+        self.solo = False
+        self._locked = False
+        self.inPoint = 0.0
+        self.outPoint = float(comp.duration)
+        self.startTime = 0.0
+        self.stretch = 100.0
+        self.autoOrient = 4212
+        self.nullLayer = False
+        self.isNameSet = True
+
+    # -- identity -----------------------------------------------------------
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._check_unlocked()
+        self._name = str(value)
+
+    @property
+    def matchName(self) -> str:
+        return self._match_name
+
+    @property
+    def index(self) -> int:
+        return self._comp._layer_index(self)
+
+    @property
+    def containingComp(self):
+        return self._comp
+
+    @property
+    def time(self) -> float:
+        return self._comp.time
+
+    @property
+    def hasVideo(self) -> bool:
+        return True
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @locked.setter
+    def locked(self, value):
+        self._locked = bool(value)
+
+    @property
+    def parent(self):
+        return self._parent_layer
+
+    @parent.setter
+    def parent(self, value):
+        if value is not None:
+            if value is self:
+                raise _error("A layer can not be its own parent")
+            if value._comp is not self._comp:
+                raise _error("Parent layer must be in the same composition")
+            ancestor = value
+            while ancestor is not None:
+                if ancestor is self:
+                    raise _error("Parenting would create a loop")
+                ancestor = ancestor._parent_layer
+        self._parent_layer = value
+
+    def _check_unlocked(self):
+        if self._locked:
+            raise _error(f"Can not modify layer '{self._name}': layer is locked")
+
+    # -- properties ---------------------------------------------------------
+
+    @property
+    def numProperties(self) -> int:
+        return len(self._groups)
+
+    def property(self, indexOrName):
+        if isinstance(indexOrName, str):
+            for group in self._groups:
+                if indexOrName in (group.matchName, group._name):
+                    return group
+            return None
+        index = _index(indexOrName)
+        return self._groups[index - 1] if 1 <= index <= len(self._groups) else None
+
+    def _add_group(self, group: PropertyBase) -> PropertyBase:
+        group._parent = self
+        self._groups.append(group)
+        return group
+
+    def es_get(self, key: str):
+        value = super().es_get(key)
+        if value is UNDEFINED:
+            for group in self._groups:
+                if group._attr == key:
+                    return group
+            # AE promotes the properties of the layer's top-level groups
+            for group in self._groups:
+                if isinstance(group, PropertyGroup):
+                    child = group._find_attr(key)
+                    if child is not None:
+                        return child
+        return value
+
+    # -- ordering -----------------------------------------------------------
+
+    def _move(self, index: int):
+        self._check_unlocked()
+        self._comp._move_layer(self, index)
+
+    def moveToBeginning(self):
+        self._move(0)
+
+    def moveToEnd(self):
+        self._move(len(self._comp._layers._items) - 1)
+
+    def moveAfter(self, layer):
+        if layer is self:
+            return
+        self._check_unlocked()
+        items = self._comp._layers._items
+        items.remove(self)
+        items.insert(items.index(layer) + 1, self)
+        self._comp._layers_changed()
+
+    def moveBefore(self, layer):
+        if layer is self:
+            return
+        self._check_unlocked()
+        items = self._comp._layers._items
+        items.remove(self)
+        items.insert(items.index(layer), self)
+        self._comp._layers_changed()
+
+    def remove(self):
+        self._check_unlocked()
+        self._comp._remove_layer(self)
+        self._removed = True
+
+    def duplicate(self):
+        clone = self._clone(self._comp)
+        items = self._comp._layers._items
+        items.insert(items.index(self), clone)
+        self._comp._layers_changed()
+        return clone
+
+    def copyToComp(self, intoComp):
+        clone = self._clone(intoComp)
+        intoComp._layers._items.insert(0, clone)
+        intoComp._layers_changed()
+
+    def _clone(self, comp):
+        clone = copy.copy(self)
+        clone._comp = comp
+        clone.id = next(Layer._ids)
+        clone._groups = []
+        for group in self._groups:
+            clone._add_group(group._clone())
+        if comp is not self._comp:
+            clone._parent_layer = None
+        return clone
+
+    def setParentWithJump(self, newParent=None):
+        self.parent = newParent
+
+
+class AVLayer(Layer):
+    def __init__(self, comp, name: str, source=None, width=None, height=None):
+        super().__init__(comp, name)
+        self.source = source
+        self.width = float(width if width is not None else comp.width)
+        self.height = float(height if height is not None else comp.height)
+        self.threeDLayer = False
+        self.adjustmentLayer = False
+        self.guideLayer = False
+        self.audioEnabled = True
+        self.motionBlur = False
+        self.collapseTransformation = False
+        self.blendingMode = 5212
+        self.quality = 4614
+        self.trackMatteType = 5012
+        self._add_group(Property("ADBE Marker", "Marker", "marker", MarkerValue(), _PVT["MARKER"]))
+        self._add_content_groups()
+        self._add_group(PropertyGroup("ADBE Mask Parade", "Masks", "mask", indexed=True))
+        self._add_group(PropertyGroup("ADBE Effect Parade", "Effects", "effect", indexed=True))
+        self._add_group(_transform(self.width, self.height))
+
+    def _add_content_groups(self):
+        pass
+
+    @property
+    def hasAudio(self) -> bool:
+        return getattr(self.source, "hasAudio", False)
+
+    def sourceRectAtTime(self, timeT=0, extents=False) -> dict:
+        return {"top": 0.0, "left": 0.0, "width": self.width, "height": self.height}
+
+
+class TextLayer(AVLayer):
+    _match_name = "ADBE Text Layer"
+
+    def __init__(self, comp, name: str, text: str = ""):
+        self._initial_text = text
+        super().__init__(comp, name)
+
+    def _add_content_groups(self):
+        self._add_group(PropertyGroup("ADBE Text Properties", "Text", "text", [
+            Property("ADBE Text Document", "Source Text", "sourceText",
+                     TextDocument(self._initial_text), _PVT["TEXT_DOCUMENT"]),
+        ]))
+
+
+class ShapeLayer(AVLayer):
+    _match_name = "ADBE Vector Layer"
+
+    def _add_content_groups(self):
+        self._add_group(PropertyGroup("ADBE Root Vectors Group", "Contents", "content", indexed=True))
+
+
+class CameraLayer(Layer):
+    _match_name = "ADBE Camera Layer"
+
+    def __init__(self, comp, name: str, centerPoint=None):
+        super().__init__(comp, name)
+        self._add_group(Property("ADBE Marker", "Marker", "marker", MarkerValue(), _PVT["MARKER"]))
+        self._add_group(_transform(comp.width, comp.height, camera=True))
+        self._add_group(PropertyGroup("ADBE Camera Options Group", "Camera Options", "cameraOption", [
+            Property("ADBE Camera Zoom", "Zoom", "zoom", 1777.8, _PVT["OneD"]),
+            Property("ADBE Camera Depth of Field", "Depth of Field", "depthOfField", 0.0, _PVT["OneD"]),
+            Property("ADBE Camera Focus Distance", "Focus Distance", "focusDistance", 1777.8, _PVT["OneD"]),
+            Property("ADBE Camera Aperture", "Aperture", "aperture", 17.7, _PVT["OneD"]),
+        ]))
+
+
+class LightLayer(Layer):
+    _match_name = "ADBE Light Layer"
+
+    def __init__(self, comp, name: str, centerPoint=None):
+        super().__init__(comp, name)
+        self.lightType = LightType["SPOT"]
+        self._add_group(Property("ADBE Marker", "Marker", "marker", MarkerValue(), _PVT["MARKER"]))
+        self._add_group(_transform(comp.width, comp.height, camera=True))
+        self._add_group(PropertyGroup("ADBE Light Options Group", "Light Options", "lightOption", [
+            Property("ADBE Light Intensity", "Intensity", "intensity", 100.0, _PVT["OneD"]),
+            Property("ADBE Light Color", "Color", "color", [1.0, 1.0, 1.0, 1.0], _PVT["COLOR"]),
+        ]))
+
+
+class LayerCollection(Collection):
+    def __init__(self, comp: "CompItem"):
+        super().__init__()
+        self._comp = comp
+        self._name_counters = {}
+
+    def _insert(self, layer: Layer) -> Layer:
+        self._items.insert(0, layer)
+        self._comp._layers_changed()
+        return layer
+
+    def _unique_name(self, base: str) -> str:
+        # "Null 1", "Null 2", ... numbered per comp like AE's default names
+        n = self._name_counters.get(base, 0) + 1
+        self._name_counters[base] = n
+        return f"{base} {n}"
+
+    def add(self, item, duration=None):
+        layer = AVLayer(self._comp, item.name, item, getattr(item, "width", None), getattr(item, "height", None))
+        if duration is not None:
+            layer.outPoint = float(duration)
+        return self._insert(layer)
+
+    def addSolid(self, color, name, width, height, pixelAspect=1, duration=None):
+        solid = self._comp._project._add_item(FootageItem(self._comp._project, name, SolidSource(color),
+                                                          width, height))
+        return self.add(solid, duration)
+
+    def addNull(self, duration=None):
+        layer = AVLayer(self._comp, self._unique_name("Null"), None, 100, 100)
+        layer.nullLayer = True
+        if duration is not None:
+            layer.outPoint = float(duration)
+        return self._insert(layer)
+
+    def addText(self, sourceText=""):
+        text = sourceText.text if isinstance(sourceText, TextDocument) else str(sourceText or "")
+        return self._insert(TextLayer(self._comp, text or self._unique_name("Text"), text))
+
+    def addBoxText(self, size, sourceText=""):
+        return self.addText(sourceText)
+
+    def addShape(self):
+        return self._insert(ShapeLayer(self._comp, self._unique_name("Shape Layer")))
+
+    def addCamera(self, name, centerPoint=None):
+        return self._insert(CameraLayer(self._comp, name, centerPoint))
+
+    def addLight(self, name, centerPoint=None):
+        return self._insert(LightLayer(self._comp, name, centerPoint))
+
+    def byName(self, name: str):
+        for layer in self._items:
+            if layer._name == name:
+                return layer
+        return None
+
+    def precompose(self, layerIndices, name, moveAllAttributes=True):
+        indices = sorted(_index(i) for i in layerIndices)
+        layers = [self._item(i) for i in indices]
+        comp = self._comp._project.items.addComp(name, self._comp.width, self._comp.height,
+                                                 self._comp.pixelAspect, self._comp.duration,
+                                                 self._comp.frameRate)
+        for layer in reversed(layers):
+            self._items.remove(layer)
+            layer._comp = comp
+            comp._layers._items.insert(0, layer)
+        comp._layers_changed()
+        self.add(comp)
+        return comp
+
+
+# ---------------------------------------------------------------------------
+# Items
+# ---------------------------------------------------------------------------
+
+class Item(ModelObject):
+    typeName = "Item"
+
+    def __init__(self, project: "Project", name: str):
+        self._project = project
+        self.id = project._next_id()
+        self.name = name
+        self.comment = ""
+        self.label = 0
+        self.selected = False
+        self.parentFolder = project.rootFolder if getattr(project, "rootFolder", None) is not None else None
+
+    def remove(self):
+        self._project._remove_item(self)
+        self._removed = True
+
+
+class AVItem(Item):
+    def __init__(self, project, name, width=1920, height=1080, pixelAspect=1, duration=10, frameRate=25):
+        super().__init__(project, name)
+        self.width = int(width)
+        self.height = int(height)
+        self.pixelAspect = float(pixelAspect)
+        self.duration = float(duration)
+        self.frameRate = float(frameRate)
+        self.hasVideo = True
+        self.hasAudio = False
+        self.footageMissing = False
+
+    @property
+    def frameDuration(self) -> float:
+        return 1.0 / self.frameRate
+
+    @frameDuration.setter
+    def frameDuration(self, value):
+        self.frameRate = 1.0 / float(value)
+
+    @property
+    def usedIn(self) -> list:
+        return [comp for comp in self._project._items if isinstance(comp, CompItem)
+                and any(getattr(layer, "source", None) is self for layer in comp._layers._items)]
+
+
+class CompItem(AVItem):
+    typeName = "Composition"
+
+    def __init__(self, project, name, width=1920, height=1080, pixelAspect=1, duration=10, frameRate=25):
+        super().__init__(project, name, width, height, pixelAspect, duration, frameRate)
+        self._layers = LayerCollection(self)
+        self._index_cache = None
+        self.time = 0.0
+        self.workAreaStart = 0.0
+        self.workAreaDuration = float(duration)
+        self.displayStartTime = 0.0
+        self.bgColor = [0.0, 0.0, 0.0]
+        self.frameBlending = False
+        self.motionBlur = False
+        self.shutterAngle = 180.0
+        self.draft3d = False
+        self.selectedProperties = []
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @property
+    def numLayers(self) -> int:
+        return len(self._layers._items)
+
+    @property
+    def selectedLayers(self) -> list:
+        return [layer for layer in self._layers._items if layer.selected]
+
+    def layer(self, indexOrName, *args):
+        if isinstance(indexOrName, str):
+            return self._layers.byName(indexOrName)
+        if args:
+            # layer(otherLayer, relIndex)
+            return self._layers._item(indexOrName.index + _index(args[0]))
+        return self._layers._item(indexOrName)
+
+    def duplicate(self):
+        clone = self._project.items.addComp(f"{self.name} 2", self.width, self.height, self.pixelAspect,
+                                            self.duration, self.frameRate)
+        for layer in self._layers._items:
+            clone._layers._items.append(layer._clone(clone))
+        clone._layers_changed()
+        return clone
+
+    def openInViewer(self):
+        self._project._active_item = self
+        return None
+
+    # -- layer bookkeeping ---------------------------------------------------
+
+    def _layers_changed(self):
+        self._index_cache = None
+
+    def _layer_index(self, layer) -> int:
+        if self._index_cache is None:
+            self._index_cache = {id(l): i + 1 for i, l in enumerate(self._layers._items)}
+        return self._index_cache[id(layer)]
+
+    def _move_layer(self, layer, index: int):
+        items = self._layers._items
+        items.remove(layer)
+        items.insert(index, layer)
+        self._layers_changed()
+
+    def _remove_layer(self, layer):
+        self._layers._items.remove(layer)
+        for other in self._layers._items:
+            if other._parent_layer is layer:
+                other._parent_layer = None
+        self._layers_changed()
+
+
+class FolderItem(Item):
+    typeName = "Folder"
+
+    def __init__(self, project, name):
+        super().__init__(project, name)
+        self._children = ItemCollection(project, self)
+
+    @property
+    def items(self):
+        return self._children
+
+    @property
+    def numItems(self) -> int:
+        return len(self._children._items)
+
+    def item(self, index):
+        return self._children._item(index)
+
+
+class FootageSource(ModelObject):
+    hasAlpha = False
+    isStill = True
+
+
+class SolidSource(FootageSource):
+    def __init__(self, color):
+        self.color = list(color or [0.0, 0.0, 0.0])
+
+
+class FileSource(FootageSource):
+    def __init__(self, file):
+        self.file = file
+        self.missingFootagePath = ""
+
+
+class PlaceholderSource(FootageSource):
+    pass
+
+
+class FootageItem(AVItem):
+    typeName = "Footage"
+
+    def __init__(self, project, name, mainSource, width=1920, height=1080, duration=0, frameRate=25):
+        super().__init__(project, name, width, height, 1, duration, frameRate)
+        self.mainSource = mainSource
+
+    @property
+    def file(self):
+        return getattr(self.mainSource, "file", None)
+
+
+class ItemCollection(Collection):
+    def __init__(self, project: "Project", folder: FolderItem = None):
+        super().__init__()
+        self._project = project
+        self._folder = folder
+
+    def addComp(self, name, width, height, pixelAspect, duration, frameRate):
+        comp = CompItem(self._project, name, width, height, pixelAspect, duration, frameRate)
+        return self._project._add_item(comp, self._folder)
+
+    def addFolder(self, name):
+        return self._project._add_item(FolderItem(self._project, name), self._folder)
+
+
+# ---------------------------------------------------------------------------
+# Render queue
+# ---------------------------------------------------------------------------
+
+class OutputModule(ModelObject):
+    def __init__(self, item):
+        self._item = item
+        self.name = "Output Module"
+        self.file = None
+        self.postRenderAction = 3860
+
+    def remove(self):
+        self._item._outputModules._items.remove(self)
+        self._removed = True
+
+    def applyTemplate(self, templateName):
+        self.name = str(templateName)
+
+
+class OMCollection(Collection):
+    def __init__(self, item):
+        super().__init__()
+        self._items.append(OutputModule(item))
+        self._rq_item = item
+
+    def add(self):
+        module = OutputModule(self._rq_item)
+        self._items.append(module)
+        return module
+
+
+class RenderQueueItem(ModelObject):
+    def __init__(self, queue, comp):
+        self._queue = queue
+        self.comp = comp
+        self.render = True
+        self.status = 3013
+        self.timeSpanStart = 0.0
+        self.timeSpanDuration = comp.duration
+        self._outputModules = OMCollection(self)
+
+    @property
+    def outputModules(self):
+        return self._outputModules
+
+    @property
+    def numOutputModules(self) -> int:
+        return len(self._outputModules._items)
+
+    def outputModule(self, index):
+        return self._outputModules._item(index)
+
+    def remove(self):
+        self._queue._items._items.remove(self)
+        self._removed = True
+
+
+class RQItemCollection(Collection):
+    def __init__(self, queue):
+        super().__init__()
+        self._queue = queue
+
+    def add(self, comp):
+        item = RenderQueueItem(self._queue, comp)
+        self._items.append(item)
+        return item
+
+
+class RenderQueue(ModelObject):
+    def __init__(self):
+        self._items = RQItemCollection(self)
+        self.rendering = False
+
+    @property
+    def items(self):
+        return self._items
+
+    @property
+    def numItems(self) -> int:
+        return len(self._items._items)
+
+    def item(self, index):
+        return self._items._item(index)
+
+    def render(self):
+        for item in self._items._items:
+            if item.render:
+                item.status = 3015
+
+    def showWindow(self, doShow=True):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Project / application
+# ---------------------------------------------------------------------------
+
+class Project(ModelObject):
+    def __init__(self, app: "Application"):
+        self._app = app
+        self._ids = itertools.count(1)
+        self._items = []
+        self._active_item = None
+        self.rootFolder = None
+        self.rootFolder = FolderItem(self, "Root")
+        self._all = ItemCollection(self)
+        self._renderQueue = RenderQueue()
+        self.file = None
+        self.bitsPerChannel = 8
+        self.linearBlending = False
+        self.dirty = False
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    def _add_item(self, item, folder=None):
+        folder = folder or self.rootFolder
+        item.parentFolder = folder
+        folder._children._items.append(item)
+        self._items.append(item)
+        self._all._items = self._items
+        self.dirty = True
+        return item
+
+    def _remove_item(self, item):
+        self._items.remove(item)
+        folder = item.parentFolder
+        if folder is not None and item in folder._children._items:
+            folder._children._items.remove(item)
+        if self._active_item is item:
+            self._active_item = None
+
+    @property
+    def items(self):
+        return self._all
+
+    @property
+    def numItems(self) -> int:
+        return len(self._items)
+
+    def item(self, index):
+        return self._all._item(index)
+
+    @property
+    def activeItem(self):
+        return self._active_item
+
+    @property
+    def selection(self) -> list:
+        return [item for item in self._items if item.selected]
+
+    @property
+    def renderQueue(self):
+        return self._renderQueue
+
+    def importFile(self, importOptions):
+        file = importOptions.file
+        name = file.name if file is not None else "Footage"
+        return self._add_item(FootageItem(self, name, FileSource(file)))
+
+    def save(self, file=None):
+        if file is not None:
+            self.file = file
+        self.dirty = False
+        return True
+
+    def layerByID(self, id):
+        for item in self._items:
+            if isinstance(item, CompItem):
+                for layer in item._layers._items:
+                    if layer.id == _index(id):
+                        return layer
+        return None
+
+    def itemByID(self, id):
+        for item in self._items:
+            if item.id == _index(id):
+                return item
+        return None
+
+
+class Settings(ModelObject):
+    def __init__(self):
+        self._values = {}
+
+    def haveSetting(self, sectionName, keyName) -> bool:
+        return (sectionName, keyName) in self._values
+
+    def getSetting(self, sectionName, keyName, type=None):
+        if (sectionName, keyName) not in self._values:
+            raise _error(f"No setting {sectionName}/{keyName}")
+        return self._values[(sectionName, keyName)]
+
+    def saveSetting(self, sectionName, keyName, value, type=None):
+        self._values[(sectionName, keyName)] = str(value)
+
+
+class System(ModelObject):
+    osName = "Emulated"
+    osVersion = "1.0"
+    machineName = "ae-emulator"
+    userName = "emulator"
+
+    def callSystem(self, cmdLineToExecute) -> str:
+        # The emulator never runs shell commands
+        return ""
+
+
+class Application(ModelObject):
+    """app. Undo groups and executed commands are recorded for inspection."""
+
+    def __init__(self):
+        self.version = "25.0x0"
+        self.buildName = "emulator"
+        self.language = 1
+        self.isWatchFolder = False
+        self.isRenderEngine = False
+        self.memoryInUse = 0
+        self.settings = Settings()
+        self.project = Project(self)
+        self._undo_depth = 0
+        self._undo_groups = []
+        self._commands = []
+
+    def beginUndoGroup(self, undoString=""):
+        if self._undo_depth == 0:
+            self._undo_groups.append(str(undoString))
+        self._undo_depth += 1
+
+    def endUndoGroup(self):
+        if self._undo_depth > 0:
+            self._undo_depth -= 1
+
+    def executeCommand(self, id):
+        self._commands.append(_index(id))
+
+    def findMenuCommandId(self, str) -> int:
+        return 1000 + sum(ord(c) for c in str)
+
+    def activate(self):
+        return None
+
+    def purge(self, target=None):
+        return None
+
+    def scheduleTask(self, stringToExecute, delay, repeat):
+        return 0
+
+
+# ES constructors the model exposes as globals (for `new` and `instanceof`)
+CLASSES = [
+    Application, Project, Item, AVItem, CompItem, FolderItem, FootageItem, FootageSource, SolidSource,
+    FileSource, PlaceholderSource, ItemCollection, Layer, AVLayer, TextLayer, ShapeLayer, CameraLayer,
+    LightLayer, LayerCollection, PropertyBase, Property, PropertyGroup, MaskPropertyGroup, RenderQueue,
+    RenderQueueItem, RQItemCollection, OutputModule, OMCollection, Settings, System, TextDocument,
+    KeyframeEase, MarkerValue, Shape, File, ImportOptions,
+]
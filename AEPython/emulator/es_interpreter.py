@@ -0,0 +1,2566 @@
+"""
+AEPython ExtendScript interpreter
+
+A small pure-Python interpreter for the ES3 dialect After Effects runs. It is
+what lets ae_emulator execute the real AEPython.jsx dispatcher, the query
+loops, transpiled lambdas and @ae.es_function helpers without After Effects.
+
+Example:
+    from es_interpreter import Interpreter, to_string
+
+    es = Interpreter()
+    es.run("function add(a, b) { return a + b; }")
+    to_string(es.run("add(1, 2);"))       # -> "3"
+
+Host objects (the synthetic AE model) subclass HostObject: public Python
+attributes become ES properties and public methods become ES methods.
+
+Only ES3 is implemented, on purpose: no JSON, Array.prototype.indexOf,
+forEach/map/filter or String.prototype.trim, just like ExtendScript, so code
+that relies on them fails here the same way it fails inside After Effects.
+"""
+
+import math
+import random
+import re
+import sys
+from collections import OrderedDict
+from decimal import Decimal
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+class _Undefined:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "undefined"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+UNDEFINED = _Undefined()
+
+
+class JSThrow(Exception):
+    """An ExtendScript exception propagating through Python."""
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+    def __str__(self) -> str:
+        return to_string(self.value)
+
+
+class JSObject:
+    __slots__ = ("props", "proto", "es_class")
+
+    def __init__(self, proto=None, props=None, es_class="Object"):
+        self.props = {} if props is None else props
+        self.proto = proto
+        self.es_class = es_class
+
+    def get(self, key: str):
+        obj = self
+        while obj is not None:
+            props = obj.props
+            if key in props:
+                return props[key]
+            obj = obj.proto
+        return UNDEFINED
+
+    def put(self, key: str, value):
+        self.props[key] = value
+
+    def has(self, key: str) -> bool:
+        obj = self
+        while obj is not None:
+            if key in obj.props:
+                return True
+            obj = obj.proto
+        return False
+
+    def delete(self, key: str) -> bool:
+        self.props.pop(key, None)
+        return True
+
+    def keys(self) -> list:
+        return list(self.props)
+
+
+class JSArray(JSObject):
+    __slots__ = ("items",)
+
+    def __init__(self, items=None):
+        super().__init__(ArrayPrototype, None, "Array")
+        self.items = [] if items is None else items
+
+    def get(self, key: str):
+        if key == "length":
+            return float(len(self.items))
+        index = _array_index(key)
+        if index is not None:
+            return self.items[index] if index < len(self.items) else UNDEFINED
+        return JSObject.get(self, key)
+
+    def put(self, key: str, value):
+        index = _array_index(key)
+        if index is not None:
+            items = self.items
+            if index >= len(items):
+                items.extend([UNDEFINED] * (index + 1 - len(items)))
+            items[index] = value
+        elif key == "length":
+            length = int(to_number(value))
+            del self.items[length:]
+            self.items.extend([UNDEFINED] * (length - len(self.items)))
+        else:
+            self.props[key] = value
+
+    def has(self, key: str) -> bool:
+        index = _array_index(key)
+        if index is not None:
+            return index < len(self.items)
+        return key == "length" or JSObject.has(self, key)
+
+    def delete(self, key: str) -> bool:
+        index = _array_index(key)
+        if index is not None:
+            if index < len(self.items):
+                self.items[index] = UNDEFINED
+            return True
+        return JSObject.delete(self, key)
+
+    def keys(self) -> list:
+        return [str(i) for i in range(len(self.items))] + list(self.props)
+
+
+class JSFunction(JSObject):
+    """A function defined in ExtendScript source."""
+    __slots__ = ("name", "params", "body", "scope", "hoisted_vars", "hoisted_functions")
+
+    def __init__(self, name, params, body, scope, hoisted_vars, hoisted_functions):
+        super().__init__(FunctionPrototype, None, "Function")
+        self.name = name or ""
+        self.params = params
+        self.body = body
+        self.scope = scope
+        self.hoisted_vars = hoisted_vars
+        self.hoisted_functions = hoisted_functions
+
+    def get(self, key: str):
+        if key == "prototype" and "prototype" not in self.props:
+            prototype = JSObject(ObjectPrototype)
+            prototype.props["constructor"] = self
+            self.props["prototype"] = prototype
+        elif key == "name":
+            return self.name
+        elif key == "length":
+            return float(len(self.params))
+        return JSObject.get(self, key)
+
+    def call(self, this, args):
+        variables = {"arguments": JSArray(list(args))}
+        for i, param in enumerate(self.params):
+            variables[param] = args[i] if i < len(args) else UNDEFINED
+        scope = Scope(variables, self.scope, this)
+        _hoist(scope, self.hoisted_vars, self.hoisted_functions)
+        signal = self.body(scope)
+        if signal is not None and signal[0] == "return":
+            return signal[1]
+        return UNDEFINED
+
+
+class NativeFunction(JSObject):
+    """A built-in function implemented in Python: fn(this, args)."""
+    __slots__ = ("name", "fn", "construct")
+
+    def __init__(self, name, fn, construct=None, prototype=None):
+        super().__init__(FunctionPrototype, None, "Function")
+        self.name = name
+        self.fn = fn
+        self.construct = construct
+        if prototype is not None:
+            self.props["prototype"] = prototype
+            prototype.props.setdefault("constructor", self)
+
+    def get(self, key: str):
+        if key == "name":
+            return self.name
+        return JSObject.get(self, key)
+
+
+class JSRegExp(JSObject):
+    __slots__ = ("source", "flags", "pattern")
+
+    def __init__(self, source: str, flags: str = ""):
+        super().__init__(RegExpPrototype, None, "RegExp")
+        self.source = source
+        self.flags = flags
+        options = re.ASCII
+        if "i" in flags:
+            options |= re.IGNORECASE
+        if "m" in flags:
+            options |= re.MULTILINE
+        try:
+            self.pattern = re.compile(source, options)
+        except re.error as e:
+            raise JSThrow(make_error("SyntaxError", f"Invalid regular expression /{source}/: {e}"))
+        self.props["lastIndex"] = 0.0
+
+    @property
+    def is_global(self) -> bool:
+        return "g" in self.flags
+
+    def get(self, key: str):
+        if key == "source":
+            return self.source
+        if key == "global":
+            return "g" in self.flags
+        if key == "ignoreCase":
+            return "i" in self.flags
+        if key == "multiline":
+            return "m" in self.flags
+        return JSObject.get(self, key)
+
+
+class HostObject:
+    """
+    Base class for Python objects exposed to ExtendScript.
+
+    Public attributes and properties read and write as ES properties, public
+    methods are callable from ES. es_class is the ES constructor name
+    (defaults to the Python class name).
+    """
+    es_class = None
+
+    @classmethod
+    def es_class_name(cls) -> str:
+        return cls.__dict__.get("es_class") or cls.__name__
+
+    def es_get(self, key: str):
+        if key == "constructor":
+            return host_constructor(type(self))
+        if key.startswith("_"):
+            return UNDEFINED
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            return UNDEFINED
+        if callable(value) and not isinstance(value, HostObject):
+            return HostMethod(self, key, value)
+        return to_js(value)
+
+    def es_put(self, key: str, value):
+        if key.startswith("_"):
+            return
+        try:
+            setattr(self, key, to_py(value))
+        except AttributeError:
+            raise JSThrow(make_error("Error", f"Unable to set value of {key}: property is read-only"))
+
+    def es_has(self, key: str) -> bool:
+        return not key.startswith("_") and hasattr(self, key)
+
+    def es_keys(self) -> list:
+        return [key for key in vars(self) if not key.startswith("_")]
+
+    def es_to_string(self) -> str:
+        return f"[object {self.es_class_name()}]"
+
+
+class HostMethod:
+    """A bound method of a HostObject, seen from ES as a function."""
+    __slots__ = ("obj", "name", "fn")
+
+    def __init__(self, obj, name, fn):
+        self.obj = obj
+        self.name = name
+        self.fn = fn
+
+    def __call__(self, args):
+        try:
+            return to_js(self.fn(*[to_py(arg) for arg in args]))
+        except JSThrow:
+            raise
+        except (TypeError, ValueError, IndexError, KeyError) as e:
+            raise JSThrow(make_error("Error", f"{self.name}(): {e}"))
+
+
+_host_constructors = {}
+
+
+def host_constructor(cls) -> NativeFunction:
+    """The ES constructor function standing for a HostObject class."""
+    ctor = _host_constructors.get(cls)
+    if ctor is None:
+        construct = None
+        if "es_construct" in cls.__dict__:
+            construct = lambda args, cls=cls: cls.es_construct(*[to_py(arg) for arg in args])
+
+        def call(this, args, cls=cls):
+            if construct is None:
+                raise JSThrow(make_error("TypeError", f"{cls.es_class_name()} is not a constructor"))
+            return construct(args)
+
+        ctor = NativeFunction(cls.es_class_name(), call, construct)
+        ctor.props["__host_class__"] = cls
+        _host_constructors[cls] = ctor
+    return ctor
+
+
+class Scope:
+    __slots__ = ("vars", "parent", "this")
+
+    def __init__(self, variables, parent, this=None):
+        self.vars = variables
+        self.parent = parent
+        self.this = this
+
+
+# ---------------------------------------------------------------------------
+# Conversions
+# ---------------------------------------------------------------------------
+
+_INDEX = re.compile(r"(?:0|[1-9]\d*)\Z")
+
+
+def _array_index(key: str):
+    if _INDEX.match(key):
+        return int(key)
+    return None
+
+
+def number_to_string(x: float) -> str:
+    if x != x:
+        return "NaN"
+    if x in (math.inf, -math.inf):
+        return "Infinity" if x > 0 else "-Infinity"
+    if x == int(x) and abs(x) < 1e21:
+        return str(int(x))
+
+    sign, digits, exponent = Decimal(repr(x)).as_tuple()
+    digits = "".join(map(str, digits))
+    stripped = digits.rstrip("0")
+    exponent += len(digits) - len(stripped)
+    digits = stripped
+    k = len(digits)
+    n = k + exponent
+    prefix = "-" if sign else ""
+    if k <= n <= 21:
+        return prefix + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return prefix + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return prefix + "0." + "0" * -n + digits
+    e = n - 1
+    mantissa = digits[0] + ("." + digits[1:] if k > 1 else "")
+    return f"{prefix}{mantissa}e{'+' if e >= 0 else '-'}{abs(e)}"
+
+
+def to_key(value) -> str:
+    if type(value) is str:
+        return value
+    if type(value) is float:
+        return number_to_string(value)
+    return to_string(value)
+
+
+def to_string(value) -> str:
+    t = type(value)
+    if t is str:
+        return value
+    if t is float:
+        return number_to_string(value)
+    if t is bool:
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if value is UNDEFINED:
+        return "undefined"
+    if isinstance(value, JSArray):
+        return ",".join("" if item is None or item is UNDEFINED else to_string(item) for item in value.items)
+    if isinstance(value, (JSFunction, NativeFunction)):
+        return f"function {value.name}() {{ [code] }}"
+    if isinstance(value, HostMethod):
+        return f"function {value.name}() {{ [native code] }}"
+    if isinstance(value, JSRegExp):
+        return f"/{value.source}/{value.flags}"
+    if isinstance(value, JSObject):
+        method = value.get("toString")
+        if isinstance(method, JSFunction):
+            return to_string(method.call(value, []))
+        if value.has("message") and value.has("name"):
+            message = to_string(value.get("message"))
+            name = to_string(value.get("name"))
+            return f"{name}: {message}" if message else name
+        return f"[object {value.es_class}]"
+    if isinstance(value, HostObject):
+        return value.es_to_string()
+    return str(value)
+
+
+_NUMBER_LITERAL = re.compile(r"[+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\Z")
+
+
+def to_number(value) -> float:
+    t = type(value)
+    if t is float:
+        return value
+    if t is bool:
+        return 1.0 if value else 0.0
+    if value is None:
+        return 0.0
+    if value is UNDEFINED:
+        return math.nan
+    if t is str:
+        text = value.strip()
+        if not text:
+            return 0.0
+        if text[:2] in ("0x", "0X"):
+            try:
+                return float(int(text[2:], 16))
+            except ValueError:
+                return math.nan
+        if _NUMBER_LITERAL.match(text):
+            return float(text.replace("Infinity", "inf"))
+        return math.nan
+    if t is int:
+        return float(value)
+    return to_number(to_string(value))
+
+
+def to_boolean(value) -> bool:
+    t = type(value)
+    if t is bool:
+        return value
+    if t is float:
+        return not (value == 0 or value != value)
+    if t is str:
+        return value != ""
+    return value is not None and value is not UNDEFINED
+
+
+def to_int32(value) -> int:
+    x = to_number(value)
+    if x != x or x in (math.inf, -math.inf):
+        return 0
+    x = int(x) & 0xFFFFFFFF
+    return x - 0x100000000 if x >= 0x80000000 else x
+
+
+def to_uint32(value) -> int:
+    x = to_number(value)
+    if x != x or x in (math.inf, -math.inf):
+        return 0
+    return int(x) & 0xFFFFFFFF
+
+
+def to_js(value):
+    """Python value -> ES value."""
+    t = type(value)
+    if t is float or t is str or t is bool or value is None:
+        return value
+    if t is int:
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return JSArray([to_js(item) for item in value])
+    if isinstance(value, dict):
+        return JSObject(ObjectPrototype, {str(k): to_js(v) for k, v in value.items()})
+    return value
+
+
+def to_py(value):
+    """ES value -> Python value (arrays become lists, undefined becomes None)."""
+    if value is UNDEFINED:
+        return None
+    if isinstance(value, JSArray):
+        return [to_py(item) for item in value.items]
+    if type(value) is JSObject and value.proto is ObjectPrototype:
+        return {k: to_py(v) for k, v in value.props.items()}
+    return value
+
+
+def type_of(value) -> str:
+    t = type(value)
+    if t is str:
+        return "string"
+    if t is float:
+        return "number"
+    if t is bool:
+        return "boolean"
+    if value is UNDEFINED:
+        return "undefined"
+    if isinstance(value, (JSFunction, NativeFunction, HostMethod)):
+        return "function"
+    return "object"
+
+
+def make_error(name: str, message: str) -> JSObject:
+    prototype = ErrorPrototypes.get(name, ErrorPrototypes["Error"])
+    return JSObject(prototype, {"message": message}, "Error")
+
+
+def _type_error(message: str):
+    return JSThrow(make_error("TypeError", message))
+
+
+# ---------------------------------------------------------------------------
+# Operators
+# ---------------------------------------------------------------------------
+
+def to_primitive(value):
+    if isinstance(value, (JSObject, HostObject, HostMethod)):
+        return to_string(value)
+    return value
+
+
+def js_add(a, b):
+    if type(a) is float and type(b) is float:
+        return a + b
+    if type(a) is str and type(b) is str:
+        return a + b
+    a = to_primitive(a)
+    b = to_primitive(b)
+    if type(a) is str or type(b) is str:
+        return to_string(a) + to_string(b)
+    return to_number(a) + to_number(b)
+
+
+def js_sub(a, b):
+    return to_number(a) - to_number(b)
+
+
+def js_mul(a, b):
+    a = to_number(a)
+    b = to_number(b)
+    try:
+        return a * b
+    except OverflowError:
+        return math.inf
+
+
+def js_div(a, b):
+    a = to_number(a)
+    b = to_number(b)
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def js_mod(a, b):
+    a = to_number(a)
+    b = to_number(b)
+    if b == 0 or a != a or b != b or a in (math.inf, -math.inf):
+        return math.nan
+    if b in (math.inf, -math.inf):
+        return a
+    return math.fmod(a, b)
+
+
+def _less(a, b):
+    """True/False, or None when a comparison involves NaN."""
+    a = to_primitive(a)
+    b = to_primitive(b)
+    if type(a) is str and type(b) is str:
+        return a < b
+    a = to_number(a)
+    b = to_number(b)
+    if a != a or b != b:
+        return None
+    return a < b
+
+
+def js_lt(a, b):
+    if type(a) is float and type(b) is float:
+        return a < b
+    return _less(a, b) is True
+
+
+def js_gt(a, b):
+    if type(a) is float and type(b) is float:
+        return a > b
+    return _less(b, a) is True
+
+
+def js_le(a, b):
+    if type(a) is float and type(b) is float:
+        return a <= b
+    return _less(b, a) is False
+
+
+def js_ge(a, b):
+    if type(a) is float and type(b) is float:
+        return a >= b
+    return _less(a, b) is False
+
+
+def strict_equals(a, b) -> bool:
+    ta = type(a)
+    if ta is not type(b):
+        return False
+    if ta is float or ta is str or ta is bool:
+        return a == b
+    if ta is HostMethod:
+        return a.obj is b.obj and a.name == b.name
+    return a is b
+
+
+def loose_equals(a, b) -> bool:
+    ta = type(a)
+    tb = type(b)
+    if ta is tb:
+        return strict_equals(a, b)
+    if (a is None or a is UNDEFINED) and (b is None or b is UNDEFINED):
+        return True
+    if a is None or a is UNDEFINED or b is None or b is UNDEFINED:
+        return False
+    if ta is float and tb is str:
+        return a == to_number(b)
+    if ta is str and tb is float:
+        return to_number(a) == b
+    if ta is bool:
+        return loose_equals(to_number(a), b)
+    if tb is bool:
+        return loose_equals(a, to_number(b))
+    if ta in (float, str) and tb not in (float, str):
+        return loose_equals(a, to_primitive(b))
+    if tb in (float, str) and ta not in (float, str):
+        return loose_equals(to_primitive(a), b)
+    return a is b
+
+
+def js_instanceof(value, ctor) -> bool:
+    if not isinstance(ctor, (JSFunction, NativeFunction)):
+        raise _type_error("instanceof needs a constructor on the right-hand side")
+    host_class = ctor.props.get("__host_class__")
+    if host_class is not None:
+        return isinstance(value, host_class)
+    if not isinstance(value, JSObject):
+        return False
+    prototype = ctor.get("prototype")
+    obj = value.proto
+    while obj is not None:
+        if obj is prototype:
+            return True
+        obj = obj.proto
+    return False
+
+
+def js_in(key, obj) -> bool:
+    key = to_key(key)
+    if isinstance(obj, JSObject):
+        return obj.has(key)
+    if isinstance(obj, HostObject):
+        return obj.es_has(key)
+    raise _type_error("'in' needs an object on the right-hand side")
+
+
+_BINARY = {
+    "+": js_add,
+    "-": js_sub,
+    "*": js_mul,
+    "/": js_div,
+    "%": js_mod,
+    "<": js_lt,
+    ">": js_gt,
+    "<=": js_le,
+    ">=": js_ge,
+    "==": loose_equals,
+    "!=": lambda a, b: not loose_equals(a, b),
+    "===": strict_equals,
+    "!==": lambda a, b: not strict_equals(a, b),
+    "&": lambda a, b: float(to_int32(a) & to_int32(b)),
+    "|": lambda a, b: float(to_int32(a) | to_int32(b)),
+    "^": lambda a, b: float(to_int32(a) ^ to_int32(b)),
+    "<<": lambda a, b: float(to_int32(to_int32(a) << (to_uint32(b) & 31))),
+    ">>": lambda a, b: float(to_int32(a) >> (to_uint32(b) & 31)),
+    ">>>": lambda a, b: float(to_uint32(a) >> (to_uint32(b) & 31)),
+    "instanceof": js_instanceof,
+    "in": js_in,
+}
+
+
+# ---------------------------------------------------------------------------
+# Property access
+# ---------------------------------------------------------------------------
+
+def get_member(obj, key):
+    if isinstance(obj, JSObject):
+        if type(key) is not str:
+            key = to_key(key)
+        return obj.get(key)
+    t = type(obj)
+    if t is str:
+        if type(key) is float:
+            index = int(key) if key == int(key) else -1
+            return obj[index] if 0 <= index < len(obj) else UNDEFINED
+        key = to_key(key)
+        if key == "length":
+            return float(len(obj))
+        return StringPrototype.get(key)
+    if isinstance(obj, HostObject):
+        return obj.es_get(key if type(key) is str else to_key(key))
+    if t is float:
+        return NumberPrototype.get(to_key(key))
+    if t is bool:
+        return BooleanPrototype.get(to_key(key))
+    if isinstance(obj, HostMethod):
+        key = to_key(key)
+        return obj.name if key == "name" else FunctionPrototype.get(key)
+    raise _type_error(f"{to_string(obj)} has no properties (reading '{to_key(key)}')")
+
+
+def put_member(obj, key, value):
+    if isinstance(obj, JSObject):
+        obj.put(key if type(key) is str else to_key(key), value)
+    elif isinstance(obj, HostObject):
+        obj.es_put(key if type(key) is str else to_key(key), value)
+    elif obj is None or obj is UNDEFINED:
+        raise _type_error(f"{to_string(obj)} has no properties (setting '{to_key(key)}')")
+
+
+def delete_member(obj, key) -> bool:
+    if isinstance(obj, JSObject):
+        return obj.delete(to_key(key))
+    return True
+
+
+def call_function(fn, this, args):
+    if isinstance(fn, JSFunction):
+        return fn.call(this, args)
+    if isinstance(fn, NativeFunction):
+        return fn.fn(this, args)
+    if isinstance(fn, HostMethod):
+        return fn(args)
+    raise _type_error(f"{to_string(fn)} is not a function")
+
+
+def construct(fn, args):
+    if isinstance(fn, JSFunction):
+        prototype = fn.get("prototype")
+        obj = JSObject(prototype if isinstance(prototype, JSObject) else ObjectPrototype)
+        ret = fn.call(obj, args)
+        return ret if isinstance(ret, (JSObject, HostObject)) else obj
+    if isinstance(fn, NativeFunction) and fn.construct is not None:
+        return fn.construct(args)
+    raise _type_error(f"{to_string(fn)} is not a constructor")
+
+
+def enumerate_keys(obj) -> list:
+    if isinstance(obj, JSObject):
+        keys = []
+        seen = set()
+        while obj is not None and obj not in _PROTOTYPES:
+            for key in obj.keys():
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+            obj = obj.proto
+        return keys
+    if isinstance(obj, HostObject):
+        return obj.es_keys()
+    if type(obj) is str:
+        return [str(i) for i in range(len(obj))]
+    return []
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    (?P<ws>[ \t\r\f\v\ufeff\u00a0\u2028\u2029]+)
+  | (?P<nl>\n)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<num>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<str>"(?:[^"\\\n]|\\.|\\\n)*"|'(?:[^'\\\n]|\\.|\\\n)*')
+  | (?P<punc>>>>=|===|!==|>>>|<<=|>>=|[-+*/%&|^<>!=]=|&&|\|\||\+\+|--|<<|>>|[{}()\[\];,.?:~<>+\-*/%&|^!=])
+""", re.S | re.X)
+
+_REGEX = re.compile(r"/((?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+)/([gimy]*)")
+
+_KEYWORDS = {
+    "break", "case", "catch", "const", "continue", "default", "delete", "do", "else", "finally",
+    "for", "function", "if", "in", "instanceof", "let", "new", "return", "switch", "this",
+    "throw", "try", "typeof", "var", "void", "while", "null", "true", "false",
+}
+
+# Tokens after which a "/" starts a regex literal rather than a division
+_REGEX_AFTER_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "instanceof", "new", "delete", "void", "throw"}
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+_STRING_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)", re.S)
+
+
+def _unescape(body: str) -> str:
+    def replace(match):
+        esc = match.group(1)
+        if esc[0] in "ux" and len(esc) > 1:
+            return chr(int(esc[1:], 16))
+        if esc == "\n":
+            return ""
+        return _ESCAPES.get(esc, esc)
+    return _STRING_ESCAPE.sub(replace, body)
+
+
+class Token:
+    __slots__ = ("type", "value", "newline", "line")
+
+    def __init__(self, type, value, newline, line):
+        self.type = type
+        self.value = value
+        self.newline = newline
+        self.line = line
+
+    def __repr__(self) -> str:
+        return f"{self.type}:{self.value!r}"
+
+
+def tokenize(source: str) -> list:
+    tokens = []
+    pos = 0
+    line = 1
+    newline = False
+    end = len(source)
+    match = _TOKEN.match
+    while pos < end:
+        if source[pos] == "/" and _regex_allowed(tokens) and not source.startswith(("//", "/*"), pos):
+            m = _REGEX.match(source, pos)
+            if m:
+                tokens.append(Token("regex", (m.group(1), m.group(2)), newline, line))
+                newline = False
+                pos = m.end()
+                continue
+        m = match(source, pos)
+        if m is None:
+            raise JSThrow(make_error("SyntaxError", f"line {line}: unexpected character {source[pos]!r}"))
+        kind = m.lastgroup
+        text = m.group()
+        pos = m.end()
+        if kind == "ws":
+            continue
+        if kind == "nl" or kind == "comment":
+            if "\n" in text:
+                newline = True
+                line += text.count("\n")
+            continue
+        if kind == "num":
+            value = float(int(text, 16)) if text[:2] in ("0x", "0X") else float(text)
+            tokens.append(Token("num", value, newline, line))
+        elif kind == "str":
+            tokens.append(Token("str", _unescape(text[1:-1]), newline, line))
+            line += text.count("\n")
+        elif kind == "name":
+            tokens.append(Token("keyword" if text in _KEYWORDS else "name", text, newline, line))
+        else:
+            tokens.append(Token("punc", text, newline, line))
+        newline = False
+    tokens.append(Token("eof", None, newline, line))
+    return tokens
+
+
+def _regex_allowed(tokens: list) -> bool:
+    if not tokens:
+        return True
+    last = tokens[-1]
+    if last.type in ("num", "str", "name", "regex"):
+        return False
+    if last.type == "keyword":
+        return last.value in _REGEX_AFTER_KEYWORDS
+    return last.value not in (")", "]", "}")
+
+
+# ---------------------------------------------------------------------------
+# Parser -> AST tuples
+# ---------------------------------------------------------------------------
+
+_ASSIGN_OPS = {"=", "+=", "-=", "*=", "/=", "%=", "<<=", ">>=", ">>>=", "&=", "|=", "^="}
+
+_BINARY_PRECEDENCE = {
+    "||": 1, "&&": 2, "|": 3, "^": 4, "&": 5,
+    "==": 6, "!=": 6, "===": 6, "!==": 6,
+    "<": 7, ">": 7, "<=": 7, ">=": 7, "instanceof": 7, "in": 7,
+    "<<": 8, ">>": 8, ">>>": 8,
+    "+": 9, "-": 9,
+    "*": 10, "/": 10, "%": 10,
+}
+
+
+class _FunctionContext:
+    __slots__ = ("vars", "functions")
+
+    def __init__(self):
+        self.vars = []
+        self.functions = []
+
+
+class Parser:
+    def __init__(self, source: str):
+        self.tokens = tokenize(source)
+        self.pos = 0
+        self.contexts = [_FunctionContext()]
+
+    # -- helpers ------------------------------------------------------------
+
+    @property
+    def tok(self) -> Token:
+        return self.tokens[self.pos]
+
+    def peek(self, offset: int = 1) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def next(self) -> Token:
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def at(self, value) -> bool:
+        tok = self.tokens[self.pos]
+        return tok.value == value and tok.type in ("punc", "keyword")
+
+    def accept(self, value) -> bool:
+        if self.at(value):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, value) -> Token:
+        if not self.at(value):
+            self.error(f"expected '{value}'")
+        return self.next()
+
+    def error(self, message: str):
+        tok = self.tok
+        found = "end of input" if tok.type == "eof" else repr(tok.value)
+        raise JSThrow(make_error("SyntaxError", f"line {tok.line}: {message}, found {found}"))
+
+    def identifier(self) -> str:
+        tok = self.tok
+        if tok.type != "name":
+            self.error("expected identifier")
+        self.pos += 1
+        return tok.value
+
+    def semicolon(self):
+        if self.accept(";"):
+            return
+        tok = self.tok
+        if tok.type == "eof" or tok.value == "}" or tok.newline:
+            return
+        self.error("expected ';'")
+
+    def declare(self, name: str):
+        context = self.contexts[-1]
+        if name not in context.vars:
+            context.vars.append(name)
+
+    # -- program ------------------------------------------------------------
+
+    def parse_program(self):
+        body = []
+        while self.tok.type != "eof":
+            body.append(self.statement())
+        context = self.contexts[-1]
+        return ("program", body, context.vars, context.functions)
+
+    # -- statements ---------------------------------------------------------
+
+    def statement(self):
+        tok = self.tok
+        if tok.type == "punc":
+            if tok.value == "{":
+                return self.block()
+            if tok.value == ";":
+                self.next()
+                return ("empty",)
+        elif tok.type == "keyword":
+            handler = getattr(self, f"stmt_{tok.value}", None)
+            if handler is not None:
+                return handler()
+        elif tok.type == "name" and self.peek().value == ":" and self.peek().type == "punc":
+            label = self.next().value
+            self.next()
+            return ("labeled", label, self.statement())
+
+        expr = self.expression()
+        self.semicolon()
+        return ("expr", expr)
+
+    def block(self):
+        self.expect("{")
+        body = []
+        while not self.at("}"):
+            if self.tok.type == "eof":
+                self.error("expected '}'")
+            body.append(self.statement())
+        self.next()
+        return ("block", body)
+
+    def var_declarations(self, no_in: bool = False):
+        declarations = []
+        while True:
+            name = self.identifier()
+            self.declare(name)
+            init = None
+            if self.accept("="):
+                init = self.assignment(no_in)
+            declarations.append((name, init))
+            if not self.accept(","):
+                return ("var", declarations)
+
+    def stmt_var(self):
+        self.next()
+        node = self.var_declarations()
+        self.semicolon()
+        return node
+
+    stmt_const = stmt_var
+    stmt_let = stmt_var
+
+    def stmt_function(self):
+        self.next()
+        name = self.identifier()
+        fn = self.function_rest(name)
+        self.contexts[-1].functions.append((name, fn))
+        return ("empty",)
+
+    def stmt_if(self):
+        self.next()
+        self.expect("(")
+        test = self.expression()
+        self.expect(")")
+        then = self.statement()
+        other = self.statement() if self.accept("else") else None
+        return ("if", test, then, other)
+
+    def stmt_for(self):
+        self.next()
+        self.expect("(")
+        init = None
+        if self.at("var") or self.at("const") or self.at("let"):
+            self.next()
+            if self.tok.type == "name" and self.peek().value == "in":
+                name = self.identifier()
+                self.declare(name)
+                self.next()
+                obj = self.expression()
+                self.expect(")")
+                return ("forin", ("name", name), obj, self.statement())
+            init = self.var_declarations(no_in=True)
+        elif not self.at(";"):
+            expr = self.expression(no_in=True)
+            if self.accept("in"):
+                obj = self.expression()
+                self.expect(")")
+                return ("forin", expr, obj, self.statement())
+            init = ("expr", expr)
+        self.expect(";")
+        test = None if self.at(";") else self.expression()
+        self.expect(";")
+        update = None if self.at(")") else self.expression()
+        self.expect(")")
+        return ("for", init, test, update, self.statement())
+
+    def stmt_while(self):
+        self.next()
+        self.expect("(")
+        test = self.expression()
+        self.expect(")")
+        return ("while", test, self.statement())
+
+    def stmt_do(self):
+        self.next()
+        body = self.statement()
+        self.expect("while")
+        self.expect("(")
+        test = self.expression()
+        self.expect(")")
+        self.accept(";")
+        return ("do", body, test)
+
+    def stmt_return(self):
+        self.next()
+        value = None
+        if not (self.at(";") or self.at("}") or self.tok.type == "eof" or self.tok.newline):
+            value = self.expression()
+        self.semicolon()
+        return ("return", value)
+
+    def _jump(self, kind):
+        self.next()
+        label = None
+        if self.tok.type == "name" and not self.tok.newline:
+            label = self.next().value
+        self.semicolon()
+        return (kind, label)
+
+    def stmt_break(self):
+        return self._jump("break")
+
+    def stmt_continue(self):
+        return self._jump("continue")
+
+    def stmt_throw(self):
+        self.next()
+        value = self.expression()
+        self.semicolon()
+        return ("throw", value)
+
+    def stmt_try(self):
+        self.next()
+        block = self.block()
+        param = handler = finalizer = None
+        if self.accept("catch"):
+            self.expect("(")
+            param = self.identifier()
+            self.expect(")")
+            handler = self.block()
+        if self.accept("finally"):
+            finalizer = self.block()
+        if handler is None and finalizer is None:
+            self.error("expected 'catch' or 'finally'")
+        return ("try", block, param, handler, finalizer)
+
+    def stmt_switch(self):
+        self.next()
+        self.expect("(")
+        discriminant = self.expression()
+        self.expect(")")
+        self.expect("{")
+        cases = []
+        while not self.accept("}"):
+            if self.accept("default"):
+                test = None
+            else:
+                self.expect("case")
+                test = self.expression()
+            self.expect(":")
+            body = []
+            while not (self.at("case") or self.at("default") or self.at("}")):
+                body.append(self.statement())
+            cases.append((test, body))
+        return ("switch", discriminant, cases)
+
+    # -- expressions --------------------------------------------------------
+
+    def expression(self, no_in: bool = False):
+        expr = self.assignment(no_in)
+        if self.at(","):
+            exprs = [expr]
+            while self.accept(","):
+                exprs.append(self.assignment(no_in))
+            return ("seq", exprs)
+        return expr
+
+    def assignment(self, no_in: bool = False):
+        left = self.conditional(no_in)
+        tok = self.tok
+        if tok.type == "punc" and tok.value in _ASSIGN_OPS:
+            if left[0] not in ("name", "member"):
+                self.error("invalid assignment target")
+            self.next()
+            return ("assign", tok.value[:-1], left, self.assignment(no_in))
+        return left
+
+    def conditional(self, no_in: bool = False):
+        test = self.binary(1, no_in)
+        if self.accept("?"):
+            then = self.assignment()
+            self.expect(":")
+            return ("cond", test, then, self.assignment(no_in))
+        return test
+
+    def binary(self, min_precedence: int, no_in: bool):
+        left = self.unary()
+        while True:
+            tok = self.tok
+            op = tok.value
+            if tok.type not in ("punc", "keyword") or op not in _BINARY_PRECEDENCE:
+                return left
+            if no_in and op == "in":
+                return left
+            precedence = _BINARY_PRECEDENCE[op]
+            if precedence < min_precedence:
+                return left
+            self.next()
+            right = self.binary(precedence + 1, no_in)
+            if op in ("&&", "||"):
+                left = ("logical", op, left, right)
+            else:
+                left = ("binary", op, left, right)
+
+    def unary(self):
+        tok = self.tok
+        if tok.type in ("punc", "keyword"):
+            op = tok.value
+            if op in ("!", "-", "+", "~", "typeof", "void", "delete"):
+                self.next()
+                return ("unary", op, self.unary())
+            if op in ("++", "--"):
+                self.next()
+                target = self.unary()
+                if target[0] not in ("name", "member"):
+                    self.error("invalid increment target")
+                return ("update", op, True, target)
+        expr = self.postfix()
+        return expr
+
+    def postfix(self):
+        expr = self.call_member()
+        tok = self.tok
+        if tok.type == "punc" and tok.value in ("++", "--") and not tok.newline:
+            if expr[0] not in ("name", "member"):
+                self.error("invalid increment target")
+            self.next()
+            return ("update", tok.value, False, expr)
+        return expr
+
+    def arguments(self) -> list:
+        self.expect("(")
+        args = []
+        if not self.at(")"):
+            while True:
+                args.append(self.assignment())
+                if not self.accept(","):
+                    break
+        self.expect(")")
+        return args
+
+    def member_name(self) -> str:
+        tok = self.next()
+        if tok.type not in ("name", "keyword"):
+            self.pos -= 1
+            self.error("expected property name")
+        return tok.value
+
+    def call_member(self):
+        if self.at("new"):
+            expr = self.new_expression()
+        else:
+            expr = self.primary()
+        while True:
+            if self.accept("."):
+                expr = ("member", expr, ("str", self.member_name()))
+            elif self.accept("["):
+                key = self.expression()
+                self.expect("]")
+                expr = ("member", expr, key)
+            elif self.at("("):
+                expr = ("call", expr, self.arguments())
+            else:
+                return expr
+
+    def new_expression(self):
+        self.expect("new")
+        if self.at("new"):
+            callee = self.new_expression()
+        else:
+            callee = self.primary()
+        while True:
+            if self.accept("."):
+                callee = ("member", callee, ("str", self.member_name()))
+            elif self.accept("["):
+                key = self.expression()
+                self.expect("]")
+                callee = ("member", callee, key)
+            else:
+                break
+        args = self.arguments() if self.at("(") else []
+        return ("new", callee, args)
+
+    def primary(self):
+        tok = self.next()
+        t = tok.type
+        if t == "num":
+            return ("num", tok.value)
+        if t == "str":
+            return ("str", tok.value)
+        if t == "name":
+            return ("name", tok.value)
+        if t == "regex":
+            return ("regex", tok.value[0], tok.value[1])
+        if t == "keyword":
+            v = tok.value
+            if v == "this":
+                return ("this",)
+            if v == "null":
+                return ("const", None)
+            if v == "true":
+                return ("const", True)
+            if v == "false":
+                return ("const", False)
+            if v == "function":
+                name = self.identifier() if self.tok.type == "name" else None
+                return self.function_rest(name)
+        if t == "punc":
+            v = tok.value
+            if v == "(":
+                expr = self.expression()
+                self.expect(")")
+                return expr
+            if v == "[":
+                return self.array_literal()
+            if v == "{":
+                return self.object_literal()
+        self.pos -= 1
+        self.error("unexpected token")
+
+    def array_literal(self):
+        elements = []
+        while not self.accept("]"):
+            if self.at(","):
+                self.next()
+                elements.append(None)
+                continue
+            elements.append(self.assignment())
+            if not self.at("]"):
+                self.expect(",")
+        return ("array", elements)
+
+    def object_literal(self):
+        members = []
+        while not self.accept("}"):
+            tok = self.next()
+            if tok.type in ("name", "keyword", "str"):
+                key = tok.value
+            elif tok.type == "num":
+                key = number_to_string(tok.value)
+            else:
+                self.pos -= 1
+                self.error("expected property name")
+            self.expect(":")
+            members.append((key, self.assignment()))
+            if not self.at("}"):
+                self.expect(",")
+        return ("object", members)
+
+    def function_rest(self, name):
+        self.expect("(")
+        params = []
+        if not self.at(")"):
+            while True:
+                params.append(self.identifier())
+                if not self.accept(","):
+                    break
+        self.expect(")")
+        self.contexts.append(_FunctionContext())
+        body = self.block()[1]
+        context = self.contexts.pop()
+        return ("function", name, params, body, context.vars, context.functions)
+
+
+# ---------------------------------------------------------------------------
+# Compiler: AST tuples -> Python closures
+# ---------------------------------------------------------------------------
+
+def _hoist(scope: Scope, variables, functions):
+    names = scope.vars
+    for name in variables:
+        if name not in names:
+            names[name] = UNDEFINED
+    for name, make in functions:
+        names[name] = make(scope)
+
+
+def _lookup_error(name: str):
+    return JSThrow(make_error("ReferenceError", f"{name} is undefined"))
+
+
+class Compiler:
+    def __init__(self, interpreter: "Interpreter"):
+        self.interpreter = interpreter
+
+    # -- statements ---------------------------------------------------------
+
+    def program(self, node):
+        _, body, variables, functions = node
+        run = self.statements(body)
+        return run, variables, [(name, self.function(fn)) for name, fn in functions]
+
+    def statements(self, nodes):
+        compiled = [self.statement(node) for node in nodes if node[0] != "empty"]
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run(scope):
+            for statement in compiled:
+                signal = statement(scope)
+                if signal is not None:
+                    return signal
+        return run
+
+    def statement(self, node):
+        return getattr(self, f"s_{node[0]}")(node)
+
+    def s_empty(self, node):
+        return lambda scope: None
+
+    def s_expr(self, node):
+        expr = self.expr(node[1])
+        interpreter = self.interpreter
+
+        def run(scope):
+            interpreter.completion = expr(scope)
+        return run
+
+    def s_block(self, node):
+        return self.statements(node[1])
+
+    def s_var(self, node):
+        assignments = [(name, self.expr(init)) for name, init in node[1] if init is not None]
+
+        def run(scope):
+            for name, init in assignments:
+                value = init(scope)
+                s = scope
+                while name not in s.vars:
+                    s = s.parent
+                s.vars[name] = value
+        return run
+
+    def s_if(self, node):
+        test = self.expr(node[1])
+        then = self.statement(node[2])
+        other = self.statement(node[3]) if node[3] is not None else None
+
+        def run(scope):
+            if to_boolean(test(scope)):
+                return then(scope)
+            if other is not None:
+                return other(scope)
+        return run
+
+    def _loop_signal(self, signal, labels):
+        """Return (stop, propagate) for a signal raised inside a loop body."""
+        kind, label = signal
+        if kind == "break" and (label is None or label in labels):
+            return True, None
+        if kind == "continue" and (label is None or label in labels):
+            return False, None
+        return True, signal
+
+    def s_for(self, node, labels=()):
+        _, init, test, update, body = node
+        init = self.statement(init) if init is not None else None
+        test = self.expr(test) if test is not None else None
+        update = self.expr(update) if update is not None else None
+        body = self.statement(body)
+        loop_signal = self._loop_signal
+
+        def run(scope):
+            if init is not None:
+                init(scope)
+            while test is None or to_boolean(test(scope)):
+                signal = body(scope)
+                if signal is not None:
+                    stop, propagate = loop_signal(signal, labels)
+                    if stop:
+                        return propagate
+                if update is not None:
+                    update(scope)
+        return run
+
+    def s_while(self, node, labels=()):
+        test = self.expr(node[1])
+        body = self.statement(node[2])
+        loop_signal = self._loop_signal
+
+        def run(scope):
+            while to_boolean(test(scope)):
+                signal = body(scope)
+                if signal is not None:
+                    stop, propagate = loop_signal(signal, labels)
+                    if stop:
+                        return propagate
+        return run
+
+    def s_do(self, node, labels=()):
+        body = self.statement(node[1])
+        test = self.expr(node[2])
+        loop_signal = self._loop_signal
+
+        def run(scope):
+            while True:
+                signal = body(scope)
+                if signal is not None:
+                    stop, propagate = loop_signal(signal, labels)
+                    if stop:
+                        return propagate
+                if not to_boolean(test(scope)):
+                    return None
+        return run
+
+    def s_forin(self, node, labels=()):
+        _, target, obj, body = node
+        assign = self.assigner(target)
+        obj = self.expr(obj)
+        body = self.statement(body)
+        loop_signal = self._loop_signal
+
+        def run(scope):
+            for key in enumerate_keys(obj(scope)):
+                assign(scope, key)
+                signal = body(scope)
+                if signal is not None:
+                    stop, propagate = loop_signal(signal, labels)
+                    if stop:
+                        return propagate
+        return run
+
+    def s_labeled(self, node):
+        _, label, statement = node
+        kind = statement[0]
+        if kind in ("for", "while", "do", "forin"):
+            return getattr(self, f"s_{kind}")(statement, labels=(label,))
+        inner = self.statement(statement)
+
+        def run(scope):
+            signal = inner(scope)
+            if signal is not None and signal[0] == "break" and signal[1] == label:
+                return None
+            return signal
+        return run
+
+    def s_return(self, node):
+        value = self.expr(node[1]) if node[1] is not None else None
+
+        def run(scope):
+            return ("return", value(scope) if value is not None else UNDEFINED)
+        return run
+
+    def s_break(self, node):
+        signal = ("break", node[1])
+        return lambda scope: signal
+
+    def s_continue(self, node):
+        signal = ("continue", node[1])
+        return lambda scope: signal
+
+    def s_throw(self, node):
+        value = self.expr(node[1])
+
+        def run(scope):
+            raise JSThrow(value(scope))
+        return run
+
+    def s_try(self, node):
+        _, block, param, handler, finalizer = node
+        block = self.statement(block)
+        handler = self.statement(handler) if handler is not None else None
+        finalizer = self.statement(finalizer) if finalizer is not None else None
+
+        def run(scope):
+            try:
+                if handler is None:
+                    return block(scope)
+                try:
+                    return block(scope)
+                except RecursionError:
+                    error = make_error("RangeError", "Stack overflow")
+                except JSThrow as e:
+                    error = e.value
+                except Exception as e:
+                    error = make_error("Error", str(e))
+                return handler(Scope({param: error}, scope))
+            finally:
+                if finalizer is not None:
+                    signal = finalizer(scope)
+                    if signal is not None:
+                        return signal
+        return run
+
+    def s_switch(self, node):
+        _, discriminant, cases = node
+        discriminant = self.expr(discriminant)
+        cases = [(self.expr(test) if test is not None else None, self.statements(body)) for test, body in cases]
+
+        def run(scope):
+            value = discriminant(scope)
+            start = None
+            for i, (test, _) in enumerate(cases):
+                if test is not None and strict_equals(value, test(scope)):
+                    start = i
+                    break
+            if start is None:
+                start = next((i for i, (test, _) in enumerate(cases) if test is None), None)
+                if start is None:
+                    return None
+            for _, body in cases[start:]:
+                signal = body(scope)
+                if signal is not None:
+                    if signal[0] == "break" and signal[1] is None:
+                        return None
+                    return signal
+        return run
+
+    # -- expressions --------------------------------------------------------
+
+    def expr(self, node):
+        return getattr(self, f"e_{node[0]}")(node)
+
+    def e_num(self, node):
+        value = node[1]
+        return lambda scope: value
+
+    e_str = e_num
+    e_const = e_num
+
+    def e_regex(self, node):
+        _, source, flags = node
+        return lambda scope: JSRegExp(source, flags)
+
+    def e_this(self, node):
+        def ev(scope):
+            while scope.this is None:
+                scope = scope.parent
+            return scope.this
+        return ev
+
+    def e_name(self, node):
+        name = node[1]
+
+        def ev(scope):
+            while scope is not None:
+                variables = scope.vars
+                if name in variables:
+                    return variables[name]
+                scope = scope.parent
+            raise _lookup_error(name)
+        return ev
+
+    def e_member(self, node):
+        obj = self.expr(node[1])
+        if node[2][0] == "str":
+            key = node[2][1]
+            return lambda scope: get_member(obj(scope), key)
+        key = self.expr(node[2])
+        return lambda scope: get_member(obj(scope), key(scope))
+
+    def e_array(self, node):
+        elements = [self.expr(e) if e is not None else (lambda scope: UNDEFINED) for e in node[1]]
+        return lambda scope: JSArray([e(scope) for e in elements])
+
+    def e_object(self, node):
+        members = [(key, self.expr(value)) for key, value in node[1]]
+
+        def ev(scope):
+            return JSObject(ObjectPrototype, {key: value(scope) for key, value in members})
+        return ev
+
+    def function(self, node):
+        _, name, params, body, variables, functions = node
+        body = self.statements(body)
+        functions = [(fname, self.function(fn)) for fname, fn in functions]
+
+        def make(scope):
+            return JSFunction(name, params, body, scope, variables, functions)
+        return make
+
+    def e_function(self, node):
+        make = self.function(node)
+        name = node[1]
+        if name is None:
+            return make
+
+        def ev(scope):
+            # Named function expressions can refer to themselves
+            inner = Scope({}, scope)
+            fn = make(inner)
+            inner.vars[name] = fn
+            return fn
+        return ev
+
+    def e_call(self, node):
+        _, callee, args = node
+        args = [self.expr(arg) for arg in args]
+
+        if callee[0] == "name" and callee[1] == "eval":
+            interpreter = self.interpreter
+            lookup = self.e_name(callee)
+
+            def direct_eval(scope):
+                fn = lookup(scope)
+                values = [arg(scope) for arg in args]
+                if fn is not interpreter.eval_function:
+                    return call_function(fn, UNDEFINED, values)
+                return interpreter.eval_in(values[0] if values else UNDEFINED, scope)
+            return direct_eval
+
+        if callee[0] == "member":
+            obj = self.expr(callee[1])
+            if callee[2][0] == "str":
+                key = callee[2][1]
+
+                def ev(scope):
+                    this = obj(scope)
+                    fn = get_member(this, key)
+                    values = [arg(scope) for arg in args]
+                    if type(fn) is HostMethod:
+                        return fn(values)
+                    if fn is UNDEFINED:
+                        raise _type_error(f"{key} is not a function")
+                    return call_function(fn, this, values)
+                return ev
+
+            key = self.expr(callee[2])
+
+            def ev(scope):
+                this = obj(scope)
+                fn = get_member(this, key(scope))
+                return call_function(fn, this, [arg(scope) for arg in args])
+            return ev
+
+        fn = self.expr(callee)
+        return lambda scope: call_function(fn(scope), UNDEFINED, [arg(scope) for arg in args])
+
+    def e_new(self, node):
+        _, callee, args = node
+        fn = self.expr(callee)
+        args = [self.expr(arg) for arg in args]
+        return lambda scope: construct(fn(scope), [arg(scope) for arg in args])
+
+    def e_unary(self, node):
+        _, op, operand = node
+        if op == "typeof":
+            if operand[0] == "name":
+                name = operand[1]
+
+                def typeof_name(scope):
+                    while scope is not None:
+                        if name in scope.vars:
+                            return type_of(scope.vars[name])
+                        scope = scope.parent
+                    return "undefined"
+                return typeof_name
+            value = self.expr(operand)
+            return lambda scope: type_of(value(scope))
+        if op == "delete":
+            if operand[0] != "member":
+                return lambda scope: False
+            obj = self.expr(operand[1])
+            key = self.expr(operand[2])
+            return lambda scope: delete_member(obj(scope), key(scope))
+
+        value = self.expr(operand)
+        if op == "!":
+            return lambda scope: not to_boolean(value(scope))
+        if op == "-":
+            return lambda scope: -to_number(value(scope))
+        if op == "+":
+            return lambda scope: to_number(value(scope))
+        if op == "~":
+            return lambda scope: float(~to_int32(value(scope)))
+        if op == "void":
+            return lambda scope: (value(scope), UNDEFINED)[1]
+        raise JSThrow(make_error("SyntaxError", f"unsupported operator {op}"))
+
+    def e_binary(self, node):
+        _, op, left, right = node
+        left = self.expr(left)
+        right = self.expr(right)
+        fn = _BINARY[op]
+        if op == "+":
+            def add(scope):
+                a = left(scope)
+                b = right(scope)
+                if type(a) is float and type(b) is float:
+                    return a + b
+                return js_add(a, b)
+            return add
+        return lambda scope: fn(left(scope), right(scope))
+
+    def e_logical(self, node):
+        _, op, left, right = node
+        left = self.expr(left)
+        right = self.expr(right)
+        if op == "&&":
+            def logical_and(scope):
+                value = left(scope)
+                return right(scope) if to_boolean(value) else value
+            return logical_and
+
+        def logical_or(scope):
+            value = left(scope)
+            return value if to_boolean(value) else right(scope)
+        return logical_or
+
+    def e_cond(self, node):
+        test = self.expr(node[1])
+        then = self.expr(node[2])
+        other = self.expr(node[3])
+        return lambda scope: then(scope) if to_boolean(test(scope)) else other(scope)
+
+    def e_seq(self, node):
+        exprs = [self.expr(e) for e in node[1]]
+
+        def ev(scope):
+            value = UNDEFINED
+            for e in exprs:
+                value = e(scope)
+            return value
+        return ev
+
+    def assigner(self, target):
+        """Return assign(scope, value) for a name or member target."""
+        if target[0] == "name":
+            name = target[1]
+            interpreter = self.interpreter
+
+            def assign_name(scope, value):
+                s = scope
+                while s is not None:
+                    if name in s.vars:
+                        s.vars[name] = value
+                        return
+                    s = s.parent
+                interpreter.globals[name] = value
+            return assign_name
+
+        obj = self.expr(target[1])
+        key = self.expr(target[2])
+        return lambda scope, value: put_member(obj(scope), key(scope), value)
+
+    def e_assign(self, node):
+        _, op, target, value = node
+        value = self.expr(value)
+
+        if target[0] == "name":
+            assign = self.assigner(target)
+            if not op:
+                def ev(scope):
+                    v = value(scope)
+                    assign(scope, v)
+                    return v
+                return ev
+            current = self.e_name(target)
+            fn = _BINARY[op]
+
+            def ev(scope):
+                v = fn(current(scope), value(scope))
+                assign(scope, v)
+                return v
+            return ev
+
+        obj = self.expr(target[1])
+        key = self.expr(target[2])
+        fn = _BINARY[op] if op else None
+
+        def ev(scope):
+            o = obj(scope)
+            k = key(scope)
+            if fn is None:
+                v = value(scope)
+            else:
+                v = fn(get_member(o, k), value(scope))
+            put_member(o, k, v)
+            return v
+        return ev
+
+    def e_update(self, node):
+        _, op, prefix, target = node
+        delta = 1.0 if op == "++" else -1.0
+
+        if target[0] == "name":
+            current = self.e_name(target)
+            assign = self.assigner(target)
+
+            def ev(scope):
+                old = to_number(current(scope))
+                new = old + delta
+                assign(scope, new)
+                return new if prefix else old
+            return ev
+
+        obj = self.expr(target[1])
+        key = self.expr(target[2])
+
+        def ev(scope):
+            o = obj(scope)
+            k = key(scope)
+            old = to_number(get_member(o, k))
+            new = old + delta
+            put_member(o, k, new)
+            return new if prefix else old
+        return ev
+
+
+# ---------------------------------------------------------------------------
+# Built-ins
+# ---------------------------------------------------------------------------
+
+ObjectPrototype = JSObject(None)
+FunctionPrototype = JSObject(ObjectPrototype, None, "Function")
+ArrayPrototype = JSObject(ObjectPrototype, None, "Array")
+StringPrototype = JSObject(ObjectPrototype, None, "String")
+NumberPrototype = JSObject(ObjectPrototype, None, "Number")
+BooleanPrototype = JSObject(ObjectPrototype, None, "Boolean")
+RegExpPrototype = JSObject(ObjectPrototype, None, "RegExp")
+ErrorPrototypes = {}
+_PROTOTYPES = {ObjectPrototype, FunctionPrototype, ArrayPrototype, StringPrototype,
+               NumberPrototype, BooleanPrototype, RegExpPrototype}
+
+
+def _method(prototype: JSObject, name: str):
+    def decorator(fn):
+        prototype.props[name] = NativeFunction(name, fn)
+        return fn
+    return decorator
+
+
+def _arg(args, i, default=UNDEFINED):
+    return args[i] if i < len(args) else default
+
+
+def _relative_index(value, length: int, default: int) -> int:
+    if value is UNDEFINED:
+        return default
+    x = to_number(value)
+    if x != x:
+        return 0
+    x = int(x)
+    if x < 0:
+        return max(length + x, 0)
+    return min(x, length)
+
+
+# -- Object ---------------------------------------------------------------
+
+@_method(ObjectPrototype, "hasOwnProperty")
+def _has_own_property(this, args):
+    key = to_key(_arg(args, 0))
+    if isinstance(this, JSArray):
+        index = _array_index(key)
+        if index is not None:
+            return index < len(this.items)
+    if isinstance(this, JSObject):
+        return key in this.props
+    if isinstance(this, HostObject):
+        return this.es_has(key)
+    return False
+
+
+@_method(ObjectPrototype, "toString")
+def _object_to_string(this, args):
+    if isinstance(this, JSArray):
+        return to_string(this)
+    if isinstance(this, JSObject):
+        return f"[object {this.es_class}]"
+    return to_string(this)
+
+
+@_method(ObjectPrototype, "valueOf")
+def _value_of(this, args):
+    return this
+
+
+# -- Function -------------------------------------------------------------
+
+@_method(FunctionPrototype, "call")
+def _function_call(this, args):
+    return call_function(this, _arg(args, 0), list(args[1:]))
+
+
+@_method(FunctionPrototype, "apply")
+def _function_apply(this, args):
+    values = _arg(args, 1)
+    values = list(values.items) if isinstance(values, JSArray) else []
+    return call_function(this, _arg(args, 0), values)
+
+
+# -- Array ----------------------------------------------------------------
+
+def _items(this) -> list:
+    if not isinstance(this, JSArray):
+        raise _type_error("Array method called on a non-array")
+    return this.items
+
+
+@_method(ArrayPrototype, "push")
+def _push(this, args):
+    items = _items(this)
+    items.extend(args)
+    return float(len(items))
+
+
+@_method(ArrayPrototype, "pop")
+def _pop(this, args):
+    items = _items(this)
+    return items.pop() if items else UNDEFINED
+
+
+@_method(ArrayPrototype, "shift")
+def _shift(this, args):
+    items = _items(this)
+    return items.pop(0) if items else UNDEFINED
+
+
+@_method(ArrayPrototype, "unshift")
+def _unshift(this, args):
+    items = _items(this)
+    items[:0] = args
+    return float(len(items))
+
+
+@_method(ArrayPrototype, "join")
+def _join(this, args):
+    sep = _arg(args, 0)
+    sep = "," if sep is UNDEFINED else to_string(sep)
+    return sep.join("" if item is None or item is UNDEFINED else to_string(item) for item in _items(this))
+
+
+@_method(ArrayPrototype, "toString")
+def _array_to_string(this, args):
+    return to_string(this)
+
+
+@_method(ArrayPrototype, "slice")
+def _array_slice(this, args):
+    items = _items(this)
+    start = _relative_index(_arg(args, 0), len(items), 0)
+    end = _relative_index(_arg(args, 1), len(items), len(items))
+    return JSArray(items[start:end])
+
+
+@_method(ArrayPrototype, "splice")
+def _splice(this, args):
+    items = _items(this)
+    start = _relative_index(_arg(args, 0), len(items), 0)
+    count = len(items) - start if len(args) < 2 else max(0, min(int(to_number(args[1])), len(items) - start))
+    removed = items[start:start + count]
+    items[start:start + count] = args[2:]
+    return JSArray(removed)
+
+
+@_method(ArrayPrototype, "concat")
+def _concat(this, args):
+    items = list(_items(this))
+    for arg in args:
+        if isinstance(arg, JSArray):
+            items.extend(arg.items)
+        else:
+            items.append(arg)
+    return JSArray(items)
+
+
+@_method(ArrayPrototype, "reverse")
+def _reverse(this, args):
+    _items(this).reverse()
+    return this
+
+
+@_method(ArrayPrototype, "sort")
+def _sort(this, args):
+    import functools
+    items = _items(this)
+    compare = _arg(args, 0)
+    defined = [item for item in items if item is not UNDEFINED]
+    missing = len(items) - len(defined)
+    if compare is UNDEFINED:
+        defined.sort(key=to_string)
+    else:
+        def cmp(a, b):
+            result = to_number(call_function(compare, UNDEFINED, [a, b]))
+            return -1 if result < 0 else (1 if result > 0 else 0)
+        defined.sort(key=functools.cmp_to_key(cmp))
+    items[:] = defined + [UNDEFINED] * missing
+    return this
+
+
+# -- String ---------------------------------------------------------------
+
+def _this_string(this) -> str:
+    return this if type(this) is str else to_string(this)
+
+
+@_method(StringPrototype, "charAt")
+def _char_at(this, args):
+    s = _this_string(this)
+    i = int(to_number(_arg(args, 0, 0.0)) or 0)
+    return s[i] if 0 <= i < len(s) else ""
+
+
+@_method(StringPrototype, "charCodeAt")
+def _char_code_at(this, args):
+    s = _this_string(this)
+    i = int(to_number(_arg(args, 0, 0.0)) or 0)
+    return float(ord(s[i])) if 0 <= i < len(s) else math.nan
+
+
+@_method(StringPrototype, "indexOf")
+def _index_of(this, args):
+    s = _this_string(this)
+    start = _arg(args, 1)
+    start = 0 if start is UNDEFINED else max(0, int(to_number(start)))
+    return float(s.find(to_string(_arg(args, 0)), start))
+
+
+@_method(StringPrototype, "lastIndexOf")
+def _last_index_of(this, args):
+    return float(_this_string(this).rfind(to_string(_arg(args, 0))))
+
+
+@_method(StringPrototype, "substring")
+def _substring(this, args):
+    s = _this_string(this)
+    n = len(s)
+
+    def clamp(value, default):
+        if value is UNDEFINED:
+            return default
+        x = to_number(value)
+        return 0 if x != x else int(min(max(x, 0), n))
+
+    start = clamp(_arg(args, 0), 0)
+    end = clamp(_arg(args, 1), n)
+    if start > end:
+        start, end = end, start
+    return s[start:end]
+
+
+@_method(StringPrototype, "substr")
+def _substr(this, args):
+    s = _this_string(this)
+    start = _relative_index(_arg(args, 0), len(s), 0)
+    length = _arg(args, 1)
+    end = len(s) if length is UNDEFINED else start + max(0, int(to_number(length)))
+    return s[start:end]
+
+
+@_method(StringPrototype, "slice")
+def _string_slice(this, args):
+    s = _this_string(this)
+    start = _relative_index(_arg(args, 0), len(s), 0)
+    end = _relative_index(_arg(args, 1), len(s), len(s))
+    return s[start:end]
+
+
+@_method(StringPrototype, "toLowerCase")
+def _lower(this, args):
+    return _this_string(this).lower()
+
+
+@_method(StringPrototype, "toUpperCase")
+def _upper(this, args):
+    return _this_string(this).upper()
+
+
+@_method(StringPrototype, "toString")
+def _string_to_string(this, args):
+    return _this_string(this)
+
+
+@_method(StringPrototype, "concat")
+def _string_concat(this, args):
+    return _this_string(this) + "".join(to_string(arg) for arg in args)
+
+
+@_method(StringPrototype, "split")
+def _split(this, args):
+    s = _this_string(this)
+    sep = _arg(args, 0)
+    if sep is UNDEFINED:
+        parts = [s]
+    elif isinstance(sep, JSRegExp):
+        parts = sep.pattern.split(s)
+    else:
+        sep = to_string(sep)
+        parts = list(s) if sep == "" else s.split(sep)
+    limit = _arg(args, 1)
+    if limit is not UNDEFINED:
+        parts = parts[:int(to_number(limit))]
+    return JSArray([p if p is not None else UNDEFINED for p in parts])
+
+
+def _expand_replacement(template: str, match) -> str:
+    def replace(m):
+        token = m.group(1)
+        if token == "$":
+            return "$"
+        if token == "&":
+            return match.group(0)
+        index = int(token)
+        if index <= (match.re.groups if hasattr(match, "re") else 0):
+            return match.group(index) or ""
+        return m.group(0)
+    return re.sub(r"\$(\$|&|\d{1,2})", replace, template)
+
+
+@_method(StringPrototype, "replace")
+def _replace(this, args):
+    s = _this_string(this)
+    pattern = _arg(args, 0)
+    replacement = _arg(args, 1)
+    callable_replacement = isinstance(replacement, (JSFunction, NativeFunction, HostMethod))
+
+    if isinstance(pattern, JSRegExp):
+        def replace(match):
+            if callable_replacement:
+                groups = [g if g is not None else UNDEFINED for g in match.groups()]
+                return to_string(call_function(replacement, UNDEFINED,
+                                               [match.group(0), *groups, float(match.start()), s]))
+            return _expand_replacement(to_string(replacement), match)
+        return pattern.pattern.sub(replace, s, count=0 if pattern.is_global else 1)
+
+    needle = to_string(pattern)
+    index = s.find(needle)
+    if index < 0:
+        return s
+    if callable_replacement:
+        inserted = to_string(call_function(replacement, UNDEFINED, [needle, float(index), s]))
+    else:
+        inserted = to_string(replacement).replace("$&", needle).replace("$$", "$")
+    return s[:index] + inserted + s[index + len(needle):]
+
+
+@_method(StringPrototype, "match")
+def _match(this, args):
+    s = _this_string(this)
+    pattern = _arg(args, 0)
+    if not isinstance(pattern, JSRegExp):
+        pattern = JSRegExp(re.escape(to_string(pattern)))
+    if pattern.is_global:
+        found = [m.group(0) for m in pattern.pattern.finditer(s)]
+        return JSArray(found) if found else None
+    m = pattern.pattern.search(s)
+    return _match_array(m, s)
+
+
+@_method(StringPrototype, "search")
+def _search(this, args):
+    s = _this_string(this)
+    pattern = _arg(args, 0)
+    if not isinstance(pattern, JSRegExp):
+        pattern = JSRegExp(re.escape(to_string(pattern)))
+    m = pattern.pattern.search(s)
+    return float(m.start()) if m else -1.0
+
+
+def _match_array(m, s):
+    if m is None:
+        return None
+    array = JSArray([m.group(0)] + [g if g is not None else UNDEFINED for g in m.groups()])
+    array.props["index"] = float(m.start())
+    array.props["input"] = s
+    return array
+
+
+# -- RegExp ---------------------------------------------------------------
+
+@_method(RegExpPrototype, "test")
+def _test(this, args):
+    return this.pattern.search(to_string(_arg(args, 0))) is not None
+
+
+@_method(RegExpPrototype, "exec")
+def _exec(this, args):
+    s = to_string(_arg(args, 0))
+    start = int(to_number(this.props.get("lastIndex", 0.0))) if this.is_global else 0
+    m = this.pattern.search(s, start) if start <= len(s) else None
+    if this.is_global:
+        this.props["lastIndex"] = float(m.end()) if m else 0.0
+    return _match_array(m, s)
+
+
+# -- Number / Boolean ------------------------------------------------------
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+@_method(NumberPrototype, "toString")
+def _number_to_string(this, args):
+    radix = _arg(args, 0)
+    x = to_number(this)
+    if radix is UNDEFINED or int(to_number(radix)) == 10 or x != x or x in (math.inf, -math.inf):
+        return number_to_string(x)
+    radix = int(to_number(radix))
+    n = int(abs(x))
+    digits = ""
+    while True:
+        n, r = divmod(n, radix)
+        digits = _DIGITS[r] + digits
+        if n == 0:
+            break
+    return ("-" if x < 0 else "") + digits
+
+
+@_method(NumberPrototype, "toFixed")
+def _to_fixed(this, args):
+    digits = int(to_number(_arg(args, 0, 0.0)) or 0)
+    return f"{to_number(this):.{digits}f}"
+
+
+@_method(NumberPrototype, "valueOf")
+def _number_value_of(this, args):
+    return to_number(this)
+
+
+@_method(BooleanPrototype, "toString")
+def _boolean_to_string(this, args):
+    return to_string(this)
+
+
+# -- Errors ---------------------------------------------------------------
+
+def _error_constructor(name: str, parent: JSObject) -> NativeFunction:
+    prototype = JSObject(parent, {"name": name, "message": ""}, "Error")
+    ErrorPrototypes[name] = prototype
+
+    def make(args):
+        message = _arg(args, 0)
+        error = JSObject(prototype, None, "Error")
+        if message is not UNDEFINED:
+            error.props["message"] = to_string(message)
+        return error
+
+    return NativeFunction(name, lambda this, args: make(args), make, prototype)
+
+
+_ErrorConstructor = _error_constructor("Error", ObjectPrototype)
+_ERROR_CONSTRUCTORS = [_ErrorConstructor] + [
+    _error_constructor(name, ErrorPrototypes["Error"])
+    for name in ("TypeError", "RangeError", "ReferenceError", "SyntaxError", "EvalError")
+]
+
+
+@_method(ErrorPrototypes["Error"], "toString")
+def _error_to_string(this, args):
+    name = to_string(get_member(this, "name"))
+    message = to_string(get_member(this, "message"))
+    return f"{name}: {message}" if message else name
+
+
+# ---------------------------------------------------------------------------
+# Interpreter
+# ---------------------------------------------------------------------------
+
+def _native(name: str, fn, construct=None, prototype=None) -> NativeFunction:
+    return NativeFunction(name, fn, construct, prototype)
+
+
+def _math_object() -> JSObject:
+    def unary(fn):
+        def call(this, args):
+            try:
+                return float(fn(to_number(_arg(args, 0))))
+            except (ValueError, OverflowError):
+                return math.nan
+        return call
+
+    def js_round(x):
+        if x != x or x in (math.inf, -math.inf):
+            return x
+        return math.floor(x + 0.5)
+
+    def js_min(this, args):
+        values = [to_number(arg) for arg in args]
+        return math.nan if any(v != v for v in values) else min(values, default=math.inf)
+
+    def js_max(this, args):
+        values = [to_number(arg) for arg in args]
+        return math.nan if any(v != v for v in values) else max(values, default=-math.inf)
+
+    def js_pow(this, args):
+        try:
+            return float(math.pow(to_number(_arg(args, 0)), to_number(_arg(args, 1))))
+        except (ValueError, ZeroDivisionError):
+            return math.nan
+        except OverflowError:
+            return math.inf
+
+    functions = {
+        "abs": abs, "floor": math.floor, "ceil": math.ceil, "round": js_round, "sqrt": math.sqrt,
+        "sin": math.sin, "cos": math.cos, "tan": math.tan, "asin": math.asin, "acos": math.acos,
+        "atan": math.atan, "exp": math.exp, "log": math.log,
+    }
+    props = {name: _native(name, unary(fn)) for name, fn in functions.items()}
+    props.update({
+        "min": _native("min", js_min),
+        "max": _native("max", js_max),
+        "pow": _native("pow", js_pow),
+        "atan2": _native("atan2", lambda this, args: math.atan2(to_number(_arg(args, 0)), to_number(_arg(args, 1)))),
+        "random": _native("random", lambda this, args: random.random()),
+        "PI": math.pi,
+        "E": math.e,
+        "LN2": math.log(2),
+        "LN10": math.log(10),
+        "SQRT2": math.sqrt(2),
+    })
+    return JSObject(ObjectPrototype, props, "Math")
+
+
+def _parse_int(this, args):
+    text = to_string(_arg(args, 0)).strip()
+    radix = _arg(args, 1)
+    radix = 10 if radix is UNDEFINED or to_number(radix) == 0 else int(to_number(radix))
+    sign = -1 if text.startswith("-") else 1
+    text = text.lstrip("+-")
+    if radix == 16 and text[:2].lower() == "0x":
+        text = text[2:]
+    elif radix == 10 and text[:2].lower() == "0x":
+        text, radix = text[2:], 16
+    digits = ""
+    for c in text.lower():
+        if c in _DIGITS[:radix]:
+            digits += c
+        else:
+            break
+    return float(sign * int(digits, radix)) if digits else math.nan
+
+
+def _parse_float(this, args):
+    m = re.match(r"\s*([+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))", to_string(_arg(args, 0)))
+    return float(m.group(1).replace("Infinity", "inf")) if m else math.nan
+
+
+def _object_call(this, args):
+    value = _arg(args, 0)
+    return JSObject(ObjectPrototype) if value is None or value is UNDEFINED else value
+
+
+def _array_construct(args):
+    if len(args) == 1 and type(args[0]) is float:
+        return JSArray([UNDEFINED] * int(args[0]))
+    return JSArray(list(args))
+
+
+def _string_call(this, args):
+    return to_string(args[0]) if args else ""
+
+
+def _number_call(this, args):
+    return to_number(args[0]) if args else 0.0
+
+
+def _regexp_construct(args):
+    return JSRegExp(to_string(_arg(args, 0)), to_string(_arg(args, 1, "")))
+
+
+def _function_constructor(this, args):
+    raise JSThrow(make_error("EvalError", "Function() constructor is not supported"))
+
+
+def _from_char_code(this, args):
+    return "".join(chr(int(to_number(arg))) for arg in args)
+
+
+# Stateless globals shared by every Interpreter; constructors are singletons
+# so `x.constructor === Object` holds across interpreters
+_BUILTINS = {
+    "undefined": UNDEFINED,
+    "NaN": math.nan,
+    "Infinity": math.inf,
+    "Object": _native("Object", _object_call, lambda args: _object_call(None, args), ObjectPrototype),
+    "Function": _native("Function", _function_constructor, None, FunctionPrototype),
+    "Array": _native("Array", lambda this, args: _array_construct(args), _array_construct, ArrayPrototype),
+    "String": _native("String", _string_call, lambda args: _string_call(None, args), StringPrototype),
+    "Number": _native("Number", _number_call, lambda args: _number_call(None, args), NumberPrototype),
+    "Boolean": _native("Boolean", lambda this, args: to_boolean(_arg(args, 0)),
+                       lambda args: to_boolean(_arg(args, 0)), BooleanPrototype),
+    "RegExp": _native("RegExp", lambda this, args: _regexp_construct(args), _regexp_construct, RegExpPrototype),
+    "Math": _math_object(),
+    "isNaN": _native("isNaN", lambda this, args: to_number(_arg(args, 0)) != to_number(_arg(args, 0))),
+    "isFinite": _native("isFinite", lambda this, args: math.isfinite(to_number(_arg(args, 0)))),
+    "parseInt": _native("parseInt", _parse_int),
+    "parseFloat": _native("parseFloat", _parse_float),
+}
+_BUILTINS["String"].props["fromCharCode"] = _native("fromCharCode", _from_char_code)
+for _ctor in _ERROR_CONSTRUCTORS:
+    _BUILTINS[_ctor.name] = _ctor
+
+
+class Interpreter:
+    """One ExtendScript global environment."""
+
+    # Compiled programs kept per source string
+    CACHE_SIZE = 4096
+
+    def __init__(self, stdout=None):
+        self.global_object = JSObject(ObjectPrototype, None, "global")
+        self.globals = self.global_object.props
+        self.global_scope = Scope(self.globals, None, self.global_object)
+        self.completion = UNDEFINED
+        self.stdout = stdout
+        self._compiler = Compiler(self)
+        self._cache = OrderedDict()
+        self._install_builtins()
+
+    # -- setup --------------------------------------------------------------
+
+    def _install_builtins(self):
+        self.eval_function = _native("eval", lambda this, args: self.eval_in(_arg(args, 0), self.global_scope))
+        self.globals.update(_BUILTINS)
+        self.globals.update({
+            "eval": self.eval_function,
+            "$": JSObject(ObjectPrototype, {
+                "writeln": _native("writeln", lambda this, args: self._write("".join(map(to_string, args)) + "\n")),
+                "write": _native("write", lambda this, args: self._write("".join(map(to_string, args)))),
+                "global": self.global_object,
+            }, "$"),
+        })
+
+    def _write(self, text: str):
+        (self.stdout or sys.stdout).write(text)
+        return UNDEFINED
+
+    def define(self, name: str, value):
+        """Expose a Python value (or HostObject) as an ES global."""
+        self.globals[name] = to_js(value)
+
+    def define_function(self, name: str, fn):
+        """Expose fn(*args) as an ES global function."""
+        def call(this, args):
+            return to_js(fn(*[to_py(arg) for arg in args]))
+        self.globals[name] = NativeFunction(name, call)
+
+    def define_class(self, cls):
+        """Expose a HostObject class as an ES global constructor (for new and instanceof)."""
+        self.globals[cls.es_class_name()] = host_constructor(cls)
+
+    # -- execution ----------------------------------------------------------
+
+    def compile(self, source: str):
+        program = self._cache.get(source)
+        if program is None:
+            program = self._compiler.program(Parser(source).parse_program())
+            self._cache[source] = program
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return program
+
+    def _execute(self, source: str, scope: Scope):
+        run, variables, functions = self.compile(source)
+        # var/function declarations land in the nearest function (or global) scope
+        target = scope
+        while target.this is None:
+            target = target.parent
+        _hoist(target, variables, functions)
+
+        saved = self.completion
+        self.completion = UNDEFINED
+        try:
+            run(scope)
+            return self.completion
+        finally:
+            self.completion = saved
+
+    def eval_in(self, source, scope: Scope):
+        if type(source) is not str:
+            return source
+        return self._execute(source, scope)
+
+    def run(self, source: str):
+        """Run a script in the global scope and return its completion value."""
+        return self._execute(source, self.global_scope)
+
+    def call(self, name: str, *args):
+        """Call an ES global function with Python arguments."""
+        return to_py(call_function(self.globals[name], UNDEFINED, [to_js(arg) for arg in args]))